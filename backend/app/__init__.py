@@ -65,6 +65,10 @@ def create_app(config_name=None):
     """Create and configure the Flask application."""
     app = Flask(__name__)
 
+    # Serialise API responses with orjson
+    from app.json_provider import ORJSONProvider, SocketIOJSON
+    app.json = ORJSONProvider(app)
+
     # Load configuration
     config_name = config_name or os.getenv('FLASK_ENV', 'development')
     app.config.from_object(f'app.config.{config_name.capitalize()}Config')
@@ -107,7 +111,8 @@ def create_app(config_name=None):
         app,
         cors_allowed_origins=cors_origins,
         message_queue=app.config.get('REDIS_URL'),
-        async_mode='eventlet'
+        async_mode='eventlet',
+        json=SocketIOJSON,
     )
 
     # Initialize Redis client
@@ -143,6 +148,14 @@ def create_app(config_name=None):
     from app.middleware.sanitize import init_sanitization
     init_sanitization(app)
 
+    # Flush audit rows buffered by @audit_log once per request
+    from app.middleware.audit import init_audit_buffer
+    init_audit_buffer(app)
+
+    # Commit chain of custody rows buffered by ChainOfCustodyService with the request
+    from app.services.chain_of_custody_service import init_custody_buffer
+    init_custody_buffer(app)
+
     # Register blueprints
     from app.api.v1 import api_bp
     app.register_blueprint(api_bp, url_prefix='/api/v1')
@@ -151,6 +164,21 @@ def create_app(config_name=None):
     from app.api.websocket import register_handlers
     register_handlers(socketio)
 
+    # Run every MAINTENANCE_INTERVAL seconds by scripts/maintenance.sh
+    @app.cli.command('refresh-incident-counts')
+    def refresh_incident_counts():
+        """Refresh the mv_incident_counts materialized view."""
+        from app.models import Incident
+        Incident.refresh_counts()
+
+    # Also run by scripts/maintenance.sh, so months exist before their rows arrive
+    @app.cli.command('create-audit-partitions')
+    def create_audit_partitions():
+        """Create audit_logs partitions for the next three months."""
+        from sqlalchemy import text
+        db.session.execute(text('SELECT create_audit_log_partitions(3)'))
+        db.session.commit()
+
     # JWT error handlers
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
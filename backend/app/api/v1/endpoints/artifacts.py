@@ -129,12 +129,10 @@ def upload_artifact(incident_id):
         extra_data=extra_data,
     )
 
+    # The upload custody row is written with the artifact (see chain_of_custody_service)
     db.session.add(artifact)
     db.session.commit()
 
-    # Log chain of custody
-    ChainOfCustodyService.log_upload(artifact, str(user.id), request.form.get('source'))
-
     return jsonify(artifact.to_dict()), 201
 
 
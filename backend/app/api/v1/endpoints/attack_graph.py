@@ -18,11 +18,14 @@ def get_attack_graph(incident_id):
     from app.models.ioc import NetworkIndicator, HostBasedIndicator, MalwareTool
     incident = g.incident
 
-    nodes = AttackGraphNode.query.filter_by(incident_id=incident.id).all()
-    edges = AttackGraphEdge.query.filter_by(incident_id=incident.id).all()
+    nodes = AttackGraphNode.query.options(AttackGraphNode.creator_loader()) \
+        .filter_by(incident_id=incident.id).all()
+    edges = AttackGraphEdge.query.options(AttackGraphEdge.creator_loader()) \
+        .filter_by(incident_id=incident.id).all()
 
     # Enrich nodes with correlation counts
     enriched_nodes = []
+    edge_dicts = [e.to_dict() for e in edges]
     for n in nodes:
         node_data = n.to_dict()
         if n.compromised_host_id:
@@ -37,13 +40,13 @@ def get_attack_graph(incident_id):
 
     # Format for Cytoscape.js (backwards compat)
     cytoscape_data = {
-        'nodes': [n.to_dict()['cytoscape'] for n in nodes],
-        'edges': [e.to_dict()['cytoscape'] for e in edges]
+        'nodes': [n['cytoscape'] for n in enriched_nodes],
+        'edges': [e['cytoscape'] for e in edge_dicts]
     }
 
     return jsonify({
         'nodes': enriched_nodes,
-        'edges': [e.to_dict() for e in edges],
+        'edges': edge_dicts,
         'cytoscape': cytoscape_data
     }), 200
 
@@ -90,7 +93,8 @@ def list_graph_nodes(incident_id):
     incident = g.incident
 
     node_type = request.args.get('node_type')
-    query = AttackGraphNode.query.filter_by(incident_id=incident.id)
+    query = AttackGraphNode.query.options(AttackGraphNode.creator_loader()) \
+        .filter_by(incident_id=incident.id)
 
     if node_type:
         query = query.filter(AttackGraphNode.node_type == node_type)
@@ -204,7 +208,8 @@ def list_graph_edges(incident_id):
     incident = g.incident
 
     edge_type = request.args.get('edge_type')
-    query = AttackGraphEdge.query.filter_by(incident_id=incident.id)
+    query = AttackGraphEdge.query.options(AttackGraphEdge.creator_loader()) \
+        .filter_by(incident_id=incident.id)
 
     if edge_type:
         query = query.filter(AttackGraphEdge.edge_type == edge_type)
@@ -183,7 +183,7 @@ def login():
 def refresh():
     """Refresh access token."""
     identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = User.get_by_id(identity)
 
     if not user or not user.is_active:
         return jsonify({'error': 'unauthorized', 'message': 'Invalid user'}), 401
@@ -208,7 +208,7 @@ def logout():
             redis_client.setex(f'revoked_token:{jti}', int(ttl), 'true')
 
     identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = User.get_by_id(identity)
     if user:
         log_auth_event('logout', user=user, success=True)
 
@@ -221,7 +221,7 @@ def logout():
 def get_current_user():
     """Get current authenticated user."""
     identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = User.get_by_id(identity)
 
     if not user:
         return jsonify({'error': 'not_found', 'message': 'User not found'}), 404
@@ -246,7 +246,7 @@ def change_password():
         return jsonify({'error': 'bad_request', 'message': 'Current and new password are required'}), 400
 
     identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = User.get_by_id(identity)
 
     if not user:
         return jsonify({'error': 'not_found', 'message': 'User not found'}), 404
@@ -646,7 +646,7 @@ def mfa_setup():
     import pyotp
 
     identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = User.get_by_id(identity)
     if not user:
         return jsonify({'error': 'not_found', 'message': 'User not found'}), 404
 
@@ -695,7 +695,7 @@ def mfa_verify():
         return jsonify({'error': 'bad_request', 'message': 'Verification code is required'}), 400
 
     identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = User.get_by_id(identity)
     if not user:
         return jsonify({'error': 'not_found', 'message': 'User not found'}), 404
 
@@ -746,7 +746,7 @@ def mfa_complete_oauth():
     except Exception:
         return jsonify({'error': 'unauthorized', 'message': 'Invalid or expired pre-auth token'}), 401
 
-    user = User.query.get(user_id)
+    user = User.get_by_id(user_id)
     if not user:
         return jsonify({'error': 'not_found', 'message': 'User not found'}), 404
 
@@ -796,7 +796,7 @@ def mfa_disable():
         return jsonify({'error': 'bad_request', 'message': 'Password is required to disable MFA'}), 400
 
     identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = User.get_by_id(identity)
     if not user:
         return jsonify({'error': 'not_found', 'message': 'User not found'}), 404
 
@@ -2,6 +2,7 @@
 from datetime import datetime, timezone
 from flask import jsonify, request, g
 from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import undefer
 from app.api.v1 import api_bp
 from app import db, socketio
 from app.models import CaseNote
@@ -18,7 +19,8 @@ def list_case_notes(incident_id):
     per_page = min(request.args.get('per_page', 50, type=int), 100)
     category = request.args.get('category')
 
-    query = CaseNote.query.filter_by(incident_id=incident_id, is_archived=False)
+    query = CaseNote.query.options(CaseNote.creator_loader(CaseNote.author), undefer(CaseNote.content)) \
+        .filter_by(incident_id=incident_id, is_archived=False)
 
     if category:
         query = query.filter(CaseNote.category == category)
@@ -3,6 +3,7 @@ from datetime import datetime
 from flask import jsonify, request, g
 from flask_jwt_extended import jwt_required
 from dateutil.parser import parse as parse_date
+from sqlalchemy.orm import selectinload, raiseload, undefer
 from app.api.v1 import api_bp
 from app import db, socketio
 from app.models import CompromisedHost, CompromisedAccount, TimelineEvent
@@ -24,7 +25,8 @@ def list_compromised_hosts(incident_id):
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 50, type=int), 200)
 
-    query = CompromisedHost.query.filter_by(incident_id=incident.id)
+    query = CompromisedHost.query.options(CompromisedHost.creator_loader()) \
+        .filter_by(incident_id=incident.id)
 
     # Filters
     status = request.args.get('containment_status')
@@ -172,7 +174,13 @@ def list_compromised_accounts(incident_id):
     per_page = min(request.args.get('per_page', 50, type=int), 200)
     reveal = request.args.get('reveal', 'false').lower() == 'true'
 
-    query = CompromisedAccount.query.filter_by(incident_id=incident.id)
+    # Everything to_dict touches is batch-loaded; any other lazy load raises
+    query = CompromisedAccount.query.options(
+        selectinload(CompromisedAccount.host).selectinload(CompromisedHost.creator),
+        selectinload(CompromisedAccount.timeline_event),
+        CompromisedAccount.creator_loader(),
+        raiseload('*'),
+    ).filter_by(incident_id=incident.id)
 
     # Filters
     account_type = request.args.get('account_type')
@@ -191,31 +199,38 @@ def list_compromised_accounts(incident_id):
     if search:
         query = query.filter(CompromisedAccount.account_name.ilike(f'%{search}%'))
 
+    # Check permission to reveal passwords
+    can_reveal = reveal and user.has_permission('compromised_accounts:reveal')
+    if can_reveal:
+        query = query.options(undefer(CompromisedAccount.password_encrypted))
+
     pagination = query.order_by(CompromisedAccount.datetime_seen.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
 
-    # Check permission to reveal passwords
-    can_reveal = reveal and user.has_permission('compromised_accounts:reveal')
-
     items = []
+    revealed = []
     for account in pagination.items:
         decrypted_password = None
-        if can_reveal and account.password_encrypted:
+        if can_reveal and account.has_password:
             try:
                 decrypted_password = encryption_service.decrypt(account.password_encrypted)
-                # Log password reveal
-                log_security_event(
-                    action='password_reveal',
-                    resource_type='compromised_account',
-                    resource_id=account.id,
-                    incident_id=incident.id,
-                    details={'account_name': account.account_name}
-                )
+                revealed.append((account.id, account.account_name))
             except Exception:
                 pass
         items.append(account.to_dict(reveal_password=can_reveal, decrypted_password=decrypted_password))
 
+    # Log password reveals once serialisation is done: each log commits and
+    # would expire the eagerly loaded relationships mid-loop
+    for account_id, account_name in revealed:
+        log_security_event(
+            action='password_reveal',
+            resource_type='compromised_account',
+            resource_id=account_id,
+            incident_id=incident.id,
+            details={'account_name': account_name}
+        )
+
     return jsonify({
         'items': items,
         'total': pagination.total,
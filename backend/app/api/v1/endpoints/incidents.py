@@ -3,6 +3,7 @@ import logging
 from datetime import datetime, timezone
 from flask import jsonify, request, g
 from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import selectinload, joinedload
 from app.api.v1 import api_bp
 from app import db, socketio
 from app.models import Incident, IncidentAssignment, IncidentTeam, User, TeamMember
@@ -30,7 +31,10 @@ def list_incidents():
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
 
-    query = Incident.query.filter_by(organization_id=user.organization_id, is_archived=False)
+    query = Incident.query.options(
+        selectinload(Incident.incident_teams).joinedload(IncidentTeam.team),
+        Incident.creator_loader(),
+    ).filter_by(organization_id=user.organization_id, is_archived=False)
 
     # For Operators, only show directly assigned incidents
     if user.has_role('Operator') and not user.has_role('Viewer'):
@@ -120,6 +124,7 @@ def list_incidents():
         page=page, per_page=per_page, error_out=False
     )
 
+    Incident.load_counts(pagination.items)
     return jsonify({
         'items': [i.to_dict(include_counts=True) for i in pagination.items],
         'total': pagination.total,
@@ -383,7 +388,10 @@ def list_archived_incidents():
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
 
-    query = Incident.query.filter_by(organization_id=user.organization_id, is_archived=True)
+    query = Incident.query.options(
+        selectinload(Incident.incident_teams).joinedload(IncidentTeam.team),
+        Incident.creator_loader(),
+    ).filter_by(organization_id=user.organization_id, is_archived=True)
 
     search = request.args.get('search')
     if search:
@@ -399,6 +407,7 @@ def list_archived_incidents():
         page=page, per_page=per_page, error_out=False
     )
 
+    Incident.load_counts(pagination.items)
     return jsonify({
         'items': [i.to_dict(include_counts=True) for i in pagination.items],
         'total': pagination.total,
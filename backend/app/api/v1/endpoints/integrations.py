@@ -16,7 +16,8 @@ def list_integrations():
     """List all integrations for the organization."""
     user = get_current_user()
 
-    integrations = Integration.query.filter_by(organization_id=user.organization_id).all()
+    integrations = Integration.query.options(Integration.creator_loader()) \
+        .filter_by(organization_id=user.organization_id).all()
 
     return jsonify({
         'items': [i.to_dict() for i in integrations]
@@ -2,6 +2,7 @@
 from flask import jsonify, request, g
 from flask_jwt_extended import jwt_required
 from dateutil.parser import parse as parse_date
+from sqlalchemy.orm import selectinload, raiseload
 from app.api.v1 import api_bp
 from app import db, socketio
 from app.models import NetworkIndicator, HostBasedIndicator, MalwareTool, CompromisedHost, TimelineEvent
@@ -22,7 +23,14 @@ def list_network_iocs(incident_id):
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 50, type=int), 200)
 
-    query = NetworkIndicator.query.filter_by(incident_id=incident.id)
+    # Everything to_dict touches is batch-loaded; any other lazy load raises
+    query = NetworkIndicator.query.options(
+        NetworkIndicator.creator_loader(),
+        selectinload(NetworkIndicator.host).selectinload(CompromisedHost.creator),
+        selectinload(NetworkIndicator.source_host_ref).selectinload(CompromisedHost.creator),
+        selectinload(NetworkIndicator.destination_host_ref).selectinload(CompromisedHost.creator),
+        raiseload('*'),
+    ).filter_by(incident_id=incident.id)
 
     protocol = request.args.get('protocol')
     if protocol:
@@ -226,10 +234,21 @@ def list_host_iocs(incident_id):
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 50, type=int), 200)
 
-    query = HostBasedIndicator.query.filter_by(incident_id=incident.id)
+    # Everything to_dict touches is batch-loaded; any other lazy load raises
+    query = HostBasedIndicator.query.options(
+        HostBasedIndicator.creator_loader(),
+        selectinload(HostBasedIndicator.host_ref).selectinload(CompromisedHost.creator),
+        selectinload(HostBasedIndicator.source_event).options(
+            TimelineEvent.creator_loader(),
+            selectinload(TimelineEvent.host).selectinload(CompromisedHost.creator),
+        ),
+        raiseload('*'),
+    ).filter_by(incident_id=incident.id)
 
     artifact_type = request.args.get('artifact_type')
     if artifact_type:
+        if artifact_type not in HostBasedIndicator.ARTIFACT_TYPES:
+            return jsonify({'error': 'bad_request', 'message': 'Invalid artifact_type'}), 400
         query = query.filter(HostBasedIndicator.artifact_type == artifact_type)
 
     host_id = request.args.get('host_id')
@@ -329,6 +348,9 @@ def update_host_ioc(incident_id, ioc_id):
     if not ioc:
         return jsonify({'error': 'not_found', 'message': 'Host indicator not found'}), 404
 
+    if 'artifact_type' in data and data['artifact_type'] not in HostBasedIndicator.ARTIFACT_TYPES:
+        return jsonify({'error': 'bad_request', 'message': 'Invalid artifact_type'}), 400
+
     for field in ['artifact_type', 'artifact_value', 'host', 'notes',
                   'is_malicious', 'remediated', 'extra_data']:
         if field in data:
@@ -384,7 +406,12 @@ def list_malware(incident_id):
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 50, type=int), 200)
 
-    query = MalwareTool.query.filter_by(incident_id=incident.id)
+    # Everything to_dict touches is batch-loaded; any other lazy load raises
+    query = MalwareTool.query.options(
+        MalwareTool.creator_loader(),
+        selectinload(MalwareTool.host_ref).selectinload(CompromisedHost.creator),
+        raiseload('*'),
+    ).filter_by(incident_id=incident.id)
 
     is_tool = request.args.get('is_tool')
     if is_tool is not None:
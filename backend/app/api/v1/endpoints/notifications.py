@@ -23,6 +23,8 @@ def list_notifications():
 
     notification_type = request.args.get('type')
     if notification_type:
+        if notification_type not in Notification.NOTIFICATION_TYPES:
+            return jsonify({'error': 'bad_request', 'message': 'Invalid type'}), 400
         query = query.filter(Notification.type == notification_type)
 
     pagination = query.order_by(Notification.created_at.desc()).paginate(
@@ -14,7 +14,7 @@ def get_organization():
     """Get current user's organization details."""
     user = get_current_user()
     
-    org = Organization.query.get(user.organization_id)
+    org = Organization.get_by_id(user.organization_id)
     if not org:
         return jsonify({'error': 'not_found', 'message': 'Organization not found'}), 404
         
@@ -36,7 +36,7 @@ def update_organization():
     user = get_current_user()
     data = request.get_json()
     
-    org = Organization.query.get(user.organization_id)
+    org = Organization.get_by_id(user.organization_id)
     if not org:
         return jsonify({'error': 'not_found', 'message': 'Organization not found'}), 404
         
@@ -3,7 +3,8 @@ import io
 import re
 import html as html_module
 from datetime import datetime, timezone
-from flask import jsonify, request, g, send_file, current_app
+from itertools import chain
+from flask import Response, jsonify, request, g, send_file, current_app, stream_with_context
 from flask_jwt_extended import jwt_required
 from app.api.v1 import api_bp
 from app import db
@@ -39,6 +40,37 @@ REPORT_TYPES = {
 }
 
 
+def _load_report_records(incident):
+    """Load the child records a report is built from, keyed by record kind."""
+    return {
+        'timeline_events': TimelineEvent.query.filter_by(
+            incident_id=incident.id
+        ).order_by(TimelineEvent.timestamp.asc()).all(),
+        'hosts': CompromisedHost.query.filter_by(incident_id=incident.id).all(),
+        'accounts': CompromisedAccount.query.filter_by(incident_id=incident.id).all(),
+        'network_iocs': NetworkIndicator.query.filter_by(incident_id=incident.id).all(),
+        'host_iocs': HostBasedIndicator.query.filter_by(incident_id=incident.id).all(),
+        'malware': MalwareTool.query.filter_by(incident_id=incident.id).all(),
+    }
+
+
+def _report_inputs(incident, records):
+    """Serialise loaded records into the AI service's report arguments."""
+    return {
+        'incident_data': incident.to_dict(),
+        'timeline_events': [e.to_dict() for e in records['timeline_events']],
+        'compromised_assets': {
+            'hosts': [h.to_dict() for h in records['hosts']],
+            'accounts': [a.to_dict() for a in records['accounts']],
+        },
+        'iocs': {
+            'network': [i.to_dict() for i in records['network_iocs']],
+            'host': [i.to_dict() for i in records['host_iocs']],
+            'malware': [m.to_dict() for m in records['malware']],
+        },
+    }
+
+
 @api_bp.route('/incidents/<uuid:incident_id>/reports', methods=['GET'])
 @jwt_required()
 @require_incident_access('reports:read')
@@ -77,46 +109,21 @@ def generate_pdf_report(incident_id):
     report_title = REPORT_TYPES[report_type]['title']
 
     # Collect all incident data
-    timeline_events = TimelineEvent.query.filter_by(
-        incident_id=incident.id
-    ).order_by(TimelineEvent.timestamp.asc()).all()
-    hosts = CompromisedHost.query.filter_by(incident_id=incident.id).all()
-    accounts = CompromisedAccount.query.filter_by(incident_id=incident.id).all()
-    network_iocs = NetworkIndicator.query.filter_by(incident_id=incident.id).all()
-    host_iocs = HostBasedIndicator.query.filter_by(incident_id=incident.id).all()
-    malware = MalwareTool.query.filter_by(incident_id=incident.id).all()
-
-    incident_data = incident.to_dict()
-    timeline_data = [e.to_dict() for e in timeline_events]
-    assets_data = {
-        'hosts': [h.to_dict() for h in hosts],
-        'accounts': [a.to_dict() for a in accounts],
-    }
-    iocs_data = {
-        'network': [i.to_dict() for i in network_iocs],
-        'host': [i.to_dict() for i in host_iocs],
-        'malware': [m.to_dict() for m in malware],
-    }
+    records = _load_report_records(incident)
 
     # ── Step 1: Generate AI content ──────────────────────────────────
     ai_markdown = None
     ai_provider_used = None
 
     if ai_service.is_configured():
-        used_provider = provider
-        if not used_provider:
-            providers = ai_service.get_available_providers()
-            used_provider = providers[0] if providers else None
+        used_provider = ai_service.resolve_report_provider(provider)
 
         if used_provider:
             ai_provider_used = used_provider
             ai_markdown = ai_service.generate_report(
                 report_type=report_type,
-                incident_data=incident_data,
-                timeline_events=timeline_data,
-                compromised_assets=assets_data,
-                iocs=iocs_data,
                 provider=used_provider,
+                **_report_inputs(incident, records),
             )
 
     # ── Step 2: Convert to HTML ──────────────────────────────────────
@@ -130,14 +137,9 @@ def generate_pdf_report(incident_id):
         # Fallback: build a basic data-only report
         html_content = _build_fallback_report_html(
             incident=incident,
-            timeline_events=timeline_events,
-            hosts=hosts,
-            accounts=accounts,
-            network_iocs=network_iocs,
-            host_iocs=host_iocs,
-            malware=malware,
             sections=sections,
             report_title=report_title,
+            **records,
         )
 
     # ── Step 3: HTML → PDF via WeasyPrint ────────────────────────────
@@ -223,6 +225,51 @@ def generate_ai_summary(incident_id):
     }), 200
 
 
+@api_bp.route('/incidents/<uuid:incident_id>/reports/ai-stream', methods=['POST'])
+@jwt_required()
+@require_incident_access('reports:generate')
+@audit_log('data_modification', 'stream_ai_report', 'report')
+def stream_ai_report(incident_id):
+    """Stream an AI-generated report as Markdown while it is being written.
+
+    Same prompts and report types as generate-pdf, but the text is sent to
+    the client incrementally instead of after the full completion. The
+    finished text is cached, so a follow-up generate-pdf for the same data
+    renders without a second AI call.
+    """
+    incident = g.incident
+    data = request.get_json() or {}
+
+    if not ai_service.is_configured():
+        return jsonify({'error': 'not_configured', 'message': 'AI service not configured'}), 501
+
+    report_type = data.get('report_type', 'executive')
+    if report_type not in REPORT_TYPES:
+        report_type = 'executive'
+
+    provider = ai_service.resolve_report_provider(data.get('provider'))
+    if not provider:
+        return jsonify({'error': 'not_configured', 'message': 'No AI provider available'}), 501
+
+    chunks = ai_service.generate_report_stream(
+        report_type=report_type,
+        provider=provider,
+        **_report_inputs(incident, _load_report_records(incident)),
+    )
+
+    # Wait for the first chunk so a provider failure is still a proper error
+    # response; later failures end the stream with an error chunk
+    first = next(chunks, None)
+    if first is None:
+        return jsonify({'error': 'server_error', 'message': 'AI generation failed'}), 500
+
+    return Response(
+        stream_with_context(chain([first], chunks)),
+        mimetype='text/markdown',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no', 'X-AI-Provider': provider},
+    )
+
+
 @api_bp.route('/incidents/<uuid:incident_id>/reports/types', methods=['GET'])
 @jwt_required()
 @require_incident_access('reports:read')
@@ -271,22 +318,12 @@ def download_report(incident_id, report_id):
             report_title=report_title,
         )
     else:
-        timeline_events = TimelineEvent.query.filter_by(incident_id=incident.id).order_by(TimelineEvent.timestamp.asc()).all()
-        hosts = CompromisedHost.query.filter_by(incident_id=incident.id).all()
-        accounts = CompromisedAccount.query.filter_by(incident_id=incident.id).all()
-        network_iocs = NetworkIndicator.query.filter_by(incident_id=incident.id).all()
-        host_iocs = HostBasedIndicator.query.filter_by(incident_id=incident.id).all()
-        malware = MalwareTool.query.filter_by(incident_id=incident.id).all()
+        records = _load_report_records(incident)
         html_content = _build_fallback_report_html(
             incident=incident,
-            timeline_events=timeline_events,
-            hosts=hosts,
-            accounts=accounts,
-            network_iocs=network_iocs,
-            host_iocs=host_iocs,
-            malware=malware,
             sections=sections,
             report_title=report_title,
+            **records,
         )
 
     try:
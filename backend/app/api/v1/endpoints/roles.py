@@ -25,7 +25,7 @@ def list_roles():
 @require_permission('users:read')
 def get_role(role_id):
     """Get role details."""
-    role = Role.query.get(role_id)
+    role = Role.get_by_id(role_id)
     if not role:
         return jsonify({'error': 'not_found', 'message': 'Role not found'}), 404
 
@@ -52,8 +52,8 @@ def create_role():
         return jsonify({'error': 'conflict', 'message': 'A role with this name already exists'}), 409
 
     permissions = data.get('permissions', [])
-    if not isinstance(permissions, list):
-        return jsonify({'error': 'bad_request', 'message': 'Permissions must be an array'}), 400
+    if not _is_permission_list(permissions):
+        return jsonify({'error': 'bad_request', 'message': 'Permissions must be an array of strings'}), 400
 
     role = Role(
         name=name,
@@ -73,11 +73,17 @@ def create_role():
 @audit_log('admin_action', 'update', 'role')
 def update_role(role_id):
     """Update a role."""
-    role = Role.query.get(role_id)
+    role = Role.get_by_id(role_id)
     if not role:
         return jsonify({'error': 'not_found', 'message': 'Role not found'}), 404
 
     data = request.get_json()
+    if not data:
+        return jsonify({'error': 'bad_request', 'message': 'No data provided'}), 400
+
+    # permissions is a NOT NULL text[] column
+    if 'permissions' in data and not _is_permission_list(data['permissions']):
+        return jsonify({'error': 'bad_request', 'message': 'Permissions must be an array of strings'}), 400
 
     # For system roles, only allow adding permissions (not removing or renaming)
     if role.is_system:
@@ -112,7 +118,7 @@ def update_role(role_id):
 @audit_log('admin_action', 'delete', 'role')
 def delete_role(role_id):
     """Delete a custom role."""
-    role = Role.query.get(role_id)
+    role = Role.get_by_id(role_id)
     if not role:
         return jsonify({'error': 'not_found', 'message': 'Role not found'}), 404
 
@@ -133,6 +139,11 @@ def delete_role(role_id):
     return jsonify({'message': 'Role deleted'}), 200
 
 
+def _is_permission_list(value):
+    """Whether ``value`` is a list of non-empty permission strings."""
+    return isinstance(value, list) and all(isinstance(p, str) and p for p in value)
+
+
 def _role_to_dict(role):
     """Convert role to dictionary."""
     return {
@@ -6,6 +6,7 @@ IOCs, hosts, accounts, notes) and cross-incident IOC correlation.
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import or_, func, text, cast, String
+from sqlalchemy.orm import selectinload
 from app.api.v1 import api_bp
 from app.middleware.rbac import require_permission
 from app import db
@@ -214,20 +215,19 @@ def search_across_incidents():
             })
 
     if 'notes' in search_types:
-        rows = db.session.query(CaseNote).filter(
+        # content is deferred; only the snippet is fetched
+        rows = db.session.query(CaseNote, func.left(CaseNote.content, 200)).filter(
             CaseNote.incident_id.in_(accessible_ids),
-            or_(
-                CaseNote.title.ilike(search_term),
-                CaseNote.content.ilike(search_term),
-            )
+            # Word match against the GIN-indexed tsvector instead of ILIKE scans
+            CaseNote.search_vec.op('@@')(func.plainto_tsquery('english', q)),
         ).all()
-        for r in rows:
+        for r, snippet in rows:
             results.append({
                 'type': 'case_note',
                 'incident_id': str(r.incident_id),
                 'incident_title': r.incident.title if r.incident else None,
                 'title': r.title,
-                'snippet': (r.content or '')[:200],
+                'snippet': snippet or '',
                 'timestamp': r.created_at.isoformat() if r.created_at else None,
             })
 
@@ -426,43 +426,38 @@ def bulk_enrich():
     if len(ioc_list) > 100:
         return jsonify({'error': 'Maximum 100 IOCs per batch'}), 400
 
-    enrichment = EnrichmentService
-    results = []
-
-    for ioc in ioc_list:
-        value = ioc.get('value', '')
-        ioc_type = ioc.get('type', 'ip')
-        if not value:
-            continue
-
-        # Map user-friendly types to enrichment service types
-        type_map = {
-            'ip': 'ip-src',
-            'domain': 'domain',
-            'hash': 'sha256',
-            'md5': 'md5',
-            'sha1': 'sha1',
-            'sha256': 'sha256',
-            'email': 'email',
-            'hostname': 'hostname',
-        }
-        svc_type = type_map.get(ioc_type, ioc_type)
+    # Map user-friendly types to enrichment service types
+    type_map = {
+        'ip': 'ip-src',
+        'domain': 'domain',
+        'hash': 'sha256',
+        'md5': 'md5',
+        'sha1': 'sha1',
+        'sha256': 'sha256',
+        'email': 'email',
+        'hostname': 'hostname',
+    }
+    iocs = [
+        (ioc.get('value', ''), ioc.get('type', 'ip'))
+        for ioc in ioc_list
+        if ioc.get('value', '')
+    ]
 
-        try:
-            enrichment_result = enrichment.auto_enrich_ioc(svc_type, value, str(user.organization_id))
-            results.append({
-                'value': value,
-                'type': ioc_type,
-                'status': 'success',
-                'enrichment': enrichment_result or {},
-            })
-        except Exception as e:
-            results.append({
-                'value': value,
-                'type': ioc_type,
-                'status': 'error',
-                'error': str(e),
-            })
+    try:
+        enrichments = EnrichmentService.enrich_iocs(
+            [(type_map.get(ioc_type, ioc_type), value) for value, ioc_type in iocs],
+            str(user.organization_id),
+        )
+    except Exception as e:
+        results = [
+            {'value': value, 'type': ioc_type, 'status': 'error', 'error': str(e)}
+            for value, ioc_type in iocs
+        ]
+    else:
+        results = [
+            {'value': value, 'type': ioc_type, 'status': 'success', 'enrichment': enrichment_result or {}}
+            for (value, ioc_type), enrichment_result in zip(iocs, enrichments)
+        ]
 
     return jsonify({
         'results': results,
@@ -498,7 +493,13 @@ def export_incident_stix(incident_id):
     if not user:
         return jsonify({'error': 'User not found'}), 404
 
-    incident = db.session.query(Incident).filter(
+    incident = db.session.query(Incident).options(
+        selectinload(Incident.network_indicators),
+        selectinload(Incident.host_indicators),
+        selectinload(Incident.malware_tools),
+        selectinload(Incident.compromised_hosts),
+        selectinload(Incident.timeline_events),
+    ).filter(
         Incident.id == incident_id,
         Incident.organization_id == user.organization_id,
         Incident.is_archived.is_(False),
@@ -552,7 +553,7 @@ def export_incident_stix(incident_id):
     ref_ids = []
 
     # --- Indicators (Network IOCs) ---
-    for ioc in incident.network_indicators.all():
+    for ioc in incident.network_indicators:
         indicator_id = f"indicator--{ioc.id}"
         pattern_type = 'ipv4-addr' if _is_ip(ioc.dns_ip) else 'domain-name'
         pattern_value = f"[{pattern_type}:value = '{ioc.dns_ip}']"
@@ -573,7 +574,7 @@ def export_incident_stix(incident_id):
         ref_ids.append(indicator_id)
 
     # --- Indicators (Host IOCs) ---
-    for ioc in incident.host_indicators.all():
+    for ioc in incident.host_indicators:
         indicator_id = f"indicator--{ioc.id}"
         pattern_value = f"[file:name = '{ioc.artifact_value}']" if ioc.artifact_type == 'file' else \
                         f"[process:name = '{ioc.artifact_value}']" if ioc.artifact_type == 'process' else \
@@ -596,7 +597,7 @@ def export_incident_stix(incident_id):
         ref_ids.append(indicator_id)
 
     # --- Malware ---
-    for m in incident.malware_tools.all():
+    for m in incident.malware_tools:
         malware_id = f"malware--{m.id}"
         stix_objects.append({
             'type': 'malware',
@@ -615,7 +616,7 @@ def export_incident_stix(incident_id):
         ref_ids.append(malware_id)
 
     # --- Infrastructure (Hosts) ---
-    for host in incident.compromised_hosts.all():
+    for host in incident.compromised_hosts:
         infra_id = f"infrastructure--{host.id}"
         stix_objects.append({
             'type': 'infrastructure',
@@ -631,7 +632,7 @@ def export_incident_stix(incident_id):
 
     # --- Attack Patterns (MITRE techniques from timeline) ---
     seen_techniques = set()
-    for event in incident.timeline_events.all():
+    for event in incident.timeline_events:
         mappings = event.mitre_mappings or []
         if not mappings and event.mitre_technique:
             mappings = [{'tactic': event.mitre_tactic or '', 'technique': event.mitre_technique}]
@@ -2,6 +2,7 @@
 from datetime import datetime, timezone
 from flask import jsonify, request, g
 from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import selectinload
 from dateutil.parser import parse as parse_date
 from app.api.v1 import api_bp
 from app import db, socketio
@@ -20,14 +21,22 @@ def list_tasks(incident_id):
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 50, type=int), 200)
 
-    query = Task.query.filter_by(incident_id=incident.id, parent_task_id=None)
+    query = Task.query.options(
+        Task.creator_loader(),
+        selectinload(Task.assignee),
+        selectinload(Task.recent_comments).selectinload(TaskComment.author),
+    ).filter_by(incident_id=incident.id, parent_task_id=None)
 
     status = request.args.get('status')
     if status:
+        if status not in Task.STATUSES:
+            return jsonify({'error': 'bad_request', 'message': 'Invalid status'}), 400
         query = query.filter(Task.status == status)
 
     priority = request.args.get('priority')
     if priority:
+        if priority not in Task.PRIORITIES:
+            return jsonify({'error': 'bad_request', 'message': 'Invalid priority'}), 400
         query = query.filter(Task.priority == priority)
 
     assignee_id = request.args.get('assignee_id')
@@ -111,11 +120,16 @@ def get_task(incident_id, task_id):
     """Get task details."""
     incident = g.incident
 
-    task = Task.query.filter_by(id=task_id, incident_id=incident.id).first()
+    include_subtasks = request.args.get('include_subtasks', 'false').lower() == 'true'
+    if include_subtasks:
+        # Whole subtask tree in one recursive query
+        task = Task.fetch_tree(task_id, incident.id)
+    else:
+        task = Task.query.filter_by(id=task_id, incident_id=incident.id).first()
     if not task:
         return jsonify({'error': 'not_found', 'message': 'Task not found'}), 404
 
-    return jsonify(task.to_dict(include_comments=True)), 200
+    return jsonify(task.to_dict(include_comments=True, include_subtasks=include_subtasks)), 200
 
 
 @api_bp.route('/incidents/<uuid:incident_id>/tasks/<uuid:task_id>', methods=['PUT'])
@@ -131,6 +145,9 @@ def update_task(incident_id, task_id):
     if not task:
         return jsonify({'error': 'not_found', 'message': 'Task not found'}), 404
 
+    if 'priority' in data and data['priority'] not in Task.PRIORITIES:
+        return jsonify({'error': 'bad_request', 'message': 'Invalid priority'}), 400
+
     old_assignee = task.assignee_id
 
     # Convert empty strings to None for UUID fields
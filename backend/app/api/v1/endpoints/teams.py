@@ -1,6 +1,7 @@
 """Team management endpoints"""
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import selectinload
 from app.api.v1 import api_bp
 from app import db
 from app.models import Team, TeamMember, User
@@ -58,7 +59,9 @@ def create_team():
 def get_team(team_id):
     """Get a team with members."""
     user = get_current_user()
-    team = Team.query.filter_by(id=team_id, organization_id=user.organization_id).first()
+    team = Team.query.options(
+        selectinload(Team.members).selectinload(TeamMember.user)
+    ).filter_by(id=team_id, organization_id=user.organization_id).first()
 
     if not team:
         return jsonify({'error': 'not_found', 'message': 'Team not found'}), 404
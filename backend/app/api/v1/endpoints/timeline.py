@@ -20,7 +20,8 @@ def list_timeline_events(incident_id):
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 50, type=int), 200)
 
-    query = TimelineEvent.query.filter_by(incident_id=incident.id)
+    query = TimelineEvent.query.options(TimelineEvent.creator_loader()) \
+        .filter_by(incident_id=incident.id)
 
     # Filters
     phase = request.args.get('phase', type=int)
@@ -101,7 +102,11 @@ def create_timeline_event(incident_id):
         mitre_tactic = data.get('mitre_tactic')
         mitre_technique = data.get('mitre_technique')
         if mitre_tactic or mitre_technique:
-            mitre_mappings = [{'tactic': mitre_tactic or '', 'technique': mitre_technique or '', 'name': ''}]
+            mitre_mappings = [{
+                'tactic': mitre_tactic or '',
+                'technique': mitre_technique or '',
+                'name': TimelineEvent.TECHNIQUE_BY_ID.get(mitre_technique, ''),
+            }]
         else:
             mitre_mappings = []
 
@@ -123,7 +128,7 @@ def create_timeline_event(incident_id):
     # Validate each mapping entry
     for m in mitre_mappings:
         tactic = m.get('tactic', '')
-        if tactic and tactic not in TimelineEvent.MITRE_TACTICS:
+        if tactic and tactic not in TimelineEvent.MITRE_TACTIC_SET:
             return jsonify({'error': 'bad_request', 'message': f'Invalid MITRE tactic: {tactic}'}), 400
 
     # Set legacy fields from first mapping for backward compat / indexing
@@ -209,7 +214,7 @@ def update_timeline_event(incident_id, event_id):
         mappings = data['mitre_mappings'] or []
         for m in mappings:
             tactic = m.get('tactic', '')
-            if tactic and tactic not in TimelineEvent.MITRE_TACTICS:
+            if tactic and tactic not in TimelineEvent.MITRE_TACTIC_SET:
                 return jsonify({'error': 'bad_request', 'message': f'Invalid MITRE tactic: {tactic}'}), 400
         event.mitre_mappings = mappings
         event.mitre_tactic = mappings[0]['tactic'] if mappings else None
@@ -218,12 +223,16 @@ def update_timeline_event(incident_id, event_id):
         # Legacy single-field update
         tactic = data.get('mitre_tactic', event.mitre_tactic)
         technique = data.get('mitre_technique', event.mitre_technique)
-        if tactic and tactic not in TimelineEvent.MITRE_TACTICS:
+        if tactic and tactic not in TimelineEvent.MITRE_TACTIC_SET:
             return jsonify({'error': 'bad_request', 'message': 'Invalid MITRE tactic'}), 400
         event.mitre_tactic = tactic
         event.mitre_technique = technique
         if tactic or technique:
-            event.mitre_mappings = [{'tactic': tactic or '', 'technique': technique or '', 'name': ''}]
+            event.mitre_mappings = [{
+                'tactic': tactic or '',
+                'technique': technique or '',
+                'name': TimelineEvent.TECHNIQUE_BY_ID.get(technique, ''),
+            }]
         else:
             event.mitre_mappings = []
 
@@ -343,17 +352,17 @@ def list_mitre_techniques():
     tactic = request.args.get('tactic')
     
     if tactic:
-        if tactic not in TimelineEvent.MITRE_TACTICS:
+        if tactic not in TimelineEvent.MITRE_TACTIC_SET:
             return jsonify({'error': 'bad_request', 'message': 'Invalid tactic'}), 400
-        techniques = TimelineEvent.MITRE_TECHNIQUES.get(tactic, [])
+        techniques = TimelineEvent.MITRE_TECHNIQUES.get(tactic, {})
         return jsonify({
             'tactic': tactic,
-            'techniques': [{'id': t[0], 'name': t[1]} for t in techniques]
+            'techniques': [{'id': tid, 'name': name} for tid, name in techniques.items()]
         }), 200
     
     # Return all techniques organized by tactic
     all_techniques = {}
     for tactic, techniques in TimelineEvent.MITRE_TECHNIQUES.items():
-        all_techniques[tactic] = [{'id': t[0], 'name': t[1]} for t in techniques]
+        all_techniques[tactic] = [{'id': tid, 'name': name} for tid, name in techniques.items()]
     
     return jsonify({'techniques': all_techniques}), 200
@@ -207,7 +207,7 @@ def assign_role(user_id):
     if not role_id:
         return jsonify({'error': 'bad_request', 'message': 'role_id is required'}), 400
 
-    role = Role.query.get(role_id)
+    role = Role.get_by_id(role_id)
     if not role:
         return jsonify({'error': 'not_found', 'message': 'Role not found'}), 404
 
@@ -21,7 +21,7 @@ def register_handlers(socketio):
             try:
                 decoded = decode_token(auth_token)
                 user_id = decoded.get('sub')
-                user = User.query.get(user_id)
+                user = User.get_by_id(user_id)
                 if user:
                     # Join user's personal room for notifications
                     join_room(f'user_{user_id}')
@@ -1,6 +1,8 @@
 """Flask Configuration"""
 import os
 from datetime import timedelta
+import orjson
+from app.json_provider import dumps_db
 
 
 class BaseConfig:
@@ -13,6 +15,13 @@ class BaseConfig:
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,
         'pool_recycle': 300,
+        # Rows per multi-VALUES INSERT; PostgreSQL gains little past ~1000
+        'insertmanyvalues_page_size': 1000,
+        'executemany_mode': 'values_plus_batch',
+        # JSONB columns (extra_data, checklist, sections, settings, ...) are
+        # encoded and decoded with orjson instead of the stdlib json module
+        'json_serializer': dumps_db,
+        'json_deserializer': orjson.loads,
     }
 
     # Redis
@@ -44,6 +53,8 @@ class BaseConfig:
     # AI Providers
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
     GOOGLE_AI_API_KEY = os.getenv('GOOGLE_AI_API_KEY', '')
+    # Race OpenAI and Google for reports when both are configured (doubles cost)
+    AI_HEDGE_PROVIDERS = os.getenv('AI_HEDGE_PROVIDERS', 'false').lower() == 'true'
 
     # Google Drive OAuth
     GOOGLE_DRIVE_CLIENT_ID = os.getenv('GOOGLE_DRIVE_CLIENT_ID', '')
@@ -64,6 +75,10 @@ class BaseConfig:
     # File uploads
     MAX_CONTENT_LENGTH = 500 * 1024 * 1024  # 500MB max upload
 
+    # Chain of custody actions to record: all | writes_only (no views) |
+    # mutations_only (no views/downloads) | failures_only (hash mismatches)
+    AUDIT_TRAIL_LEVEL = os.getenv('AUDIT_TRAIL_LEVEL', 'all')
+
     # Bcrypt
     BCRYPT_LOG_ROUNDS = 12
 
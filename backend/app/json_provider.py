@@ -0,0 +1,55 @@
+"""orjson-backed JSON provider for Flask responses"""
+from decimal import Decimal
+import orjson
+from flask.json.provider import JSONProvider
+
+# UUIDs and datetimes are serialised natively by orjson; int dict keys
+# (e.g. Incident.PHASES) are allowed as with the stdlib encoder.
+_DUMPS_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def _default(o):
+    """Fallback for types orjson does not handle natively."""
+    if isinstance(o, Decimal):
+        return str(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def dumps_db(obj):
+    """JSON/JSONB bind serializer for the SQLAlchemy engine."""
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+class SocketIOJSON:
+    """orjson-backed ``json`` module for Flask-SocketIO packet encoding.
+
+    Lets event payloads carry the same UUIDs and datetimes as HTTP
+    responses; stdlib keyword arguments (``separators``) are ignored.
+    """
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS).decode('utf-8')
+
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+
+class ORJSONProvider(JSONProvider):
+    """Encode/decode JSON with orjson (C extension) instead of the stdlib."""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -2,10 +2,12 @@
 import logging
 import re
 import time
-from functools import wraps
-from flask import request, g
+from datetime import datetime, timezone
+from functools import lru_cache, partial, wraps
+from flask import request, g, has_request_context
 from app import db
 from app.models import AuditLog
+from app.models.base import uuid7
 
 logger = logging.getLogger(__name__)
 
@@ -15,38 +17,122 @@ _SENSITIVE_KEYS = re.compile(
     re.IGNORECASE,
 )
 
+# Max rows per multi-row INSERT when flushing buffered audit events
+AUDIT_BATCH = 1000
+
 # Event types worth broadcasting to the activity feed
 _BROADCAST_EVENT_TYPES = {
     'data_modification', 'data_access', 'admin_action', 'security_event',
 }
 
 
-def _broadcast_activity(log_entry):
-    """Emit a WebSocket event for the activity feed."""
-    if not log_entry or not log_entry.organization_id:
+def _broadcast_activity(entry):
+    """Emit a WebSocket event for the activity feed.
+
+    ``entry`` is the column mapping the audit row was inserted from.
+    """
+    if not entry or not entry.get('organization_id'):
         return
-    if log_entry.event_type not in _BROADCAST_EVENT_TYPES:
+    if entry['event_type'] not in _BROADCAST_EVENT_TYPES:
         return
     try:
         from app import socketio
         payload = {
-            'id': str(log_entry.id),
-            'event_type': log_entry.event_type,
-            'action': log_entry.action,
-            'resource_type': log_entry.resource_type,
-            'resource_id': str(log_entry.resource_id) if log_entry.resource_id else None,
-            'incident_id': str(log_entry.incident_id) if log_entry.incident_id else None,
-            'user_email': log_entry.user_email,
-            'user_id': str(log_entry.user_id) if log_entry.user_id else None,
-            'created_at': log_entry.created_at.isoformat() if log_entry.created_at else None,
-            'details': log_entry.details,
+            'id': str(entry['id']),
+            'event_type': entry['event_type'],
+            'action': entry['action'],
+            'resource_type': entry.get('resource_type'),
+            'resource_id': str(entry['resource_id']) if entry.get('resource_id') else None,
+            'incident_id': str(entry['incident_id']) if entry.get('incident_id') else None,
+            'user_email': entry.get('user_email'),
+            'user_id': str(entry['user_id']) if entry.get('user_id') else None,
+            'created_at': entry['created_at'].isoformat() if entry.get('created_at') else None,
+            'details': entry.get('details'),
         }
-        room = f'org_{log_entry.organization_id}'
+        room = f'org_{entry["organization_id"]}'
         socketio.emit('activity:new', payload, room=room)
     except Exception:
         logger.debug('Activity broadcast skipped', exc_info=True)
 
 
+def _new_audit_row(**fields):
+    """Build an audit_logs column mapping with client-generated id/created_at."""
+    return {'id': uuid7(), 'created_at': datetime.now(timezone.utc), **fields}
+
+
+def _write_audit_rows(rows):
+    """Insert audit rows in one batched insert, then broadcast them."""
+    try:
+        AuditLog.bulk_insert(rows, batch_size=AUDIT_BATCH)
+    except Exception:
+        db.session.rollback()
+        logger.exception('Audit logging error')
+        return
+    for row in rows:
+        _broadcast_activity(row)
+
+
+def _write_audit_rows_after_response(app, rows):
+    """``call_on_close`` callback: write rows once the response is sent."""
+    with app.app_context():
+        _write_audit_rows(rows)
+
+
+def _flush_audit_buffer(exc=None):
+    """Write all audit rows queued during this request now."""
+    rows = g.pop('audit_buffer', None)
+    if rows:
+        if exc is not None:
+            # The request raised: keep its pending work out of the audit commit
+            db.session.rollback()
+        _write_audit_rows(rows)
+
+
+def init_audit_buffer(app):
+    """Write buffered audit rows after the response has been sent.
+
+    Rows still queued at teardown (the request raised before a response
+    was built) are flushed there instead.
+    """
+    @app.after_request
+    def write_audit_after_response(response):
+        rows = g.pop('audit_buffer', None)
+        if rows:
+            response.call_on_close(partial(_write_audit_rows_after_response, app, rows))
+        return response
+
+    app.teardown_request(_flush_audit_buffer)
+
+
+@lru_cache(maxsize=256)
+def _truncate_user_agent(raw_ua: str) -> str:
+    """Truncate a User-Agent header to the stored length.
+
+    Production traffic carries only a handful of distinct user agents, so the
+    truncated value is cached and shared instead of re-sliced per audit event.
+    The header is client-controlled, so it is not ``sys.intern``-ed: interned
+    strings are never freed and rotating user agents would grow memory.
+    """
+    return raw_ua[:500]
+
+
+def request_client():
+    """``(ip_address, user_agent)`` of the current request, read once per request.
+
+    The user agent is truncated to 500 characters. Both are None outside
+    a request.
+    """
+    if not has_request_context():
+        return None, None
+    client = g.get('request_client')
+    if client is None:
+        client = g.request_client = (
+            request.remote_addr,
+            _truncate_user_agent(request.headers.get('User-Agent', '')),
+        )
+    return client
+
+
 def _parse_user_agent(ua_string: str) -> dict:
     """Extract browser, OS, and device type from a User-Agent string."""
     if not ua_string:
@@ -132,7 +218,7 @@ def _sanitize_body(body: dict, max_depth: int = 2, depth: int = 0) -> dict:
 
 def _collect_request_context() -> dict:
     """Gather rich context from the current Flask request."""
-    ua_string = request.headers.get('User-Agent', '')[:500]
+    ip_address, ua_string = request_client()
     ua_info = _parse_user_agent(ua_string)
 
     # Sanitised request body summary
@@ -154,7 +240,7 @@ def _collect_request_context() -> dict:
             query_params[k] = v
 
     return {
-        'ip_address': request.remote_addr,
+        'ip_address': ip_address,
         'user_agent': ua_string,
         'request_method': request.method,
         'request_path': request.path,
@@ -209,7 +295,8 @@ def audit_log(event_type, action, resource_type=None):
 
                 ctx = _collect_request_context()
 
-                log_entry = AuditLog(
+                # Queued and written in one batch after the response
+                g.setdefault('audit_buffer', []).append(_new_audit_row(
                     organization_id=user.organization_id if user else None,
                     user_id=user.id if user else None,
                     user_email=user.email if user else None,
@@ -224,10 +311,7 @@ def audit_log(event_type, action, resource_type=None):
                         'args': {k: str(v) for k, v in kwargs.items() if k != 'password'},
                     },
                     **ctx,
-                )
-                db.session.add(log_entry)
-                db.session.commit()
-                _broadcast_activity(log_entry)
+                ))
             except Exception:
                 logger.exception('Audit logging error')
 
@@ -243,10 +327,14 @@ def log_audit_event(
     resource_id=None,
     incident_id=None,
     details=None,
-    user=None
+    user=None,
+    deferred=False
 ):
     """Helper function to log audit events manually.
 
+    With ``deferred=True`` inside a request, the row joins the
+    ``@audit_log`` buffer written after the response and None is returned.
+
     Usage:
         log_audit_event(
             event_type='security_event',
@@ -262,7 +350,7 @@ def log_audit_event(
 
         ctx = _collect_request_context() if request else {}
 
-        log_entry = AuditLog(
+        row = _new_audit_row(
             organization_id=user.organization_id if user else None,
             user_id=user.id if user else None,
             user_email=user.email if user else None,
@@ -274,9 +362,13 @@ def log_audit_event(
             details=details or {},
             **ctx,
         )
+        if deferred and has_request_context():
+            g.setdefault('audit_buffer', []).append(row)
+            return None
+        log_entry = AuditLog(**row)
         db.session.add(log_entry)
         db.session.commit()
-        _broadcast_activity(log_entry)
+        _broadcast_activity(row)
         return log_entry
     except Exception:
         db.session.rollback()
@@ -298,7 +390,8 @@ def log_auth_event(action, user=None, success=True, details=None):
     )
 
 
-def log_security_event(action, resource_type=None, resource_id=None, incident_id=None, details=None):
+def log_security_event(action, resource_type=None, resource_id=None, incident_id=None, details=None,
+                       deferred=False):
     """Log security-sensitive events."""
     return log_audit_event(
         event_type='security_event',
@@ -306,5 +399,6 @@ def log_security_event(action, resource_type=None, resource_id=None, incident_id
         resource_type=resource_type,
         resource_id=resource_id,
         incident_id=incident_id,
-        details=details
+        details=details,
+        deferred=deferred
     )
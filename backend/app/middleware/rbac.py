@@ -15,7 +15,7 @@ def get_current_user():
     if hasattr(g, 'current_user') and g.current_user and str(g.current_user.id) == user_id:
         return g.current_user
 
-    user = User.query.get(user_id)
+    user = User.get_by_id(user_id)
     if user and user.is_active:
         g.current_user = user
         return user
@@ -1,7 +1,7 @@
 """Artifact and chain of custody models"""
 from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, BigInteger, Index
 from sqlalchemy.dialects.postgresql import UUID, INET, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.models.base import BaseModel
 
 
@@ -15,7 +15,7 @@ class Artifact(BaseModel):
     incident_id = Column(UUID(as_uuid=True), ForeignKey('incidents.id', ondelete='CASCADE'), nullable=False)
     filename = Column(String(500), nullable=False)
     original_filename = Column(String(500), nullable=False)
-    storage_path = Column(Text, nullable=False)
+    storage_path = deferred(Column(Text, nullable=False))  # server-side only; loaded on download/delete
     storage_type = Column(String(50), default='local')
     mime_type = Column(String(255))
     file_size = Column(BigInteger, nullable=False)
@@ -28,7 +28,7 @@ class Artifact(BaseModel):
     is_verified = Column(Boolean, default=True)
     verification_status = Column(String(50), default='verified')
     last_verified_at = Column(DateTime(timezone=True))
-    extra_data = Column(JSONB, default=dict)
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
 
     # Relationships
@@ -45,7 +45,7 @@ class Artifact(BaseModel):
     def to_dict(self, include_custody=False):
         """Convert to dictionary."""
         data = super().to_dict()
-        data['uploader'] = {'id': str(self.uploader.id), 'name': self.uploader.name} if self.uploader else None
+        data['uploader'] = self.uploader.summary_dict if self.uploader else None
 
         if include_custody:
             data['chain_of_custody'] = [coc.to_dict() for coc in self.chain_of_custody.order_by(ChainOfCustody.created_at.desc()).limit(10)]
@@ -65,7 +65,7 @@ class ChainOfCustody(BaseModel):
     purpose = Column(Text)
     recipient_id = Column(UUID(as_uuid=True), ForeignKey('users.id'))
     verification_result = Column(String(50))
-    extra_data = Column(JSONB, default=dict)
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
 
     # Relationships
     artifact = relationship('Artifact', back_populates='chain_of_custody')
@@ -80,7 +80,6 @@ class ChainOfCustody(BaseModel):
     def to_dict(self):
         """Convert to dictionary."""
         data = super().to_dict()
-        data['ip_address'] = str(self.ip_address) if self.ip_address else None
-        data['performer'] = {'id': str(self.performer.id), 'name': self.performer.name} if self.performer else None
-        data['recipient'] = {'id': str(self.recipient.id), 'name': self.recipient.name} if self.recipient else None
+        data['performer'] = self.performer.summary_dict if self.performer else None
+        data['recipient'] = self.recipient.summary_dict if self.recipient else None
         return data
@@ -1,9 +1,12 @@
 """Attack graph visualization models"""
-from sqlalchemy import Column, String, Text, Boolean, Float, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, Float, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
+# Shared read-only fallback for nodes without extra_data
+_EMPTY = {}
+
 
 class AttackGraphNode(BaseModel):
     """Attack graph node model."""
@@ -18,7 +21,7 @@ class AttackGraphNode(BaseModel):
     position_y = Column(Float, default=0)
     is_initial_access = Column(Boolean, default=False)
     is_objective = Column(Boolean, default=False)
-    extra_data = Column(JSONB, default=dict)
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime(timezone=True))
 
@@ -42,25 +45,23 @@ class AttackGraphNode(BaseModel):
     def to_dict(self):
         """Convert to dictionary for Cytoscape.js."""
         data = super().to_dict()
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
+        data['creator'] = self.creator.summary_dict if self.creator else None
+        extra = data['extra_data'] or _EMPTY
 
-        # Cytoscape.js format
+        # Cytoscape.js format, built from the already-serialised column values
         data['cytoscape'] = {
             'data': {
-                'id': str(self.id),
-                'label': self.label,
-                'type': self.node_type,
-                'isInitialAccess': self.is_initial_access,
-                'isObjective': self.is_objective,
-                'hasAdminCompromise': self.extra_data.get('has_admin_compromise', False) if self.extra_data else False,
-                'containmentStatus': self.extra_data.get('containment_status') if self.extra_data else None,
-                'compromisedHostId': str(self.compromised_host_id) if self.compromised_host_id else None,
-                'compromisedAccountId': str(self.compromised_account_id) if self.compromised_account_id else None,
+                'id': data['id'],
+                'label': data['label'],
+                'type': data['node_type'],
+                'isInitialAccess': data['is_initial_access'],
+                'isObjective': data['is_objective'],
+                'hasAdminCompromise': extra.get('has_admin_compromise', False),
+                'containmentStatus': extra.get('containment_status'),
+                'compromisedHostId': data['compromised_host_id'],
+                'compromisedAccountId': data['compromised_account_id'],
             },
-            'position': {
-                'x': self.position_x,
-                'y': self.position_y
-            }
+            'position': {'x': data['position_x'], 'y': data['position_y']},
         }
 
         return data
@@ -69,17 +70,25 @@ class AttackGraphNode(BaseModel):
 class AttackGraphEdge(BaseModel):
     """Attack graph edge model."""
     __tablename__ = 'attack_graph_edges'
+    __table_args__ = (
+        Index('idx_edge_incident_source', 'incident_id', 'source_node_id'),
+        Index('idx_edge_incident_target', 'incident_id', 'target_node_id'),
+    )
 
     incident_id = Column(UUID(as_uuid=True), ForeignKey('incidents.id', ondelete='CASCADE'), nullable=False)
-    source_node_id = Column(UUID(as_uuid=True), ForeignKey('attack_graph_nodes.id', ondelete='CASCADE'), nullable=False)
-    target_node_id = Column(UUID(as_uuid=True), ForeignKey('attack_graph_nodes.id', ondelete='CASCADE'), nullable=False)
+    source_node_id = Column(UUID(as_uuid=True), ForeignKey(
+        'attack_graph_nodes.id', ondelete='CASCADE', deferrable=True, initially='DEFERRED'
+    ), nullable=False)
+    target_node_id = Column(UUID(as_uuid=True), ForeignKey(
+        'attack_graph_nodes.id', ondelete='CASCADE', deferrable=True, initially='DEFERRED'
+    ), nullable=False)
     edge_type = Column(String(50), nullable=False)
     label = Column(String(255))
     mitre_tactic = Column(String(100))
     mitre_technique = Column(String(20))
     timestamp = Column(DateTime(timezone=True))
     description = Column(Text)
-    extra_data = Column(JSONB, default=dict)
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime(timezone=True))
 
@@ -101,18 +110,19 @@ class AttackGraphEdge(BaseModel):
     def to_dict(self):
         """Convert to dictionary for Cytoscape.js."""
         data = super().to_dict()
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
+        data['creator'] = self.creator.summary_dict if self.creator else None
 
-        # Cytoscape.js format
+        # Cytoscape.js format, built from the already-serialised column values
+        edge_type = data['edge_type']
         data['cytoscape'] = {
             'data': {
-                'id': str(self.id),
-                'source': str(self.source_node_id),
-                'target': str(self.target_node_id),
-                'label': self.label or self.edge_type,
-                'type': self.edge_type,
-                'mitreTactic': self.mitre_tactic,
-                'mitreTechnique': self.mitre_technique,
+                'id': data['id'],
+                'source': data['source_node_id'],
+                'target': data['target_node_id'],
+                'label': data['label'] or edge_type,
+                'type': edge_type,
+                'mitreTactic': data['mitre_tactic'],
+                'mitreTechnique': data['mitre_technique'],
             }
         }
 
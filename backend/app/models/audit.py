@@ -1,5 +1,6 @@
 """Audit log model"""
-from sqlalchemy import Column, String, Text, Integer, Float, DateTime, ForeignKey
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Text, Integer, Float, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, INET, JSONB
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
@@ -8,6 +9,20 @@ from app.models.base import BaseModel
 class AuditLog(BaseModel):
     """Audit log model for tracking all system actions."""
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        Index('idx_audit_org_event_created', 'organization_id', 'event_type', 'created_at'),
+        Index('idx_audit_incident_created', 'incident_id', 'created_at'),
+        Index('idx_audit_user_created', 'user_id', 'created_at'),
+        # Append-only, time-ordered table: BRIN keeps range scans cheap at a tiny size
+        Index('idx_audit_created_brin', 'created_at', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
+        # Monthly partitions (audit_logs_YYYY_MM); see create_audit_log_partitions()
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+    # PostgreSQL requires the partition key in the primary key: (id, created_at)
+    created_at = Column(DateTime(timezone=True), primary_key=True,
+                        default=lambda: datetime.now(timezone.utc))
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey('organizations.id', ondelete='SET NULL'))
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='SET NULL'))
@@ -21,8 +36,8 @@ class AuditLog(BaseModel):
     user_agent = Column(Text)
     request_method = Column(String(10))
     request_path = Column(Text)
-    request_query_params = Column(JSONB, default=dict)
-    request_body_summary = Column(JSONB, default=dict)
+    request_query_params = Column(JSONB, nullable=False, server_default='{}')
+    request_body_summary = Column(JSONB, nullable=False, server_default='{}')
     content_type = Column(String(255))
     referrer = Column(Text)
     origin = Column(String(255))
@@ -37,7 +52,7 @@ class AuditLog(BaseModel):
     browser = Column(String(100))
     os = Column(String(100))
     device_type = Column(String(50))
-    details = Column(JSONB, default=dict)
+    details = Column(JSONB, nullable=False, server_default='{}')
 
     # Relationships
     organization = relationship('Organization')
@@ -55,15 +70,14 @@ class AuditLog(BaseModel):
     def to_dict(self):
         """Convert to dictionary."""
         data = super().to_dict()
-        data['ip_address'] = str(self.ip_address) if self.ip_address else None
         data['user'] = {
-            'id': str(self.user.id),
+            'id': self.user.id,
             'email': self.user.email,
             'name': self.user.name,
             'role': ', '.join(self.user.role_names) if self.user.role_names else None,
         } if self.user else None
         data['incident'] = {
-            'id': str(self.incident.id),
+            'id': self.incident.id,
             'title': self.incident.title,
         } if self.incident else None
         return data
@@ -1,7 +1,7 @@
 """Case notes model for incident documentation."""
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Boolean, Index
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Boolean, Index, Computed
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.models.base import BaseModel
 
 
@@ -11,16 +11,22 @@ class CaseNote(BaseModel):
     __table_args__ = (
         Index('idx_case_notes_incident', 'incident_id'),
         Index('idx_case_notes_created', 'created_at'),
+        Index('idx_case_notes_fts', 'search_vec', postgresql_using='gin'),
     )
 
     incident_id = Column(UUID(as_uuid=True), ForeignKey('incidents.id', ondelete='CASCADE'), nullable=False)
     title = Column(String(500), nullable=False)
-    content = Column(Text, nullable=False)
+    content = deferred(Column(Text, nullable=False))  # undeferred where the full body is returned
     category = Column(String(50), default='general')  # general, finding, question, action_item, handoff
     is_pinned = Column(Boolean, default=False)
     is_archived = Column(Boolean, default=False, server_default='false')
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime(timezone=True))
+    # Full-text search vector maintained by PostgreSQL; deferred so normal loads skip it
+    search_vec = deferred(Column(TSVECTOR, Computed(
+        "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))",
+        persisted=True,
+    )))
 
     # Relationships
     incident = relationship('Incident', backref='case_notes')
@@ -43,16 +49,13 @@ class CaseNote(BaseModel):
     def to_dict(self):
         """Convert to dictionary."""
         return {
-            'id': str(self.id),
-            'incident_id': str(self.incident_id),
+            'id': self.id,
+            'incident_id': self.incident_id,
             'title': self.title,
             'content': self.content,
             'category': self.category,
             'is_pinned': self.is_pinned,
-            'author': {
-                'id': str(self.author.id),
-                'name': self.author.name,
-            } if self.author else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'author': self.author.summary_dict if self.author else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
         }
@@ -1,8 +1,8 @@
 """Compromised assets models"""
 from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, BigInteger, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID, INET, JSONB
-from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from sqlalchemy.orm import relationship, deferred, column_property
+from app.models.base import BaseModel, memoize_per_request
 
 
 class CompromisedHost(BaseModel):
@@ -20,21 +20,21 @@ class CompromisedHost(BaseModel):
     last_seen = Column(DateTime(timezone=True))
     containment_status = Column(String(50), default='active')
     notes = Column(Text)
-    extra_data = Column(JSONB, default=dict)
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime(timezone=True))
 
     # Relationships
     incident = relationship('Incident', back_populates='compromised_hosts')
     creator = relationship('User')
-    graph_nodes = relationship('AttackGraphNode', back_populates='compromised_host', lazy='dynamic')
-    timeline_events = relationship('TimelineEvent', back_populates='host', lazy='dynamic',
+    graph_nodes = relationship('AttackGraphNode', back_populates='compromised_host', lazy='raise_on_sql')
+    timeline_events = relationship('TimelineEvent', back_populates='host', lazy='raise_on_sql',
                                    foreign_keys='TimelineEvent.host_id')
-    compromised_accounts = relationship('CompromisedAccount', back_populates='host', lazy='dynamic')
-    network_indicators = relationship('NetworkIndicator', back_populates='host', lazy='dynamic',
+    compromised_accounts = relationship('CompromisedAccount', back_populates='host', lazy='raise_on_sql')
+    network_indicators = relationship('NetworkIndicator', back_populates='host', lazy='raise_on_sql',
                                       foreign_keys='NetworkIndicator.host_id')
-    malware_tools = relationship('MalwareTool', back_populates='host_ref', lazy='dynamic')
-    host_indicators = relationship('HostBasedIndicator', back_populates='host_ref', lazy='dynamic')
+    malware_tools = relationship('MalwareTool', back_populates='host_ref', lazy='raise_on_sql')
+    host_indicators = relationship('HostBasedIndicator', back_populates='host_ref', lazy='raise_on_sql')
 
     CONTAINMENT_STATUSES = ['active', 'compromised', 'isolated', 'contained', 'reimaged', 'cleaned', 'decommissioned']
     SYSTEM_TYPES = ['workstation', 'server', 'domain_controller', 'database', 'web_server', 
@@ -43,11 +43,11 @@ class CompromisedHost(BaseModel):
     def __repr__(self):
         return f'<CompromisedHost {self.hostname}>'
 
+    @memoize_per_request
     def to_dict(self):
         """Convert to dictionary."""
         data = super().to_dict()
-        data['ip_address'] = str(self.ip_address) if self.ip_address else None
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
+        data['creator'] = self.creator.summary_dict if self.creator else None
         return data
 
 
@@ -62,7 +62,8 @@ class CompromisedAccount(BaseModel):
     timeline_event_id = Column(UUID(as_uuid=True), ForeignKey('timeline_events.id', ondelete='SET NULL'), nullable=True)
     datetime_seen = Column(DateTime(timezone=True), nullable=False)
     account_name = Column(String(255), nullable=False)
-    password_encrypted = Column(LargeBinary)  # Fernet encrypted
+    password_encrypted = deferred(Column(LargeBinary))  # Fernet encrypted; loaded only to reveal
+    has_password = column_property(password_encrypted.expression.isnot(None))
     host_system = Column(String(255))  # Keep for backwards compatibility
     sid = Column(String(100))
     account_type = Column(String(50), nullable=False)
@@ -70,7 +71,7 @@ class CompromisedAccount(BaseModel):
     is_privileged = Column(Boolean, default=False)
     status = Column(String(50), default='active')
     notes = Column(Text)
-    extra_data = Column(JSONB, default=dict)
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime(timezone=True))
 
@@ -79,7 +80,7 @@ class CompromisedAccount(BaseModel):
     host = relationship('CompromisedHost', back_populates='compromised_accounts')
     timeline_event = relationship('TimelineEvent')
     creator = relationship('User')
-    graph_nodes = relationship('AttackGraphNode', back_populates='compromised_account', lazy='dynamic')
+    graph_nodes = relationship('AttackGraphNode', back_populates='compromised_account', lazy='raise_on_sql')
 
     ACCOUNT_TYPES = ['domain', 'local', 'ftp', 'service', 'application', 'admin', 'other']
     STATUSES = ['active', 'disabled', 'reset', 'deleted']
@@ -90,16 +91,16 @@ class CompromisedAccount(BaseModel):
     def to_dict(self, reveal_password=False, decrypted_password=None):
         """Convert to dictionary, optionally revealing password."""
         data = super().to_dict()
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
+        data['creator'] = self.creator.summary_dict if self.creator else None
         data['host'] = self.host.to_dict() if self.host else None
-        data['timeline_event'] = {'id': str(self.timeline_event.id), 'timestamp': self.timeline_event.timestamp.isoformat()} if self.timeline_event else None
+        data['timeline_event'] = {'id': self.timeline_event.id, 'timestamp': self.timeline_event.timestamp} if self.timeline_event else None
 
         # Keep host_system for backwards compatibility
         if not data.get('host_system') and self.host:
             data['host_system'] = self.host.hostname
 
-        # Handle password field
-        if self.password_encrypted:
+        # Handle password field (the encrypted value itself is deferred and never serialised)
+        if self.has_password:
             if reveal_password and decrypted_password:
                 data['password'] = decrypted_password
             else:
@@ -109,7 +110,4 @@ class CompromisedAccount(BaseModel):
             data['password'] = None
             data['has_password'] = False
 
-        # Remove encrypted binary from response
-        data.pop('password_encrypted', None)
-
         return data
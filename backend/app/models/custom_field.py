@@ -2,7 +2,7 @@
 from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, uuid7
 
 
 class CustomFieldOption(BaseModel):
@@ -81,18 +81,17 @@ class CustomFieldOption(BaseModel):
 
     def to_dict(self):
         return {
-            'id': str(self.id),
+            'id': self.id,
             'field_name': self.field_name,
             'field_value': self.field_value,
             'display_label': self.display_label or self.field_value,
             'is_default': self.is_default,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': self.created_at,
         }
 
     @classmethod
     def seed_defaults(cls, organization_id, session):
         """Seed default options for an organization."""
-        from uuid import uuid4
         for field_name, options in cls.DEFAULTS.items():
             for value, label in options:
                 existing = session.query(cls).filter_by(
@@ -102,7 +101,7 @@ class CustomFieldOption(BaseModel):
                 ).first()
                 if not existing:
                     opt = cls(
-                        id=uuid4(),
+                        id=uuid7(),
                         organization_id=organization_id,
                         field_name=field_name,
                         field_value=value,
@@ -1,8 +1,20 @@
 """Incident model"""
 from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Boolean, Index, UniqueConstraint, CheckConstraint
+from sqlalchemy import select, func, literal, union_all, table, column, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
+from app import db
+
+
+# Materialized per-incident child counts (see migration add_incident_counts_view).
+# Refreshed every few minutes by ``flask refresh-incident-counts`` (maintenance service).
+incident_counts_view = table(
+    'mv_incident_counts',
+    column('incident_id', UUID(as_uuid=True)),
+    column('kind'),
+    column('total'),
+)
 
 
 class Incident(BaseModel):
@@ -45,19 +57,19 @@ class Incident(BaseModel):
     creator = relationship('User', foreign_keys=[created_by])
     archiver = relationship('User', foreign_keys=[archived_by])
     owning_team = relationship('Team', foreign_keys=[team_id])
-    assignments = relationship('IncidentAssignment', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    timeline_events = relationship('TimelineEvent', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    compromised_hosts = relationship('CompromisedHost', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    compromised_accounts = relationship('CompromisedAccount', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    network_indicators = relationship('NetworkIndicator', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    host_indicators = relationship('HostBasedIndicator', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    malware_tools = relationship('MalwareTool', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    artifacts = relationship('Artifact', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    tasks = relationship('Task', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    attack_graph_nodes = relationship('AttackGraphNode', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    attack_graph_edges = relationship('AttackGraphEdge', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    reports = relationship('Report', back_populates='incident', lazy='dynamic', cascade='all, delete-orphan')
-    incident_teams = relationship('IncidentTeam', back_populates='incident', cascade='all, delete-orphan', lazy='joined')
+    assignments = relationship('IncidentAssignment', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    timeline_events = relationship('TimelineEvent', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    compromised_hosts = relationship('CompromisedHost', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    compromised_accounts = relationship('CompromisedAccount', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    network_indicators = relationship('NetworkIndicator', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    host_indicators = relationship('HostBasedIndicator', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    malware_tools = relationship('MalwareTool', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    artifacts = relationship('Artifact', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    tasks = relationship('Task', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    attack_graph_nodes = relationship('AttackGraphNode', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    attack_graph_edges = relationship('AttackGraphEdge', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    reports = relationship('Report', back_populates='incident', lazy='raise_on_sql', cascade='all, delete-orphan')
+    incident_teams = relationship('IncidentTeam', back_populates='incident', cascade='all, delete-orphan')
 
     # IR lifecycle phases
     PHASES = {
@@ -69,9 +81,56 @@ class Incident(BaseModel):
         6: 'Lessons Learned'
     }
 
+    # Child collections summarised by to_dict(include_counts=True)
+    COUNTED_RELATIONSHIPS = (
+        'timeline_events', 'compromised_hosts', 'compromised_accounts', 'network_indicators',
+        'host_indicators', 'malware_tools', 'artifacts', 'tasks',
+    )
+
     def __repr__(self):
         return f'<Incident #{self.incident_number}: {self.title}>'
 
+    @classmethod
+    def load_counts(cls, incidents, live=False):
+        """Attach child-record counts to many incidents using a single query.
+
+        By default the counts come from the ``mv_incident_counts`` materialized
+        view (index lookups, possibly a few minutes stale); ``live=True``
+        aggregates the child tables directly.
+        """
+        incidents = list(incidents)
+        if not incidents:
+            return incidents
+
+        ids = [i.id for i in incidents]
+        if live:
+            parts = []
+            for name in cls.COUNTED_RELATIONSHIPS:
+                child = cls.__mapper__.relationships[name].mapper.class_
+                parts.append(
+                    select(literal(name).label('kind'), child.incident_id, func.count().label('total'))
+                    .where(child.incident_id.in_(ids))
+                    .group_by(child.incident_id)
+                )
+            query = union_all(*parts)
+        else:
+            query = select(
+                incident_counts_view.c.kind, incident_counts_view.c.incident_id, incident_counts_view.c.total
+            ).where(incident_counts_view.c.incident_id.in_(ids))
+
+        counts = {i.id: dict.fromkeys(cls.COUNTED_RELATIONSHIPS, 0) for i in incidents}
+        for kind, incident_id, total in db.session.execute(query):
+            counts[incident_id][kind] = total
+        for incident in incidents:
+            incident._counts = counts[incident.id]
+        return incidents
+
+    @staticmethod
+    def refresh_counts():
+        """Recompute ``mv_incident_counts`` without blocking readers."""
+        db.session.execute(text('REFRESH MATERIALIZED VIEW CONCURRENTLY mv_incident_counts'))
+        db.session.commit()
+
     @property
     def phase_name(self):
         """Get the human-readable phase name."""
@@ -82,26 +141,19 @@ class Incident(BaseModel):
         data = super().to_dict()
         data['phase_name'] = self.phase_name
         data['tlp'] = self.tlp
-        data['team_id'] = str(self.team_id) if self.team_id else None
-        data['owning_team'] = {'id': str(self.owning_team.id), 'name': self.owning_team.name} if self.owning_team else None
+        data['owning_team'] = {'id': self.owning_team.id, 'name': self.owning_team.name} if self.owning_team else None
         data['lead_responder'] = self.lead_responder.to_summary() if self.lead_responder else None
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
+        data['creator'] = self.creator.summary_dict if self.creator else None
         data['teams'] = [
-            {'id': str(it.team_id), 'name': it.team.name if it.team else None}
+            {'id': it.team_id, 'name': it.team.name if it.team else None}
             for it in (self.incident_teams or [])
         ]
 
         if include_counts:
-            data['counts'] = {
-                'timeline_events': self.timeline_events.count(),
-                'compromised_hosts': self.compromised_hosts.count(),
-                'compromised_accounts': self.compromised_accounts.count(),
-                'network_indicators': self.network_indicators.count(),
-                'host_indicators': self.host_indicators.count(),
-                'malware_tools': self.malware_tools.count(),
-                'artifacts': self.artifacts.count(),
-                'tasks': self.tasks.count(),
-            }
+            # List endpoints preload counts in bulk; single fetches load live counts
+            if getattr(self, '_counts', None) is None:
+                Incident.load_counts([self], live=True)
+            data['counts'] = dict(self._counts)
 
         return data
 
@@ -125,13 +177,13 @@ class IncidentAssignment(BaseModel):
     def to_dict(self):
         """Convert to dictionary."""
         return {
-            'id': str(self.id),
-            'incident_id': str(self.incident_id),
+            'id': self.id,
+            'incident_id': self.incident_id,
             'user': self.user.to_summary() if self.user else None,
             'role': self.role,
-            'assigned_by': str(self.assigned_by) if self.assigned_by else None,
-            'assigned_at': self.assigned_at.isoformat() if self.assigned_at else None,
-            'removed_at': self.removed_at.isoformat() if self.removed_at else None,
+            'assigned_by': self.assigned_by,
+            'assigned_at': self.assigned_at,
+            'removed_at': self.removed_at,
         }
 
 
@@ -152,9 +204,9 @@ class IncidentTeam(BaseModel):
     def to_dict(self):
         """Convert to dictionary."""
         return {
-            'id': str(self.id),
-            'incident_id': str(self.incident_id),
-            'team_id': str(self.team_id),
+            'id': self.id,
+            'incident_id': self.incident_id,
+            'team_id': self.team_id,
             'team': self.team.to_dict() if self.team else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': self.created_at,
         }
@@ -1,7 +1,7 @@
 """Integration model"""
 from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred, column_property
 from app.models.base import BaseModel
 
 
@@ -13,8 +13,10 @@ class Integration(BaseModel):
     type = Column(String(50), nullable=False)
     name = Column(String(255), nullable=False)
     is_enabled = Column(Boolean, default=True)
-    config = Column(JSONB, default=dict)
-    credentials_encrypted = Column(LargeBinary)
+    config = Column(JSONB, nullable=False, server_default='{}')
+    # Only fetched on paths that decrypt it (undefer); listings use has_credentials
+    credentials_encrypted = deferred(Column(LargeBinary))
+    has_credentials = column_property(credentials_encrypted.expression.isnot(None))
     last_used_at = Column(DateTime(timezone=True))
     last_error = Column(Text)
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
@@ -50,16 +52,12 @@ class Integration(BaseModel):
         return f'<Integration {self.type}: {self.name}>'
 
     def to_dict(self, include_credentials=False):
-        """Convert to dictionary."""
-        data = super().to_dict()
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
-
-        # Never include encrypted credentials in default response
-        data.pop('credentials_encrypted', None)
-
-        if include_credentials:
-            data['has_credentials'] = self.credentials_encrypted is not None
-        else:
-            data['has_credentials'] = self.credentials_encrypted is not None
+        """Convert to dictionary.
 
+        Encrypted credentials are never included (the column is deferred and
+        skipped by ``BaseModel.to_dict``); only ``has_credentials`` is.
+        """
+        data = super().to_dict()
+        data['creator'] = self.creator.summary_dict if self.creator else None
+        data['has_credentials'] = self.has_credentials
         return data
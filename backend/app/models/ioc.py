@@ -1,13 +1,19 @@
 """Indicator of Compromise (IOC) models"""
-from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey, BigInteger
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey, BigInteger, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, memoize_per_request
 
 
 class NetworkIndicator(BaseModel):
     """Network-based indicator of compromise."""
     __tablename__ = 'network_indicators'
+    __table_args__ = (
+        Index('ix_network_indicators_incident_timestamp', 'incident_id', 'timestamp'),
+        Index('ix_network_indicators_host', 'host_id'),
+        Index('ix_network_indicators_malicious', 'incident_id', postgresql_where=text('is_malicious')),
+        Index('ix_network_indicators_extra_data_gin', 'extra_data', postgresql_using='gin', postgresql_ops={'extra_data': 'jsonb_path_ops'}),
+    )
 
     incident_id = Column(UUID(as_uuid=True), ForeignKey('incidents.id', ondelete='CASCADE'), nullable=False)
     # Host correlation
@@ -17,16 +23,16 @@ class NetworkIndicator(BaseModel):
     timestamp = Column(DateTime(timezone=True))
     protocol = Column(String(20))
     port = Column(Integer)
-    dns_ip = Column(String(255), nullable=False)
-    source_host = Column(String(255))  # Keep for backwards compatibility (free-text)
-    destination_host = Column(String(255))  # Keep for backwards compatibility (free-text)
+    dns_ip = Column(Text, nullable=False)
+    source_host = Column(Text)  # Keep for backwards compatibility (free-text)
+    destination_host = Column(Text)  # Keep for backwards compatibility (free-text)
     source_host_id = Column(UUID(as_uuid=True), ForeignKey('compromised_hosts.id', ondelete='SET NULL'), nullable=True)
     destination_host_id = Column(UUID(as_uuid=True), ForeignKey('compromised_hosts.id', ondelete='SET NULL'), nullable=True)
     direction = Column(String(20))
     description = Column(Text)
-    is_malicious = Column(Boolean, default=True)
-    threat_intel_source = Column(String(255))
-    extra_data = Column(JSONB, default=dict)
+    is_malicious = Column(Boolean, server_default='true')
+    threat_intel_source = Column(Text)
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime(timezone=True))
 
@@ -44,13 +50,12 @@ class NetworkIndicator(BaseModel):
     def __repr__(self):
         return f'<NetworkIndicator {self.dns_ip}>'
 
+    @memoize_per_request
     def to_dict(self):
         """Convert to dictionary."""
         data = super().to_dict()
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
+        data['creator'] = self.creator.summary_dict if self.creator else None
         data['host'] = self.host.to_dict() if self.host else None
-        data['source_host_id'] = str(self.source_host_id) if self.source_host_id else None
-        data['destination_host_id'] = str(self.destination_host_id) if self.destination_host_id else None
         data['source_host_ref'] = self.source_host_ref.to_dict() if self.source_host_ref else None
         data['destination_host_ref'] = self.destination_host_ref.to_dict() if self.destination_host_ref else None
         # Keep source_host for backwards compatibility
@@ -64,20 +69,28 @@ class NetworkIndicator(BaseModel):
 class HostBasedIndicator(BaseModel):
     """Host-based indicator of compromise."""
     __tablename__ = 'host_based_indicators'
+    __table_args__ = (
+        Index('ix_hbi_incident_artifact', 'incident_id', 'artifact_type'),
+        Index('ix_hbi_host', 'host_id'),
+        Index('ix_hbi_unremediated', 'incident_id', postgresql_where=text('NOT remediated')),
+        Index('ix_hbi_extra_data_gin', 'extra_data', postgresql_using='gin', postgresql_ops={'extra_data': 'jsonb_path_ops'}),
+    )
 
     incident_id = Column(UUID(as_uuid=True), ForeignKey('incidents.id', ondelete='CASCADE'), nullable=False)
     # Host correlation
     host_id = Column(UUID(as_uuid=True), ForeignKey('compromised_hosts.id', ondelete='SET NULL'), nullable=True)
     # Timeline event source (when marking event as IOC)
     timeline_event_id = Column(UUID(as_uuid=True), ForeignKey('timeline_events.id', ondelete='SET NULL'), nullable=True)
-    artifact_type = Column(String(50), nullable=False)
+    ARTIFACT_TYPES = ['wmi_event', 'asep', 'registry', 'scheduled_task', 'service', 'file', 'process', 'other']
+
+    artifact_type = Column(ENUM(*ARTIFACT_TYPES, name='hbi_artifact_type'), nullable=False)
     datetime = Column(DateTime(timezone=True))
     artifact_value = Column(Text, nullable=False)
-    host = Column(String(255))  # Keep for backwards compatibility
+    host = Column(Text)  # Keep for backwards compatibility
     notes = Column(Text)
-    is_malicious = Column(Boolean, default=True)
-    remediated = Column(Boolean, default=False)
-    extra_data = Column(JSONB, default=dict)
+    is_malicious = Column(Boolean, server_default='true')
+    remediated = Column(Boolean, server_default='false')
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime(timezone=True))
 
@@ -87,15 +100,14 @@ class HostBasedIndicator(BaseModel):
     source_event = relationship('TimelineEvent', back_populates='host_indicators')
     creator = relationship('User')
 
-    ARTIFACT_TYPES = ['wmi_event', 'asep', 'registry', 'scheduled_task', 'service', 'file', 'process', 'other']
-
     def __repr__(self):
         return f'<HostBasedIndicator {self.artifact_type}: {self.artifact_value[:50]}>'
 
+    @memoize_per_request
     def to_dict(self):
         """Convert to dictionary."""
         data = super().to_dict()
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
+        data['creator'] = self.creator.summary_dict if self.creator else None
         data['host_ref'] = self.host_ref.to_dict() if self.host_ref else None
         data['source_event'] = self.source_event.to_dict() if self.source_event else None
         # Keep host for backwards compatibility
@@ -107,11 +119,20 @@ class HostBasedIndicator(BaseModel):
 class MalwareTool(BaseModel):
     """Malware and tools discovered during incident."""
     __tablename__ = 'malware_tools'
+    __table_args__ = (
+        Index('ix_malware_incident_created', 'incident_id', 'created_at'),
+        Index('ix_malware_host', 'host_id'),
+        # Hashes are only ever matched by equality: hash indexes are smaller than B-trees
+        Index('ix_malware_md5_hash', 'md5', postgresql_using='hash'),
+        Index('ix_malware_sha256_hash', 'sha256', postgresql_using='hash'),
+        Index('ix_malware_sha512_hash', 'sha512', postgresql_using='hash'),
+        Index('ix_malware_extra_data_gin', 'extra_data', postgresql_using='gin', postgresql_ops={'extra_data': 'jsonb_path_ops'}),
+    )
 
     incident_id = Column(UUID(as_uuid=True), ForeignKey('incidents.id', ondelete='CASCADE'), nullable=False)
     # Host correlation
     host_id = Column(UUID(as_uuid=True), ForeignKey('compromised_hosts.id', ondelete='SET NULL'), nullable=True)
-    file_name = Column(String(255), nullable=False)
+    file_name = Column(Text, nullable=False)
     file_path = Column(Text)
     md5 = Column(String(32))
     sha256 = Column(String(64))
@@ -120,13 +141,13 @@ class MalwareTool(BaseModel):
     creation_time = Column(DateTime(timezone=True))
     modification_time = Column(DateTime(timezone=True))
     access_time = Column(DateTime(timezone=True))
-    host = Column(String(255))  # Keep for backwards compatibility
+    host = Column(Text)  # Keep for backwards compatibility
     description = Column(Text)
-    malware_family = Column(String(255))
-    threat_actor = Column(String(255))
-    is_tool = Column(Boolean, default=False)
+    malware_family = Column(Text)
+    threat_actor = Column(Text)
+    is_tool = Column(Boolean, server_default='false')
     sandbox_report_url = Column(Text)
-    extra_data = Column(JSONB, default=dict)
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime(timezone=True))
 
@@ -138,10 +159,11 @@ class MalwareTool(BaseModel):
     def __repr__(self):
         return f'<MalwareTool {self.file_name}>'
 
+    @memoize_per_request
     def to_dict(self):
         """Convert to dictionary."""
         data = super().to_dict()
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
+        data['creator'] = self.creator.summary_dict if self.creator else None
         data['host_ref'] = self.host_ref.to_dict() if self.host_ref else None
         # Keep host for backwards compatibility
         if not data.get('host') and self.host_ref:
@@ -1,6 +1,6 @@
 """Notification model"""
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, Text, Boolean, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -8,25 +8,32 @@ from app.models.base import BaseModel
 class Notification(BaseModel):
     """Notification model."""
     __tablename__ = 'notifications'
+    __table_args__ = (
+        # Unread feed and badge count: only unread rows, newest first
+        Index('ix_notifications_user_unread', 'user_id', 'created_at', postgresql_where=text('NOT is_read')),
+        Index('ix_notifications_user_created', 'user_id', 'created_at'),
+        Index('ix_notifications_incident', 'incident_id'),
+        Index('ix_notifications_extra_data_gin', 'extra_data', postgresql_using='gin', postgresql_ops={'extra_data': 'jsonb_path_ops'}),
+    )
 
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     incident_id = Column(UUID(as_uuid=True), ForeignKey('incidents.id', ondelete='CASCADE'))
-    type = Column(String(50), nullable=False)
-    title = Column(String(255), nullable=False)
+    NOTIFICATION_TYPES = [
+        'incident_assigned', 'incident_updated', 'task_assigned', 'task_due',
+        'comment_added', 'artifact_uploaded', 'mention', 'system'
+    ]
+
+    type = Column(ENUM(*NOTIFICATION_TYPES, name='notification_type'), nullable=False)
+    title = Column(Text, nullable=False)
     message = Column(Text)
-    is_read = Column(Boolean, default=False)
+    is_read = Column(Boolean, server_default='false')
     action_url = Column(Text)
-    extra_data = Column(JSONB, default=dict)
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
 
     # Relationships
     user = relationship('User')
     incident = relationship('Incident')
 
-    NOTIFICATION_TYPES = [
-        'incident_assigned', 'incident_updated', 'task_assigned', 'task_due',
-        'comment_added', 'artifact_uploaded', 'mention', 'system'
-    ]
-
     def __repr__(self):
         return f'<Notification {self.type}: {self.title}>'
 
@@ -35,7 +42,7 @@ class Notification(BaseModel):
         data = super().to_dict()
         if self.incident:
             data['incident'] = {
-                'id': str(self.incident.id),
+                'id': self.incident.id,
                 'title': self.incident.title,
                 'incident_number': self.incident.incident_number
             }
@@ -1,5 +1,5 @@
 """Organization model"""
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, Text, DateTime, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
@@ -8,17 +8,21 @@ from app.models.base import BaseModel
 class Organization(BaseModel):
     """Organization model for multi-tenant support."""
     __tablename__ = 'organizations'
+    __table_args__ = (
+        Index('ix_organizations_settings_gin', 'settings', postgresql_using='gin', postgresql_ops={'settings': 'jsonb_path_ops'}),
+    )
 
-    name = Column(String(255), nullable=False)
+    name = Column(Text, nullable=False)
     slug = Column(String(100), unique=True, nullable=False)
-    settings = Column(JSONB, default=dict)
+    settings = Column(JSONB, nullable=False, server_default='{}')
     updated_at = Column(DateTime(timezone=True))
 
-    # Relationships
-    users = relationship('User', back_populates='organization', lazy='dynamic')
-    incidents = relationship('Incident', back_populates='organization', lazy='dynamic')
-    integrations = relationship('Integration', back_populates='organization', lazy='dynamic')
-    teams = relationship('Team', back_populates='organization', lazy='dynamic')
+    # Relationships. These collections are unbounded: query the child model
+    # filtered by organization_id (paginated) instead of loading them.
+    users = relationship('User', back_populates='organization', lazy='raise')
+    incidents = relationship('Incident', back_populates='organization', lazy='raise')
+    integrations = relationship('Integration', back_populates='organization', lazy='raise')
+    teams = relationship('Team', back_populates='organization', lazy='raise')
 
     def __repr__(self):
         return f'<Organization {self.name}>'
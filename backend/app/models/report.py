@@ -1,22 +1,26 @@
 """Report model"""
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.models.base import BaseModel
 
 
 class Report(BaseModel):
     """Generated report model."""
     __tablename__ = 'reports'
+    __table_args__ = (
+        Index('ix_reports_sections_gin', 'sections', postgresql_using='gin', postgresql_ops={'sections': 'jsonb_path_ops'}),
+    )
 
     incident_id = Column(UUID(as_uuid=True), ForeignKey('incidents.id', ondelete='CASCADE'), nullable=False)
-    title = Column(String(500), nullable=False)
+    title = Column(Text, nullable=False)
     report_type = Column(String(50), default='full')
     format = Column(String(20), default='pdf')
-    storage_path = Column(Text)
-    ai_summary = Column(Text)
+    # Report bodies are only read when a report is rendered; listings skip them
+    storage_path = deferred(Column(Text))
+    ai_summary = deferred(Column(Text))
     ai_provider = Column(String(50))
-    sections = Column(JSONB, default=list)
+    sections = deferred(Column(JSONB, server_default='[]'))
     generated_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     is_archived = Column(Boolean, default=False, server_default='false')
 
@@ -33,9 +37,9 @@ class Report(BaseModel):
     def to_dict(self):
         """Convert to dictionary."""
         data = super().to_dict()
-        data['generator'] = {'id': str(self.generator.id), 'name': self.generator.name} if self.generator else None
+        data['generator'] = self.generator.summary_dict if self.generator else None
         data['incident'] = {
-            'id': str(self.incident.id),
+            'id': self.incident.id,
             'title': self.incident.title,
             'incident_number': self.incident.incident_number
         } if self.incident else None
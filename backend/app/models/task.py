@@ -1,27 +1,43 @@
 """Task model"""
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from sqlalchemy import Column, Text, Integer, DateTime, ForeignKey, Index, Computed, select
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
+from sqlalchemy.orm import relationship, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.base import BaseModel, memoize_per_request
+from app import db
 
 
 class Task(BaseModel):
     """Task model for incident response tracking."""
     __tablename__ = 'tasks'
+    __table_args__ = (
+        Index('ix_tasks_extra_data_gin', 'extra_data', postgresql_using='gin', postgresql_ops={'extra_data': 'jsonb_path_ops'}),
+        Index('ix_tasks_checklist_gin', 'checklist', postgresql_using='gin', postgresql_ops={'checklist': 'jsonb_path_ops'}),
+        Index('ix_tasks_incident_checklist_completed', 'incident_id', 'checklist_completed'),
+    )
 
     incident_id = Column(UUID(as_uuid=True), ForeignKey('incidents.id', ondelete='CASCADE'), nullable=False)
-    title = Column(String(500), nullable=False)
+    title = Column(Text, nullable=False)
     description = Column(Text)
-    status = Column(String(50), default='pending')
-    priority = Column(String(20), default='medium')
+    STATUSES = ['pending', 'in_progress', 'completed', 'blocked', 'cancelled']
+    PRIORITIES = ['low', 'medium', 'high', 'critical']
+    # Comments embedded by to_dict(include_comments=True), newest first
+    COMMENTS_LIMIT = 20
+
+    # Native enums: 4 bytes per row and values validated by PostgreSQL
+    status = Column(ENUM(*STATUSES, name='task_status'), nullable=False, default='pending', server_default='pending')
+    priority = Column(ENUM(*PRIORITIES, name='task_priority'), nullable=False, default='medium', server_default='medium')
     assignee_id = Column(UUID(as_uuid=True), ForeignKey('users.id'))
     due_date = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
-    checklist = Column(JSONB, default=list)
+    checklist = Column(JSONB, server_default='[]')
+    # Maintained by PostgreSQL from checklist (see the jsonb_checklist_* SQL functions)
+    checklist_total = Column(Integer, Computed('jsonb_checklist_total(checklist)', persisted=True))
+    checklist_completed = Column(Integer, Computed('jsonb_checklist_completed(checklist)', persisted=True))
     phase = Column(Integer)
     parent_task_id = Column(UUID(as_uuid=True), ForeignKey('tasks.id'))
-    order_index = Column(Integer, default=0)
-    extra_data = Column(JSONB, default=dict)
+    order_index = Column(Integer, server_default='0')
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime(timezone=True))
 
@@ -30,30 +46,79 @@ class Task(BaseModel):
     assignee = relationship('User', foreign_keys=[assignee_id])
     creator = relationship('User', foreign_keys=[created_by])
     comments = relationship('TaskComment', back_populates='task', lazy='dynamic', cascade='all, delete-orphan')
-    subtasks = relationship('Task', backref='parent_task', remote_side='Task.id')
-
-    STATUSES = ['pending', 'in_progress', 'completed', 'blocked', 'cancelled']
-    PRIORITIES = ['low', 'medium', 'high', 'critical']
+    # Read-only, newest-first view of comments that list queries can selectinload
+    recent_comments = relationship('TaskComment', order_by='TaskComment.created_at.desc()', viewonly=True)
+    parent_task = relationship('Task', back_populates='subtasks', remote_side='Task.id')
+    subtasks = relationship('Task', back_populates='parent_task', order_by='Task.order_index')
 
     def __repr__(self):
         return f'<Task {self.title}>'
 
-    def to_dict(self, include_comments=False):
+    @classmethod
+    def fetch_tree(cls, root_id, incident_id):
+        """Load a task and all of its descendants with one recursive query.
+
+        Every ``subtasks`` collection in the returned tree is populated, so
+        walking it issues no further SQL. Returns None if the root task does
+        not exist in the incident.
+        """
+        tree = select(cls.id).where(cls.id == root_id, cls.incident_id == incident_id) \
+            .cte('task_tree', recursive=True)
+        tree = tree.union_all(
+            select(cls.id).where(cls.parent_task_id == tree.c.id, cls.incident_id == incident_id)
+        )
+        tasks = db.session.scalars(
+            select(cls).options(cls.creator_loader(), selectinload(cls.assignee))
+            .where(cls.id.in_(select(tree.c.id)))
+            .order_by(cls.order_index)
+        ).all()
+
+        children = {task.id: [] for task in tasks}
+        root = None
+        for task in tasks:
+            if task.id == root_id:
+                root = task
+            elif task.parent_task_id in children:
+                children[task.parent_task_id].append(task)
+        for task in tasks:
+            set_committed_value(task, 'subtasks', children[task.id])
+        return root
+
+    def _recent_comments(self):
+        """Newest ``COMMENTS_LIMIT`` comments with their authors.
+
+        Uses ``recent_comments`` when a list query preloaded it; otherwise
+        runs one LIMIT query that batch-loads the authors.
+        """
+        if 'recent_comments' in self.__dict__:
+            return self.recent_comments[:self.COMMENTS_LIMIT]
+        return db.session.scalars(
+            select(TaskComment).options(selectinload(TaskComment.author))
+            .where(TaskComment.task_id == self.id)
+            .order_by(TaskComment.created_at.desc())
+            .limit(self.COMMENTS_LIMIT)
+        ).all()
+
+    def to_dict(self, include_comments=False, include_subtasks=False):
         """Convert to dictionary."""
         data = super().to_dict()
         data['assignee'] = self.assignee.to_summary() if self.assignee else None
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
+        data['creator'] = self.creator.summary_dict if self.creator else None
 
         if include_comments:
-            data['comments'] = [c.to_dict() for c in self.comments.order_by(TaskComment.created_at.desc()).limit(20)]
+            data['comments'] = [c.to_dict() for c in self._recent_comments()]
+
+        if include_subtasks:
+            data['subtasks'] = [s.to_dict(include_subtasks=True) for s in self.subtasks]
 
-        # Calculate checklist progress
-        if self.checklist:
-            completed = sum(1 for item in self.checklist if item.get('completed', False))
+        # Checklist progress (counts are generated columns)
+        total = self.checklist_total
+        if total:
+            completed = self.checklist_completed or 0
             data['checklist_progress'] = {
                 'completed': completed,
-                'total': len(self.checklist),
-                'percentage': round((completed / len(self.checklist)) * 100) if self.checklist else 0
+                'total': total,
+                'percentage': round((completed / total) * 100)
             }
 
         return data
@@ -75,8 +140,9 @@ class TaskComment(BaseModel):
     def __repr__(self):
         return f'<TaskComment by {self.author_id}>'
 
+    @memoize_per_request
     def to_dict(self):
         """Convert to dictionary."""
         data = super().to_dict()
-        data['author'] = {'id': str(self.author.id), 'name': self.author.name} if self.author else None
+        data['author'] = self.author.summary_dict if self.author else None
         return data
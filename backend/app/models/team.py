@@ -1,9 +1,10 @@
 """Team models"""
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, UniqueConstraint, select, func, event
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from sqlalchemy.orm import relationship, column_property
+from app.models.base import BaseModel, memoize_per_request
+from app.models.user import invalidate_user_cache
 
 
 class Team(BaseModel):
@@ -14,29 +15,34 @@ class Team(BaseModel):
     )
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey('organizations.id', ondelete='CASCADE'), nullable=False)
-    name = Column(String(255), nullable=False)
+    name = Column(Text, nullable=False)
     description = Column(Text)
     is_default = Column(Boolean, default=False, server_default='false')
     updated_at = Column(DateTime(timezone=True))
 
     # Relationships
     organization = relationship('Organization', back_populates='teams')
-    members = relationship('TeamMember', back_populates='team', cascade='all, delete-orphan', lazy='joined')
+    members = relationship('TeamMember', back_populates='team', cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<Team {self.name}>'
 
+    @memoize_per_request
     def to_dict(self, include_members=False):
-        """Convert to dictionary."""
+        """Convert to dictionary.
+
+        UUIDs and datetimes are left as-is; the orjson response provider
+        serialises them natively.
+        """
         data = {
-            'id': str(self.id),
-            'organization_id': str(self.organization_id),
+            'id': self.id,
+            'organization_id': self.organization_id,
             'name': self.name,
             'description': self.description,
             'is_default': self.is_default,
-            'member_count': len(self.members) if self.members else 0,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'member_count': self.member_count or 0,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
         }
         if include_members:
             data['members'] = [m.to_dict() for m in self.members]
@@ -55,15 +61,32 @@ class TeamMember(BaseModel):
     joined_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     # Relationships
-    team = relationship('Team', back_populates='members')
+    # Joined with User.team_memberships so User.teams needs no extra query
+    team = relationship('Team', back_populates='members', lazy='joined')
     user = relationship('User', back_populates='team_memberships')
 
     def to_dict(self):
         """Convert to dictionary."""
         return {
-            'id': str(self.id),
-            'team_id': str(self.team_id),
-            'user_id': str(self.user_id),
+            'id': self.id,
+            'team_id': self.team_id,
+            'user_id': self.user_id,
             'user': self.user.to_dict() if self.user else None,
-            'joined_at': self.joined_at.isoformat() if self.joined_at else None,
+            'joined_at': self.joined_at,
         }
+
+
+# Counted in SQL alongside each team row so listings never load the members
+Team.member_count = column_property(
+    select(func.count(TeamMember.id))
+    .where(TeamMember.team_id == Team.id)
+    .correlate_except(TeamMember)
+    .scalar_subquery()
+)
+
+
+@event.listens_for(TeamMember, 'after_insert')
+@event.listens_for(TeamMember, 'after_update')
+@event.listens_for(TeamMember, 'after_delete')
+def _reset_user_teams(mapper, connection, target):
+    invalidate_user_cache(target, 'teams')
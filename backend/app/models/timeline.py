@@ -1,13 +1,21 @@
 """Timeline event model"""
-from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, memoize_per_request
 
 
 class TimelineEvent(BaseModel):
     """Timeline event model for incident chronology."""
     __tablename__ = 'timeline_events'
+    __table_args__ = (
+        # Incident timeline in chronological order (either direction) without a sort
+        Index('ix_timeline_events_incident_timestamp', 'incident_id', 'timestamp'),
+        # Serves the mitre_tactic filter (mitre_mappings @> '[{"tactic": ...}]')
+        Index('ix_timeline_events_mitre_mappings_gin', 'mitre_mappings', postgresql_using='gin', postgresql_ops={'mitre_mappings': 'jsonb_path_ops'}),
+        # Containment lookups on event metadata (extra_data @> '{...}')
+        Index('ix_timeline_events_extra_data_gin', 'extra_data', postgresql_using='gin', postgresql_ops={'extra_data': 'jsonb_path_ops'}),
+    )
 
     incident_id = Column(UUID(as_uuid=True), ForeignKey('incidents.id', ondelete='CASCADE'), nullable=False)
     timestamp = Column(DateTime(timezone=True), nullable=False)
@@ -22,10 +30,10 @@ class TimelineEvent(BaseModel):
     mitre_tactic = Column(String(100))
     mitre_technique = Column(String(20))
     phase = Column(Integer)
-    is_key_event = Column(Boolean, default=False)
-    is_ioc = Column(Boolean, default=False)  # Flag if marked as IOC
+    is_key_event = Column(Boolean, server_default='false')
+    is_ioc = Column(Boolean, server_default='false')  # Flag if marked as IOC
     kill_chain_phase = Column(String(50))  # Lockheed Martin kill chain phase
-    extra_data = Column(JSONB, default=dict)
+    extra_data = Column(JSONB, nullable=False, server_default='{}')
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime(timezone=True))
 
@@ -33,7 +41,7 @@ class TimelineEvent(BaseModel):
     incident = relationship('Incident', back_populates='timeline_events')
     host = relationship('CompromisedHost', back_populates='timeline_events', foreign_keys=[host_id])
     creator = relationship('User')
-    host_indicators = relationship('HostBasedIndicator', back_populates='source_event', lazy='dynamic')
+    host_indicators = relationship('HostBasedIndicator', back_populates='source_event', lazy='raise_on_sql')
 
     # MITRE ATT&CK tactics
     MITRE_TACTICS = [
@@ -52,6 +60,7 @@ class TimelineEvent(BaseModel):
         'exfiltration',
         'impact'
     ]
+    MITRE_TACTIC_SET = frozenset(MITRE_TACTICS)
 
     # Lockheed Martin Cyber Kill Chain phases
     KILL_CHAIN_PHASES = [
@@ -330,13 +339,23 @@ class TimelineEvent(BaseModel):
         ],
     }
 
+    # tactic -> {technique id: name}, for O(1) membership and name lookups
+    MITRE_TECHNIQUES = {tactic: dict(techniques) for tactic, techniques in MITRE_TECHNIQUES.items()}
+
+    # Reverse index: technique id -> name, used to name legacy single-field mappings
+    # (ids shared by several tactics have one name)
+    TECHNIQUE_BY_ID = {
+        tid: name for techniques in MITRE_TECHNIQUES.values() for tid, name in techniques.items()
+    }
+
     def __repr__(self):
         return f'<TimelineEvent {self.timestamp}: {self.activity[:50]}>'
 
+    @memoize_per_request
     def to_dict(self):
         """Convert to dictionary."""
         data = super().to_dict()
-        data['creator'] = {'id': str(self.creator.id), 'name': self.creator.name} if self.creator else None
+        data['creator'] = self.creator.summary_dict if self.creator else None
         data['host'] = self.host.to_dict() if self.host else None
         # Keep hostname for backwards compatibility
         if not data.get('hostname') and self.host:
@@ -1,10 +1,10 @@
 """User and authentication models"""
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, LargeBinary, Text
-from sqlalchemy.dialects.postgresql import UUID, INET
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import JSONB
-from app.models.base import BaseModel
+from functools import cached_property
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index, LargeBinary, Text, event, text
+from sqlalchemy.dialects.postgresql import UUID, INET, ARRAY
+from sqlalchemy.orm import relationship, object_session
+from app.models.base import BaseModel, memoize_per_request
 from app import db
 import bcrypt
 
@@ -12,10 +12,14 @@ import bcrypt
 class Role(BaseModel):
     """Role model for RBAC."""
     __tablename__ = 'roles'
+    __table_args__ = (
+        # "Which roles grant X" lookups (permissions @> ARRAY['x'])
+        Index('ix_roles_permissions_gin', 'permissions', postgresql_using='gin'),
+    )
 
     name = Column(String(100), unique=True, nullable=False)
     description = Column(String(500))
-    permissions = Column(JSONB, default=list)
+    permissions = Column(ARRAY(Text), nullable=False, server_default='{}')
     is_system = Column(Boolean, default=False)
 
     # Relationships
@@ -24,9 +28,19 @@ class Role(BaseModel):
     def __repr__(self):
         return f'<Role {self.name}>'
 
+    @cached_property
+    def permission_set(self):
+        """Permissions as a frozenset, built once per instance."""
+        return frozenset(self.permissions or ())
+
     def has_permission(self, permission):
         """Check if role has a specific permission."""
-        return permission in self.permissions
+        return permission in self.permission_set
+
+
+@event.listens_for(Role.permissions, 'set')
+def _reset_role_permission_set(target, value, oldvalue, initiator):
+    target.__dict__.pop('permission_set', None)
 
 
 class User(BaseModel):
@@ -61,9 +75,13 @@ class User(BaseModel):
     def __repr__(self):
         return f'<User {self.email}>'
 
-    def set_password(self, password):
-        """Hash and set the user's password."""
-        salt = bcrypt.gensalt(rounds=12)
+    def set_password(self, password, rounds=12):
+        """Hash and set the user's password.
+
+        ``rounds`` is the bcrypt cost factor; only development seeding
+        should go below the default.
+        """
+        salt = bcrypt.gensalt(rounds=rounds)
         self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
         self.password_changed_at = datetime.now(timezone.utc)
 
@@ -73,24 +91,29 @@ class User(BaseModel):
             return False
         return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
 
-    @property
+    # roles, role_names, permissions and teams are derived from joined-loaded
+    # collections and cached per instance; see invalidate_user_cache.
+
+    @cached_property
     def roles(self):
         """Get list of role objects."""
         return [ur.role for ur in self.user_roles]
 
-    @property
+    @cached_property
     def role_names(self):
         """Get list of role names."""
-        return [ur.role.name for ur in self.user_roles]
+        return [role.name for role in self.roles]
 
-    @property
+    @cached_property
     def permissions(self):
-        """Get combined permissions from all roles."""
-        perms = set()
-        for user_role in self.user_roles:
-            if user_role.role and user_role.role.permissions:
-                perms.update(user_role.role.permissions)
-        return list(perms)
+        """Combined permissions from all roles.
+
+        Computed once per instance (and so once per request).
+        """
+        return frozenset().union(*(
+            user_role.role.permission_set
+            for user_role in self.user_roles if user_role.role
+        ))
 
     def has_permission(self, permission):
         """Check if user has a specific permission."""
@@ -98,39 +121,47 @@ class User(BaseModel):
 
     def has_any_permission(self, permissions):
         """Check if user has any of the specified permissions."""
-        user_perms = set(self.permissions)
-        return bool(user_perms.intersection(permissions))
+        return not self.permissions.isdisjoint(permissions)
 
     def has_all_permissions(self, permissions):
         """Check if user has all specified permissions."""
-        user_perms = set(self.permissions)
-        return all(p in user_perms for p in permissions)
+        return self.permissions.issuperset(permissions)
 
     def has_role(self, role_name):
         """Check if user has a specific role."""
         return role_name in self.role_names
 
-    @property
+    @cached_property
     def teams(self):
         """Get list of team summaries."""
         return [
-            {'id': str(tm.team.id), 'name': tm.team.name}
+            {'id': tm.team.id, 'name': tm.team.name}
             for tm in self.team_memberships if tm.team
         ]
 
+    @cached_property
+    def summary_dict(self):
+        """``{'id', 'name'}`` reference embedded as creator/author of other resources.
+
+        Built once per instance, so a user shared by many rows of a payload
+        is only converted once. Needs only ``id`` and ``name`` loaded.
+        """
+        return {'id': self.id, 'name': self.name}
+
     def to_summary(self):
         """Lightweight representation for embedding in other resources."""
         return {
-            'id': str(self.id),
+            'id': self.id,
             'name': self.name,
             'avatar_url': self.avatar_url,
             'roles': self.role_names,
         }
 
+    @memoize_per_request
     def to_dict(self, include_permissions=False):
         """Convert to dictionary, excluding sensitive fields."""
         data = {
-            'id': str(self.id),
+            'id': self.id,
             'email': self.email,
             'name': self.name,
             'avatar_url': self.avatar_url,
@@ -138,15 +169,15 @@ class User(BaseModel):
             'is_active': self.is_active,
             'is_verified': self.is_verified,
             'mfa_enabled': self.mfa_enabled,
-            'last_login': self.last_login.isoformat() if self.last_login else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'last_login': self.last_login,
+            'created_at': self.created_at,
             'roles': self.role_names,
             'organizational_role': self.organizational_role,
             'teams': self.teams,
-            'organization_id': str(self.organization_id) if self.organization_id else None,
+            'organization_id': self.organization_id,
         }
         if include_permissions:
-            data['permissions'] = self.permissions
+            data['permissions'] = sorted(self.permissions)
         return data
 
 
@@ -165,7 +196,30 @@ class UserRole(BaseModel):
 
     # Relationships
     user = relationship('User', back_populates='user_roles', foreign_keys=[user_id])
-    role = relationship('Role', back_populates='user_roles')
+    # Joined with User.user_roles so role checks and to_dict need no extra query
+    role = relationship('Role', back_populates='user_roles', lazy='joined')
+
+
+def invalidate_user_cache(target, *names):
+    """Drop cached ``User`` properties after a change to one of its child rows.
+
+    ``target`` is the changed row (it must have ``user_id``); only a user
+    already loaded in the same session can hold stale values.
+    """
+    session = object_session(target)
+    if session is None:
+        return
+    user = session.identity_map.get(User.__mapper__.identity_key_from_primary_key((target.user_id,)))
+    if user is not None:
+        for name in names:
+            user.__dict__.pop(name, None)
+
+
+@event.listens_for(UserRole, 'after_insert')
+@event.listens_for(UserRole, 'after_update')
+@event.listens_for(UserRole, 'after_delete')
+def _reset_user_roles(mapper, connection, target):
+    invalidate_user_cache(target, 'roles', 'role_names', 'permissions')
 
 
 class PasswordHistory(BaseModel):
@@ -182,6 +236,11 @@ class PasswordHistory(BaseModel):
 class Session(BaseModel):
     """Session model for token management."""
     __tablename__ = 'sessions'
+    __table_args__ = (
+        # Live-session lookups only; revoked history stays out of the index
+        Index('ix_sessions_live', 'user_id', 'expires_at', postgresql_where=text('revoked_at IS NULL')),
+        Index('ix_sessions_token_live', 'token_hash', postgresql_where=text('revoked_at IS NULL')),
+    )
 
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     token_hash = Column(String(255), nullable=False)
@@ -197,6 +256,11 @@ class Session(BaseModel):
     @property
     def is_valid(self):
         """Check if session is still valid."""
-        if self.revoked_at:
-            return False
-        return datetime.now(timezone.utc) < self.expires_at
+        return self.is_valid_at(datetime.now(timezone.utc))
+
+    def is_valid_at(self, now):
+        """Check validity against a caller-supplied ``now``.
+
+        Lets a sweep over many sessions read the clock once.
+        """
+        return not self.revoked_at and now < self.expires_at
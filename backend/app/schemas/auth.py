@@ -1,54 +1,90 @@
-from pydantic import BaseModel, EmailStr, Field, validator
-import re
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional
 
+# Character classes a password must contain, as bits of a byte mask
+_UPPER, _LOWER, _DIGIT, _SPECIAL = 1, 2, 4, 8
+_ALL_CLASSES = _UPPER | _LOWER | _DIGIT | _SPECIAL
+
+# Byte -> class bit lookup table; non-ASCII bytes classify as 0
+_CLASS_TABLE = bytes(
+    _UPPER if 65 <= b <= 90 else
+    _LOWER if 97 <= b <= 122 else
+    _DIGIT if 48 <= b <= 57 else
+    _SPECIAL if chr(b) in '!@#$%^&*(),.?":{}|<>' else 0
+    for b in range(256)
+)
+
+# Checked in this order, so the first missing class is the one reported
+_PASSWORD_RULES = (
+    (_UPPER, 'Password must contain an uppercase letter'),
+    (_LOWER, 'Password must contain a lowercase letter'),
+    (_DIGIT, 'Password must contain a number'),
+    (_SPECIAL, 'Password must contain a special character'),
+)
+
+
+def _validate_password_strength(v):
+    # One C-level pass maps every byte to its class bit; OR the distinct bits
+    mask = 0
+    for bits in set(v.encode().translate(_CLASS_TABLE)):
+        mask |= bits
+    if mask == _ALL_CLASSES:
+        return v
+    if not mask & _DIGIT and any(c.isdecimal() for c in v):
+        mask |= _DIGIT  # non-ASCII decimal digits, as matched by \d
+    for bit, message in _PASSWORD_RULES:
+        if not mask & bit:
+            raise ValueError(message)
+    return v
+
+
+# Auth payloads are immutable once parsed. Whitespace is deliberately not
+# stripped here: passwords must be taken verbatim.
+_FROZEN = ConfigDict(frozen=True)
+
 
 class UserRegister(BaseModel):
-    email: str
+    model_config = _FROZEN
+
+    email: EmailStr
     password: str = Field(..., min_length=12)
     name: str = Field(..., min_length=1)
 
-    @validator('email')
-    def validate_email(cls, v):
-        # Allow .local domains for development
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', v) and not v.endswith('.local'):
-             raise ValueError('Invalid email address')
-        return v
+    @field_validator('email', mode='wrap')
+    @classmethod
+    def validate_email(cls, v, handler):
+        # Allow .local domains for development; email-validator rejects
+        # them as a special-use domain
+        if isinstance(v, str) and v.endswith('.local'):
+            return v
+        return handler(v)
 
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
-        if not re.search(r'[A-Z]', v):
-            raise ValueError('Password must contain an uppercase letter')
-        if not re.search(r'[a-z]', v):
-            raise ValueError('Password must contain a lowercase letter')
-        if not re.search(r'\d', v):
-            raise ValueError('Password must contain a number')
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', v):
-            raise ValueError('Password must contain a special character')
-        return v
+        return _validate_password_strength(v)
 
 class UserLogin(BaseModel):
+    model_config = _FROZEN
+
     email: str
     password: str
 
 class TokenResponse(BaseModel):
+    model_config = _FROZEN
+
     access_token: str
     refresh_token: str
     user: dict
     
 class ChangePassword(BaseModel):
+    model_config = _FROZEN
+
     current_password: str
     new_password: str = Field(..., min_length=12)
 
-    @validator('new_password')
+    @field_validator('new_password')
+    @classmethod
     def validate_new_password(cls, v):
         # Same password validation rules
-        if not re.search(r'[A-Z]', v):
-            raise ValueError('Password must contain an uppercase letter')
-        if not re.search(r'[a-z]', v):
-            raise ValueError('Password must contain a lowercase letter')
-        if not re.search(r'\d', v):
-            raise ValueError('Password must contain a number')
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', v):
-            raise ValueError('Password must contain a special character')
-        return v
+        return _validate_password_strength(v)
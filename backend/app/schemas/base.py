@@ -1,5 +1,14 @@
 from pydantic import BaseModel, ConfigDict
 
 class BaseSchema(BaseModel):
-    """Base schema with common configuration."""
-    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+    """Base schema with common configuration.
+
+    Request payloads are parsed once and never modified, so instances are
+    frozen; surrounding whitespace is stripped from every string field.
+    """
+    model_config = ConfigDict(
+        from_attributes=True,
+        populate_by_name=True,
+        frozen=True,
+        str_strip_whitespace=True,
+    )
@@ -2,6 +2,7 @@
 import os
 from app import db, create_app
 from app.models import Organization, User, Role, UserRole
+from app.models.base import uuid7
 
 
 
@@ -28,16 +29,6 @@ def _run_seed():
         print("Database already seeded, skipping...")
         return
 
-    # Create default organization
-    print("Creating default organization...")
-    org = Organization(
-        name='Default Organization',
-        slug='default',
-        settings={}
-    )
-    db.session.add(org)
-    db.session.flush()
-
     # Get admin role
     admin_role = Role.query.filter_by(name='Administrator').first()
     if not admin_role:
@@ -51,7 +42,16 @@ def _run_seed():
         print("Updating Administrator permissions...")
         updated_perms = list(current_perms.union(set(required_perms)))
         admin_role.permissions = updated_perms
-        db.session.commit()
+
+    # Ids are assigned up front so the rows can reference each other without
+    # intermediate flushes; everything is written in one flush and commit.
+    print("Creating default organization...")
+    org = Organization(
+        id=uuid7(),
+        name='Default Organization',
+        slug='default',
+        settings={}
+    )
 
     # Create admin user
     admin_email = os.getenv('ADMIN_EMAIL', 'admin@sheetstorm.local')
@@ -59,6 +59,7 @@ def _run_seed():
 
     print(f"Creating admin user: {admin_email}")
     admin = User(
+        id=uuid7(),
         email=admin_email,
         name='Administrator',
         organization_id=org.id,
@@ -66,9 +67,8 @@ def _run_seed():
         is_active=True,
         is_verified=True
     )
-    admin.set_password(admin_password)
-    db.session.add(admin)
-    db.session.flush()
+    # Cost 12 unless SEED_BCRYPT_ROUNDS explicitly asks for cheaper hashes (tests, throwaway dev DBs)
+    admin.set_password(admin_password, rounds=int(os.getenv('SEED_BCRYPT_ROUNDS', '12')))
 
     # Assign admin role
     user_role = UserRole(
@@ -76,8 +76,8 @@ def _run_seed():
         role_id=admin_role.id,
         organization_id=org.id
     )
-    db.session.add(user_role)
 
+    db.session.add_all([org, admin, user_role])
     db.session.commit()
     print("Database seeding completed!")
     print(f"Admin user created: {admin_email}")
@@ -1,8 +1,42 @@
 """AI service for generating incident reports and summaries using LLM providers."""
-import json
-from typing import Optional, Dict, Any, List
+import asyncio
+import hashlib
+import re
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+import httpx
+import orjson
 from flask import current_app
-from app.services.encryption_service import EncryptionService
+from sqlalchemy import event
+from sqlalchemy.orm import undefer
+from app.models import Integration
+from app.services.encryption_service import encryption_service
+
+
+
+class _RowTemplate:
+    """One prompt line per data row, from a ``{field}``-style template.
+
+    The named template is compiled once into a positional one plus an
+    ``itemgetter`` over its fields, so rendering a row is a single dict
+    merge, one tuple fetch and ``str.format``. Fields missing from a row
+    render as N/A unless ``defaults`` says otherwise.
+    """
+
+    _FIELD = re.compile(r'\{(\w+)\}')
+
+    def __init__(self, template: str, defaults: Dict[str, Any] = None):
+        fields = self._FIELD.findall(template)
+        self._template = self._FIELD.sub('{}', template)
+        self._getter = itemgetter(*fields)
+        self._defaults = dict.fromkeys(fields, 'N/A')
+        self._defaults.update((k, v) for k, v in (defaults or {}).items() if k in self._defaults)
+
+    def render(self, row: Dict[str, Any], **overrides) -> str:
+        return self._template.format(*self._getter({**self._defaults, **row, **overrides}))
 
 
 class AIService:
@@ -13,6 +47,46 @@ class AIService:
     converted to HTML→PDF downstream.
     """
 
+    OPENAI_MODEL = "gpt-4-turbo-preview"
+    GOOGLE_MODEL = "gemini-pro"
+
+    # Generated reports are cached in Redis by exact prompt for this long
+    REPORT_CACHE_TTL = 3600
+    # Reports shorter than this (bytes) are cached uncompressed, behind a NUL marker
+    REPORT_CACHE_MIN_COMPRESS = 1024
+    # Appended to a streamed report when the provider fails part-way through
+    STREAM_ERROR_MARKDOWN = "\n\n---\n\n**Error:** report generation was interrupted. Please try again.\n"
+
+    # Resolved API keys are reused for this many seconds
+    KEY_CACHE_TTL = 60
+    # Integration type -> Flask config fallback, for providers keyed by API key
+    KEY_SOURCES = {'openai': 'OPENAI_API_KEY', 'google_ai': 'GOOGLE_AI_API_KEY'}
+
+    # Connection pool shared by every OpenAI client this service builds. Idle
+    # connections are kept for two minutes (httpx default: 5s) so reports a
+    # few minutes apart skip the TCP+TLS handshake.
+    OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=120)
+
+    # Provider name for reports raced across OpenAI and Google (AI_HEDGE_PROVIDERS)
+    HEDGED_PROVIDER = "openai+google"
+
+    # Prompt size budgets in characters (~4 per token). Rows are packed until
+    # their section's share is used instead of a fixed row count; the total
+    # (~20k tokens) leaves room for the system prompt and output within the
+    # smallest supported context (gemini-pro, 30k input tokens).
+    TIMELINE_CHAR_BUDGET = 40_000
+    ASSETS_CHAR_BUDGET = 16_000
+    IOCS_CHAR_BUDGET = 24_000
+
+    # (timeline, assets, iocs) budgets for report types that need a different
+    # mix: the executive summary works from an outline of the incident, the
+    # IOC report trades timeline detail for indicators. Row counts past the
+    # budget are still stated, so totals in the reports stay correct.
+    REPORT_CHAR_BUDGETS: Dict[str, Tuple[int, int, int]] = {
+        'executive': (12_000, 6_000, 6_000),
+        'ioc': (12_000, 20_000, 48_000),
+    }
+
     # ── System Prompts ──────────────────────────────────────────────────
     SYSTEM_PROMPT_BASE = (
         "You are an expert cybersecurity incident response analyst working for a "
@@ -290,6 +364,12 @@ For each malware/tool:
 **IMPORTANT**: Think strategically. This report is for security leadership and threat intelligence teams. Connect the dots between individual IOCs and the bigger picture.""",
     }
 
+    # Base prompt + report instructions, built once per process. (Written with
+    # map() because a comprehension body cannot see class-level names.)
+    _FULL_SYSTEM_PROMPTS: Dict[str, str] = dict(zip(
+        REPORT_PROMPTS, map(f"{SYSTEM_PROMPT_BASE}\n\n".__add__, REPORT_PROMPTS.values())
+    ))
+
     # ── Legacy summary prompts (kept for backward compatibility) ──────
     EXECUTIVE_SUMMARY_PROMPT = """You are an expert incident response analyst. Generate a concise executive summary for the following security incident. The summary should:
 1. Describe what happened in non-technical terms
@@ -346,62 +426,87 @@ Timeline Events:
 
 Provide prioritized recommendations with specific technical steps."""
 
+    # summary_type -> legacy prompt template (unknown types use the executive one)
+    _LEGACY_PROMPTS: Dict[str, str] = {
+        'executive': EXECUTIVE_SUMMARY_PROMPT,
+        'technical': TECHNICAL_SUMMARY_PROMPT,
+        'recommendations': RECOMMENDATIONS_PROMPT,
+    }
+
     def __init__(self):
         """Initialize AI service with lazy-loaded provider clients."""
         self._openai_client = None
+        self._openai_async_client = None
+        self._openai_http: Optional[httpx.Client] = None
         self._google_client = None
         self._resolved_openai_key = None
         self._resolved_google_key = None
         self._ollama_base_url: Optional[str] = None
+        # integration type -> (monotonic expiry, resolved key or None)
+        self._key_cache: Dict[str, Tuple[float, Optional[str]]] = {}
 
-    def _get_key_from_integration(self, integration_type: str) -> Optional[str]:
-        """Resolve an API key from the integrations table (DB-first).
+    def _get_keys_for_types(self, integration_types: List[str]) -> Dict[str, str]:
+        """Resolve API keys for several integration types from the DB in one query.
 
-        Queries enabled integrations of the given type, decrypts the stored
-        credentials, and returns the 'api_key' field.  Returns None when no
-        matching integration exists or decryption fails.
+        Loads the enabled integrations of all the given types, decrypts
+        their credentials and returns type -> 'api_key'. Types with no
+        integration, or whose credentials fail to decrypt, are left out.
         """
+        keys: Dict[str, str] = {}
         try:
-            from app.models.integration import Integration
-            integration = (
+            integrations = (
                 Integration.query
-                .filter_by(type=integration_type, is_enabled=True)
-                .first()
+                .options(undefer(Integration.credentials_encrypted))
+                .filter(Integration.type.in_(integration_types), Integration.is_enabled.is_(True))
+                .all()
             )
-            if integration and integration.credentials_encrypted:
-                encryption_service = EncryptionService()
+            for integration in integrations:
+                if integration.type in keys or not integration.credentials_encrypted:
+                    continue
                 decrypted = encryption_service.decrypt(integration.credentials_encrypted)
                 if decrypted:
-                    creds = json.loads(decrypted)
-                    return creds.get('api_key')
+                    api_key = orjson.loads(decrypted).get('api_key')
+                    if api_key:
+                        keys[integration.type] = api_key
         except Exception as e:
-            current_app.logger.debug(f"Could not load {integration_type} key from DB: {e}")
-        return None
+            current_app.logger.debug(f"Could not load AI keys from DB: {e}")
+        return keys
 
-    def _resolve_api_key(self, integration_type: str, env_config_key: str) -> Optional[str]:
-        """Return an API key checking the DB integrations table first, then env."""
-        # 1. Try DB integration
-        db_key = self._get_key_from_integration(integration_type)
-        if db_key:
-            return db_key
-        # 2. Fall back to env / Flask config
-        env_key = current_app.config.get(env_config_key)
-        return env_key if env_key else None
+    def _resolve_api_key(self, integration_type: str) -> Optional[str]:
+        """Return an API key checking the DB integrations table first, then env.
+
+        A miss resolves every ``KEY_SOURCES`` type with one query and caches
+        them all for ``KEY_CACHE_TTL`` seconds, so the provider checks of
+        one report cost a single round-trip.
+        """
+        cached = self._key_cache.get(integration_type)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        # 1. Try DB integration, 2. fall back to env / Flask config
+        db_keys = self._get_keys_for_types(list(self.KEY_SOURCES))
+        expires = time.monotonic() + self.KEY_CACHE_TTL
+        for itype, config_key in self.KEY_SOURCES.items():
+            key = db_keys.get(itype) or current_app.config.get(config_key) or None
+            self._key_cache[itype] = (expires, key)
+        return self._key_cache[integration_type][1]
+
+    def invalidate_key_cache(self) -> None:
+        """Forget resolved API keys (called when an integration changes)."""
+        self._key_cache.clear()
 
     @property
     def openai_api_key(self) -> Optional[str]:
         """Resolve OpenAI API key (DB integration first, then env)."""
-        return self._resolve_api_key('openai', 'OPENAI_API_KEY')
+        return self._resolve_api_key('openai')
 
     @property
     def google_api_key(self) -> Optional[str]:
         """Resolve Google AI API key (DB integration first, then env)."""
-        return self._resolve_api_key('google_ai', 'GOOGLE_AI_API_KEY')
+        return self._resolve_api_key('google_ai')
 
     def _resolve_ollama_url(self) -> Optional[str]:
         """Resolve Ollama base URL from DB integration or env."""
         try:
-            from app.models.integration import Integration
             integration = (
                 Integration.query
                 .filter_by(type='ollama', is_enabled=True)
@@ -430,13 +535,26 @@ Provide prioritized recommendations with specific technical steps."""
             # Recreate client if key changed
             if self._resolved_openai_key != api_key:
                 import openai
-                self._openai_client = openai.OpenAI(api_key=api_key)
+                if self._openai_http is None:
+                    self._openai_http = httpx.Client(
+                        timeout=openai.DEFAULT_TIMEOUT,
+                        follow_redirects=True,
+                        limits=self.OPENAI_HTTP_LIMITS,
+                    )
+                self._openai_client = openai.OpenAI(api_key=api_key, http_client=self._openai_http)
+                self._openai_async_client = openai.AsyncOpenAI(api_key=api_key)
                 self._resolved_openai_key = api_key
         else:
             self._openai_client = None
+            self._openai_async_client = None
             self._resolved_openai_key = None
         return self._openai_client
 
+    @property
+    def openai_async_client(self):
+        """Get or create the asyncio OpenAI client (same key as ``openai_client``)."""
+        return self._openai_async_client if self.openai_client else None
+
     @property
     def google_client(self):
         """Get or create Google Generative AI client."""
@@ -445,7 +563,7 @@ Provide prioritized recommendations with specific technical steps."""
             if self._resolved_google_key != api_key:
                 import google.generativeai as genai
                 genai.configure(api_key=api_key)
-                self._google_client = genai.GenerativeModel('gemini-pro')
+                self._google_client = genai.GenerativeModel(self.GOOGLE_MODEL)
                 self._resolved_google_key = api_key
         else:
             self._google_client = None
@@ -473,6 +591,22 @@ Provide prioritized recommendations with specific technical steps."""
             providers.append('ollama')
         return providers
 
+    def resolve_report_provider(self, provider: str = None) -> Optional[str]:
+        """Provider ``generate_report`` will use when given ``provider``.
+
+        An explicit choice is kept. Otherwise, with ``AI_HEDGE_PROVIDERS`` set
+        and both OpenAI and Google configured, reports are raced across the
+        two; else the first available provider is used.
+        """
+        if provider:
+            return provider
+        providers = self.get_available_providers()
+        if not providers:
+            return None
+        if current_app.config.get('AI_HEDGE_PROVIDERS') and {'openai', 'google'} <= set(providers):
+            return self.HEDGED_PROVIDER
+        return providers[0]
+
     def list_ollama_models(self) -> List[str]:
         """Fetch available model tags from a running Ollama instance."""
         import requests
@@ -506,67 +640,181 @@ Provide prioritized recommendations with specific technical steps."""
             timeline_events: List of timeline event dicts
             compromised_assets: Dict with 'hosts' and 'accounts' lists
             iocs: Dict with 'network', 'host', 'malware' lists
-            provider: 'openai' or 'google' (auto-detected if None)
+            provider: 'openai', 'google', 'ollama' or HEDGED_PROVIDER
+                (see resolve_report_provider if None)
 
         Returns:
             Markdown string or None on failure
         """
+        provider = self.resolve_report_provider(provider)
         if provider is None:
-            providers = self.get_available_providers()
-            if not providers:
-                return None
-            provider = providers[0]
+            return None
 
         # Build the user prompt with all incident data
         user_prompt = self._build_report_user_prompt(
-            incident_data, timeline_events, compromised_assets, iocs
+            incident_data, timeline_events, compromised_assets, iocs, report_type
         )
 
-        # Get the report-type-specific instructions
-        report_instructions = self.REPORT_PROMPTS.get(report_type, self.REPORT_PROMPTS['executive'])
+        # Base prompt + report-type-specific instructions
+        system_prompt = self._FULL_SYSTEM_PROMPTS.get(report_type, self._FULL_SYSTEM_PROMPTS['executive'])
 
-        # Combine system prompt + report instructions
-        system_prompt = f"{self.SYSTEM_PROMPT_BASE}\n\n{report_instructions}"
+        # Identical inputs (re-runs, retries) are served from the cache
+        cache_key = self._report_cache_key(report_type, provider, system_prompt, user_prompt)
+        cached = self._report_cache_get(cache_key)
+        if cached is not None:
+            return cached
 
-        if provider == 'openai':
-            return self._generate_report_openai(system_prompt, user_prompt)
+        markdown = None
+        if provider == self.HEDGED_PROVIDER:
+            markdown = self._race_report_providers(system_prompt, user_prompt, report_type)
+        elif provider == 'openai':
+            markdown = self._generate_report_openai(system_prompt, user_prompt, report_type)
         elif provider == 'google':
-            return self._generate_report_google(system_prompt, user_prompt)
+            markdown = self._generate_report_google(system_prompt, user_prompt)
         elif provider == 'ollama':
-            return self._generate_ollama_sync(f"{system_prompt}\n\n{user_prompt}")
+            markdown = self._generate_ollama_sync(f"{system_prompt}\n\n{user_prompt}")
 
-        return None
+        if markdown:
+            self._report_cache_set(cache_key, markdown)
+        return markdown
+
+    def generate_report_stream(
+        self,
+        report_type: str,
+        incident_data: Dict[str, Any],
+        timeline_events: list,
+        compromised_assets: Dict[str, list],
+        iocs: Dict[str, list],
+        provider: str = None
+    ) -> Iterator[str]:
+        """Generate a report like ``generate_report``, yielding Markdown as it arrives.
+
+        OpenAI and Gemini responses are streamed chunk by chunk; Ollama,
+        hedged requests and cache hits are yielded as a single chunk. The
+        complete text is cached once the stream finishes, so a later PDF
+        render reuses it. Nothing is yielded if the provider fails before
+        its first chunk; a failure mid-stream ends with
+        ``STREAM_ERROR_MARKDOWN``.
+        """
+        provider = self.resolve_report_provider(provider)
+        if provider is None:
+            return
+
+        user_prompt = self._build_report_user_prompt(
+            incident_data, timeline_events, compromised_assets, iocs, report_type
+        )
+        system_prompt = self._FULL_SYSTEM_PROMPTS.get(report_type, self._FULL_SYSTEM_PROMPTS['executive'])
+
+        cache_key = self._report_cache_key(report_type, provider, system_prompt, user_prompt)
+        cached = self._report_cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        if provider == self.HEDGED_PROVIDER:
+            # Racing needs complete responses; the winner is sent in one piece
+            chunks = filter(None, [self._race_report_providers(system_prompt, user_prompt, report_type)])
+        elif provider == 'openai':
+            chunks = self._stream_report_openai(system_prompt, user_prompt, report_type)
+        elif provider == 'google':
+            chunks = self._stream_report_google(system_prompt, user_prompt)
+        elif provider == 'ollama':
+            chunks = filter(None, [self._generate_ollama_sync(f"{system_prompt}\n\n{user_prompt}")])
+        else:
+            return
+
+        parts = []
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+        except Exception as e:
+            current_app.logger.error(f"AI report streaming error ({provider}): {e}")
+            if parts:
+                yield self.STREAM_ERROR_MARKDOWN
+            return
+        if parts:
+            self._report_cache_set(cache_key, ''.join(parts))
+
+    def _report_cache_key(self, report_type: str, provider: str, system_prompt: str, user_prompt: str) -> str:
+        """Redis key for a report generated from exactly these inputs."""
+        model = {'openai': self.OPENAI_MODEL, 'google': self.GOOGLE_MODEL}.get(provider, provider)
+        digest = hashlib.blake2b(
+            f"{report_type}|{provider}|{model}|{system_prompt}|{user_prompt}".encode('utf-8'),
+            digest_size=16,
+        ).hexdigest()
+        return f'ai_report:{digest}'
+
+    def _report_cache_get(self, key: str) -> Optional[str]:
+        """Return a cached report, or None on a miss or when Redis is unavailable."""
+        from app import redis_client
+        if not redis_client:
+            return None
+        try:
+            blob = redis_client.get(key)
+            if not blob:
+                return None
+            raw = blob[1:] if blob[:1] == b'\x00' else zlib.decompress(blob)
+            return raw.decode('utf-8')
+        except Exception as e:
+            current_app.logger.debug(f"AI report cache read failed: {e}")
+            return None
+
+    def _report_cache_set(self, key: str, markdown: str) -> None:
+        """Store a generated report (zlib-compressed; Markdown compresses well)."""
+        from app import redis_client
+        if not redis_client:
+            return
+        raw = markdown.encode('utf-8')
+        blob = zlib.compress(raw) if len(raw) >= self.REPORT_CACHE_MIN_COMPRESS else b'\x00' + raw
+        try:
+            redis_client.setex(key, self.REPORT_CACHE_TTL, blob)
+        except Exception as e:
+            current_app.logger.debug(f"AI report cache write failed: {e}")
 
     def _build_report_user_prompt(
         self,
         incident_data: Dict[str, Any],
         timeline_events: list,
         compromised_assets: Dict[str, list],
-        iocs: Dict[str, list]
+        iocs: Dict[str, list],
+        report_type: str = None
     ) -> str:
-        """Build the user prompt containing all incident data."""
+        """Build the user prompt containing all incident data.
+
+        Section sizes follow ``REPORT_CHAR_BUDGETS`` for ``report_type``.
+        """
+        timeline_budget, assets_budget, iocs_budget = self.REPORT_CHAR_BUDGETS.get(
+            report_type, (self.TIMELINE_CHAR_BUDGET, self.ASSETS_CHAR_BUDGET, self.IOCS_CHAR_BUDGET)
+        )
         sections = []
         sections.append("## Incident Information")
         sections.append(self._format_incident(incident_data))
         sections.append("\n## Timeline Events")
-        sections.append(self._format_timeline(timeline_events))
+        sections.append(self._format_timeline(timeline_events, timeline_budget))
         sections.append("\n## Compromised Assets")
-        sections.append(self._format_assets(compromised_assets))
+        sections.append(self._format_assets(compromised_assets, assets_budget))
         sections.append("\n## Indicators of Compromise")
-        sections.append(self._format_iocs(iocs))
+        sections.append(self._format_iocs(iocs, iocs_budget))
         return "\n".join(sections)
 
-    def _generate_report_openai(self, system_prompt: str, user_prompt: str) -> Optional[str]:
-        """Generate report using OpenAI."""
+    def _generate_report_openai(self, system_prompt: str, user_prompt: str, report_type: str = None) -> Optional[str]:
+        """Generate report using OpenAI.
+
+        The static system prompt leads the request so OpenAI's automatic
+        prefix caching can reuse it; ``prompt_cache_key`` routes requests
+        of the same report type to the same cache.
+        """
         try:
             response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
+                model=self.OPENAI_MODEL,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"Generate the report based on the following incident data:\n\n{user_prompt}"}
                 ],
                 max_tokens=4000,
                 temperature=0.3,
+                extra_body={"prompt_cache_key": f"report:{report_type or 'default'}"},
             )
             return response.choices[0].message.content
         except Exception as e:
@@ -583,6 +831,60 @@ Provide prioritized recommendations with specific technical steps."""
             current_app.logger.error(f"Google AI report generation error: {e}")
             return None
 
+    def _race_report_providers(self, system_prompt: str, user_prompt: str, report_type: str = None) -> Optional[str]:
+        """Request the report from OpenAI and Google at once; return the first success.
+
+        Hedges against one provider's tail latency. The slower request is
+        not waited for and its result is discarded.
+        """
+        app = current_app._get_current_object()
+        # Build both clients here, in the request's app context; the workers
+        # then reuse them and the cached keys
+        if self.openai_client is None or self.google_client is None:
+            return None
+
+        def run(generate, *args):
+            with app.app_context():
+                return generate(*args)
+
+        pool = ThreadPoolExecutor(max_workers=2)
+        futures = [
+            pool.submit(run, self._generate_report_openai, system_prompt, user_prompt, report_type),
+            pool.submit(run, self._generate_report_google, system_prompt, user_prompt),
+        ]
+        try:
+            for future in as_completed(futures):
+                markdown = future.result()
+                if markdown:
+                    return markdown
+            return None
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _stream_report_openai(self, system_prompt: str, user_prompt: str, report_type: str = None) -> Iterator[str]:
+        """Stream report text deltas from OpenAI (errors propagate to the caller)."""
+        stream = self.openai_client.chat.completions.create(
+            model=self.OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Generate the report based on the following incident data:\n\n{user_prompt}"}
+            ],
+            max_tokens=4000,
+            temperature=0.3,
+            extra_body={"prompt_cache_key": f"report:{report_type or 'default'}"},
+            stream=True,
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def _stream_report_google(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """Stream report text chunks from Google Gemini (errors propagate to the caller)."""
+        full_prompt = f"{system_prompt}\n\n---\n\n{user_prompt}\n\n---\n\nGenerate the report now."
+        for chunk in self.google_client.generate_content(full_prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
     # ── Legacy summary generation (backward compatible) ──────────────
 
     async def generate_summary(
@@ -614,22 +916,8 @@ Provide prioritized recommendations with specific technical steps."""
                 return None
             provider = providers[0]
 
-        # Select prompt template
-        if summary_type == 'executive':
-            prompt_template = self.EXECUTIVE_SUMMARY_PROMPT
-        elif summary_type == 'technical':
-            prompt_template = self.TECHNICAL_SUMMARY_PROMPT
-        elif summary_type == 'recommendations':
-            prompt_template = self.RECOMMENDATIONS_PROMPT
-        else:
-            prompt_template = self.EXECUTIVE_SUMMARY_PROMPT
-
-        # Format prompt
-        prompt = prompt_template.format(
-            incident_data=self._format_incident(incident_data),
-            timeline_events=self._format_timeline(timeline_events),
-            compromised_assets=self._format_assets(compromised_assets),
-            iocs=self._format_iocs(iocs)
+        prompt = self._prepare_legacy_prompt(
+            summary_type, incident_data, timeline_events, compromised_assets, iocs
         )
 
         # Generate with selected provider
@@ -642,6 +930,51 @@ Provide prioritized recommendations with specific technical steps."""
 
         return None
 
+    async def generate_summary_batch(
+        self,
+        summary_types: List[str],
+        incident_data: Dict[str, Any],
+        timeline_events: list,
+        compromised_assets: Dict[str, list],
+        iocs: Dict[str, list],
+        provider: str = None
+    ) -> Dict[str, Optional[str]]:
+        """Generate several summary types for one incident concurrently.
+
+        The incident data is formatted once and shared by every prompt; the
+        provider calls then run together, so the total latency is that of
+        the slowest summary rather than their sum.
+
+        Returns:
+            Dict of summary_type -> generated text (None on failure)
+        """
+        if provider is None:
+            providers = self.get_available_providers()
+            if not providers:
+                return dict.fromkeys(summary_types)
+            provider = providers[0]
+
+        sections = {
+            'incident_data': self._format_incident(incident_data),
+            'timeline_events': self._format_timeline(timeline_events),
+            'compromised_assets': self._format_assets(compromised_assets),
+            'iocs': self._format_iocs(iocs),
+        }
+        prompts = [
+            self._LEGACY_PROMPTS.get(summary_type, self.EXECUTIVE_SUMMARY_PROMPT).format(**sections)
+            for summary_type in summary_types
+        ]
+
+        if provider == 'openai':
+            results = await asyncio.gather(*(self._generate_openai(p) for p in prompts))
+        elif provider == 'google':
+            results = await asyncio.gather(*(self._generate_google(p) for p in prompts))
+        elif provider == 'ollama':
+            results = [self._generate_ollama_sync(p) for p in prompts]
+        else:
+            results = [None] * len(prompts)
+        return dict(zip(summary_types, results))
+
     def generate_summary_sync(
         self,
         incident_data: Dict[str, Any],
@@ -659,22 +992,8 @@ Provide prioritized recommendations with specific technical steps."""
                 return None
             provider = providers[0]
 
-        # Select prompt template
-        if summary_type == 'executive':
-            prompt_template = self.EXECUTIVE_SUMMARY_PROMPT
-        elif summary_type == 'technical':
-            prompt_template = self.TECHNICAL_SUMMARY_PROMPT
-        elif summary_type == 'recommendations':
-            prompt_template = self.RECOMMENDATIONS_PROMPT
-        else:
-            prompt_template = self.EXECUTIVE_SUMMARY_PROMPT
-
-        # Format prompt
-        prompt = prompt_template.format(
-            incident_data=self._format_incident(incident_data),
-            timeline_events=self._format_timeline(timeline_events),
-            compromised_assets=self._format_assets(compromised_assets),
-            iocs=self._format_iocs(iocs)
+        prompt = self._prepare_legacy_prompt(
+            summary_type, incident_data, timeline_events, compromised_assets, iocs
         )
 
         # Generate with selected provider
@@ -687,6 +1006,22 @@ Provide prioritized recommendations with specific technical steps."""
 
         return None
 
+    def _prepare_legacy_prompt(
+        self,
+        summary_type: str,
+        incident_data: Dict[str, Any],
+        timeline_events: list,
+        compromised_assets: Dict[str, list],
+        iocs: Dict[str, list]
+    ) -> str:
+        """Fill the legacy prompt template for ``summary_type`` with formatted data."""
+        return self._LEGACY_PROMPTS.get(summary_type, self.EXECUTIVE_SUMMARY_PROMPT).format(
+            incident_data=self._format_incident(incident_data),
+            timeline_events=self._format_timeline(timeline_events),
+            compromised_assets=self._format_assets(compromised_assets),
+            iocs=self._format_iocs(iocs)
+        )
+
     def _generate_ollama_sync(self, prompt: str, model: str = None) -> Optional[str]:
         """Generate text using a local Ollama instance."""
         import requests
@@ -711,8 +1046,8 @@ Provide prioritized recommendations with specific technical steps."""
     async def _generate_openai(self, prompt: str) -> Optional[str]:
         """Generate text using OpenAI."""
         try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
+            response = await self.openai_async_client.chat.completions.create(
+                model=self.OPENAI_MODEL,
                 messages=[
                     {"role": "system", "content": "You are an expert cybersecurity incident response analyst."},
                     {"role": "user", "content": prompt}
@@ -729,7 +1064,7 @@ Provide prioritized recommendations with specific technical steps."""
         """Generate text using OpenAI (sync)."""
         try:
             response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
+                model=self.OPENAI_MODEL,
                 messages=[
                     {"role": "system", "content": "You are an expert cybersecurity incident response analyst."},
                     {"role": "user", "content": prompt}
@@ -777,104 +1112,137 @@ Executive Summary: {incident.get('executive_summary', 'N/A')}
 Lessons Learned: {incident.get('lessons_learned', 'N/A')}
 """
 
-    def _format_timeline(self, events: list) -> str:
-        """Format timeline events for prompt."""
-        if not events:
-            return "No timeline events recorded."
+    # Per-row prompt templates; fields missing from a row render as N/A,
+    # the boolean flags as False.
+    _FLAG_DEFAULTS = {
+        'is_key_event': False, 'is_ioc': False, 'is_privileged': False,
+        'is_malicious': False, 'remediated': False, 'is_tool': False,
+    }
+    _TIMELINE_LINE = _RowTemplate(
+        "- [{timestamp}] {hostname}: {activity} (Source: {source}, MITRE: {mitre}, "
+        "Key Event: {is_key_event}, IOC: {is_ioc})",
+        _FLAG_DEFAULTS,
+    )
+    _HOST_LINE = _RowTemplate(
+        "- {hostname} (IP: {ip_address}): Type={system_type}, OS={os_version}, "
+        "Containment={containment_status}, First Seen={first_seen}",
+        _FLAG_DEFAULTS,
+    )
+    _ACCOUNT_LINE = _RowTemplate(
+        "- {account_name} (Type: {account_type}): Domain={domain}, Host={host_system}, "
+        "Privileged={is_privileged}, Status={status}",
+        _FLAG_DEFAULTS,
+    )
+    _NETWORK_IOC_LINE = _RowTemplate(
+        "- {dns_ip} (Protocol: {protocol}, Port: {port}, Direction: {direction}, "
+        "Malicious: {is_malicious}): {description}",
+        _FLAG_DEFAULTS,
+    )
+    _HOST_IOC_LINE = _RowTemplate(
+        "- [{artifact_type}] {artifact_value} (Host: {host}, Malicious: {is_malicious}, "
+        "Remediated: {remediated})",
+        _FLAG_DEFAULTS,
+    )
+    _MALWARE_LINE = _RowTemplate(
+        "- {file_name} (SHA256: {sha256}, Family: {malware_family}, Actor: {threat_actor}, "
+        "Is Tool: {is_tool}): {description}",
+        _FLAG_DEFAULTS,
+    )
 
-        formatted = []
-        for event in events[:100]:
+    @staticmethod
+    def _pack_lines(formatted: list, lines, total: int, budget: int, noun: str) -> None:
+        """Append ``lines`` to ``formatted`` until ``budget`` characters are used.
+
+        ``lines`` is consumed lazily, so rows past the budget are never
+        formatted. At least one row is always kept; dropped rows are noted.
+        """
+        used = shown = 0
+        for line in lines:
+            used += len(line) + 1
+            if used > budget and shown:
+                break
+            formatted.append(line)
+            shown += 1
+        if total > shown:
+            formatted.append(f"... and {total - shown} more {noun} (showing first {shown})")
+
+    def _timeline_lines(self, events: list):
+        """Yield one prompt line per timeline event."""
+        for event in events:
             # Format MITRE mappings (multi-TTP support)
             mappings = event.get('mitre_mappings', [])
             if mappings:
-                mitre_str = ', '.join(f"{m.get('tactic', 'N/A')}:{m.get('technique', 'N/A')}" for m in mappings)
+                mitre = ', '.join(f"{m.get('tactic', 'N/A')}:{m.get('technique', 'N/A')}" for m in mappings)
             else:
-                mitre_str = f"{event.get('mitre_tactic', 'N/A')}:{event.get('mitre_technique', 'N/A')}"
-            formatted.append(
-                f"- [{event.get('timestamp', 'N/A')}] {event.get('hostname', 'N/A')}: "
-                f"{event.get('activity', 'N/A')} "
-                f"(Source: {event.get('source', 'N/A')}, "
-                f"MITRE: {mitre_str}, "
-                f"Key Event: {event.get('is_key_event', False)}, "
-                f"IOC: {event.get('is_ioc', False)})"
-            )
-        total = len(events)
-        if total > 100:
-            formatted.append(f"\n... and {total - 100} more events (showing first 100)")
+                mitre = f"{event.get('mitre_tactic', 'N/A')}:{event.get('mitre_technique', 'N/A')}"
+            yield self._TIMELINE_LINE.render(event, mitre=mitre)
+
+    def _host_ioc_lines(self, iocs: list):
+        """Yield one prompt line per host-based indicator."""
+        for ioc in iocs:
+            yield self._HOST_IOC_LINE.render(ioc, artifact_value=ioc.get('artifact_value', 'N/A')[:200])
+
+    def _format_timeline(self, events: list, budget: int = None) -> str:
+        """Format timeline events for prompt."""
+        if not events:
+            return "No timeline events recorded."
+
+        formatted = []
+        self._pack_lines(formatted, self._timeline_lines(events), len(events),
+                         budget or self.TIMELINE_CHAR_BUDGET, 'events')
         return "\n".join(formatted)
 
-    def _format_assets(self, assets: Dict[str, list]) -> str:
+    def _format_assets(self, assets: Dict[str, list], budget: int = None) -> str:
         """Format compromised assets for prompt."""
         formatted = []
+        budget = (budget or self.ASSETS_CHAR_BUDGET) // 2
 
         hosts = assets.get('hosts', [])
         if hosts:
             formatted.append("Compromised Hosts:")
-            for host in hosts[:30]:
-                formatted.append(
-                    f"- {host.get('hostname', 'N/A')} (IP: {host.get('ip_address', 'N/A')}): "
-                    f"Type={host.get('system_type', 'N/A')}, "
-                    f"OS={host.get('os_version', 'N/A')}, "
-                    f"Containment={host.get('containment_status', 'N/A')}, "
-                    f"First Seen={host.get('first_seen', 'N/A')}"
-                )
+            self._pack_lines(formatted, map(self._HOST_LINE.render, hosts),
+                             len(hosts), budget, 'hosts')
 
         accounts = assets.get('accounts', [])
         if accounts:
             formatted.append("\nCompromised Accounts:")
-            for account in accounts[:30]:
-                formatted.append(
-                    f"- {account.get('account_name', 'N/A')} (Type: {account.get('account_type', 'N/A')}): "
-                    f"Domain={account.get('domain', 'N/A')}, "
-                    f"Host={account.get('host_system', 'N/A')}, "
-                    f"Privileged={account.get('is_privileged', False)}, "
-                    f"Status={account.get('status', 'N/A')}"
-                )
+            self._pack_lines(formatted, map(self._ACCOUNT_LINE.render, accounts),
+                             len(accounts), budget, 'accounts')
 
         return "\n".join(formatted) if formatted else "No compromised assets recorded."
 
-    def _format_iocs(self, iocs: Dict[str, list]) -> str:
+    def _format_iocs(self, iocs: Dict[str, list], budget: int = None) -> str:
         """Format IOCs for prompt."""
         formatted = []
+        budget = (budget or self.IOCS_CHAR_BUDGET) // 3
 
         network = iocs.get('network', [])
         if network:
             formatted.append("Network Indicators:")
-            for ioc in network[:30]:
-                formatted.append(
-                    f"- {ioc.get('dns_ip', 'N/A')} (Protocol: {ioc.get('protocol', 'N/A')}, "
-                    f"Port: {ioc.get('port', 'N/A')}, "
-                    f"Direction: {ioc.get('direction', 'N/A')}, "
-                    f"Malicious: {ioc.get('is_malicious', False)}): "
-                    f"{ioc.get('description', 'N/A')}"
-                )
+            self._pack_lines(formatted, map(self._NETWORK_IOC_LINE.render, network),
+                             len(network), budget, 'network indicators')
 
         host = iocs.get('host', [])
         if host:
             formatted.append("\nHost-Based Indicators:")
-            for ioc in host[:30]:
-                formatted.append(
-                    f"- [{ioc.get('artifact_type', 'N/A')}] {ioc.get('artifact_value', 'N/A')[:200]} "
-                    f"(Host: {ioc.get('host', 'N/A')}, "
-                    f"Malicious: {ioc.get('is_malicious', False)}, "
-                    f"Remediated: {ioc.get('remediated', False)})"
-                )
+            self._pack_lines(formatted, self._host_ioc_lines(host), len(host), budget, 'host indicators')
 
         malware = iocs.get('malware', [])
         if malware:
             formatted.append("\nMalware/Tools:")
-            for m in malware[:30]:
-                formatted.append(
-                    f"- {m.get('file_name', 'N/A')} "
-                    f"(SHA256: {m.get('sha256', 'N/A')}, "
-                    f"Family: {m.get('malware_family', 'N/A')}, "
-                    f"Actor: {m.get('threat_actor', 'N/A')}, "
-                    f"Is Tool: {m.get('is_tool', False)}): "
-                    f"{m.get('description', 'N/A')}"
-                )
+            self._pack_lines(formatted, map(self._MALWARE_LINE.render, malware),
+                             len(malware), budget, 'malware/tools')
 
         return "\n".join(formatted) if formatted else "No IOCs recorded."
 
 
 # Singleton instance
 ai_service = AIService()
+
+
+@event.listens_for(Integration, 'after_insert')
+@event.listens_for(Integration, 'after_update')
+@event.listens_for(Integration, 'after_delete')
+def _reset_ai_key_cache(mapper, connection, target):
+    """Pick up added, edited or removed AI keys without waiting for the TTL."""
+    ai_service.invalidate_key_cache()
@@ -1,59 +1,125 @@
 """Chain of custody service for evidence tracking"""
+import logging
 from datetime import datetime, timezone
 from typing import Optional
-from flask import request, g
+from flask import current_app, g, has_request_context, jsonify
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
 from app import db
 from app.models import Artifact, ChainOfCustody
-from app.middleware.audit import log_security_event
+from app.models.base import uuid7
+from app.middleware.audit import log_security_event, request_client
+
+logger = logging.getLogger(__name__)
+
+# Max rows per multi-row INSERT when flushing buffered custody entries
+CUSTODY_BATCH = 500
+
+# AUDIT_TRAIL_LEVEL -> rank. An action is recorded while the configured rank
+# does not exceed the action's own; hash mismatches are always recorded.
+_TRAIL_LEVELS = {'all': 0, 'writes_only': 1, 'mutations_only': 2, 'failures_only': 3}
+_ACTION_LEVELS = {'view': 0, 'download': 1, 'export': 1, 'upload': 2, 'transfer': 2, 'verify': 2}
+
+
+def _should_record(row: dict) -> bool:
+    """Whether ``AUDIT_TRAIL_LEVEL`` keeps this custody row."""
+    if row['verification_result'] == 'mismatch':
+        return True
+    level = _TRAIL_LEVELS.get(current_app.config.get('AUDIT_TRAIL_LEVEL', 'all'), 0)
+    return _ACTION_LEVELS.get(row['action'], 2) >= level
+
+
+def _custody_row(artifact: Artifact, action: str, performed_by: str, **fields) -> dict:
+    """Build a chain_of_custody column mapping with client-generated id/created_at.
+
+    Every row carries the same keys so buffered rows insert as one
+    multi-row statement.
+    """
+    ip_address, user_agent = request_client()
+    return {
+        'id': uuid7(),
+        'created_at': datetime.now(timezone.utc),
+        'artifact_id': artifact.id,
+        'action': action,
+        'performed_by': performed_by,
+        'ip_address': ip_address,
+        'user_agent': user_agent,
+        'purpose': None,
+        'recipient_id': None,
+        'verification_result': None,
+        'extra_data': {},
+        **fields,
+    }
+
+
+def _queue_custody_row(row: dict) -> Optional[dict]:
+    """Queue a custody row for the request's next commit (inserted now outside a request).
+
+    Returns None when ``AUDIT_TRAIL_LEVEL`` filters the row out.
+    """
+    if not _should_record(row):
+        return None
+    if has_request_context():
+        g.setdefault('custody_buffer', []).append(row)
+    else:
+        ChainOfCustody.bulk_insert([row])
+    return row
+
+
+@event.listens_for(Session, 'before_commit')
+def _insert_buffered_custody_rows(session):
+    """Insert the request's queued custody rows in the transaction being committed."""
+    if not has_request_context():
+        return
+    rows = g.pop('custody_buffer', None)
+    if not rows:
+        return
+    for start in range(0, len(rows), CUSTODY_BATCH):
+        session.execute(insert(ChainOfCustody), rows[start:start + CUSTODY_BATCH])
+
+
+def flush_custody_buffer(exc=None):
+    """Write custody rows still queued when the request raised, without its other work."""
+    rows = g.pop('custody_buffer', None)
+    if not rows:
+        return
+    db.session.rollback()
+    try:
+        ChainOfCustody.bulk_insert(rows, batch_size=CUSTODY_BATCH)
+    except Exception:
+        db.session.rollback()
+        logger.exception('Chain of custody write error')
+
+
+def init_custody_buffer(app):
+    """Commit custody rows with the request's own transaction.
+
+    Rows are inserted by whichever commit the request makes after queuing
+    them. If the handler made none (e.g. a read-only download), they are
+    committed before the response is sent, and a failure turns the
+    response into a 500 so evidence access is never reported without
+    its record.
+    """
+    @app.after_request
+    def commit_custody_rows(response):
+        if not g.get('custody_buffer'):
+            return response
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception('Chain of custody write error')
+            return jsonify({'error': 'internal_error', 'message': 'Failed to record chain of custody'}), 500
+        return response
+
+    app.teardown_request(flush_custody_buffer)
 
 
 class ChainOfCustodyService:
     """Service for managing chain of custody for artifacts."""
 
     @staticmethod
-    def log_upload(artifact: Artifact, user_id: str, source: Optional[str] = None) -> ChainOfCustody:
-        """Log artifact upload to chain of custody.
-
-        Args:
-            artifact: The uploaded artifact
-            user_id: ID of the uploading user
-            source: Source of the artifact
-
-        Returns:
-            Created ChainOfCustody record
-        """
-        entry = ChainOfCustody(
-            artifact_id=artifact.id,
-            action='upload',
-            performed_by=user_id,
-            ip_address=request.remote_addr if request else None,
-            user_agent=request.headers.get('User-Agent', '')[:500] if request else None,
-            extra_data={
-                'original_filename': artifact.original_filename,
-                'file_size': artifact.file_size,
-                'source': source,
-                'hashes': {
-                    'md5': artifact.md5,
-                    'sha256': artifact.sha256,
-                    'sha512': artifact.sha512
-                }
-            }
-        )
-        db.session.add(entry)
-        db.session.commit()
-
-        log_security_event(
-            action='artifact_upload',
-            resource_type='artifact',
-            resource_id=artifact.id,
-            incident_id=artifact.incident_id,
-            details={'filename': artifact.original_filename}
-        )
-
-        return entry
-
-    @staticmethod
-    def log_view(artifact: Artifact, user_id: str) -> ChainOfCustody:
+    def log_view(artifact: Artifact, user_id: str) -> Optional[dict]:
         """Log artifact view to chain of custody.
 
         Args:
@@ -61,18 +127,9 @@ class ChainOfCustodyService:
             user_id: ID of the viewing user
 
         Returns:
-            Created ChainOfCustody record
+            Queued chain_of_custody row, or None if AUDIT_TRAIL_LEVEL skips it
         """
-        entry = ChainOfCustody(
-            artifact_id=artifact.id,
-            action='view',
-            performed_by=user_id,
-            ip_address=request.remote_addr if request else None,
-            user_agent=request.headers.get('User-Agent', '')[:500] if request else None,
-        )
-        db.session.add(entry)
-        db.session.commit()
-        return entry
+        return _queue_custody_row(_custody_row(artifact, 'view', user_id))
 
     @staticmethod
     def log_download(
@@ -80,7 +137,7 @@ class ChainOfCustodyService:
         user_id: str,
         purpose: Optional[str] = None,
         verification_result: Optional[str] = None
-    ) -> ChainOfCustody:
+    ) -> Optional[dict]:
         """Log artifact download to chain of custody.
 
         Args:
@@ -90,23 +147,17 @@ class ChainOfCustodyService:
             verification_result: Hash verification result
 
         Returns:
-            Created ChainOfCustody record
+            Queued chain_of_custody row, or None if AUDIT_TRAIL_LEVEL skips it
         """
-        entry = ChainOfCustody(
-            artifact_id=artifact.id,
-            action='download',
-            performed_by=user_id,
-            ip_address=request.remote_addr if request else None,
-            user_agent=request.headers.get('User-Agent', '')[:500] if request else None,
+        entry = _queue_custody_row(_custody_row(
+            artifact, 'download', user_id,
             purpose=purpose,
             verification_result=verification_result,
             extra_data={
                 'filename': artifact.original_filename,
                 'file_size': artifact.file_size,
             }
-        )
-        db.session.add(entry)
-        db.session.commit()
+        ))
 
         log_security_event(
             action='artifact_download',
@@ -117,7 +168,8 @@ class ChainOfCustodyService:
                 'filename': artifact.original_filename,
                 'purpose': purpose,
                 'verification_result': verification_result
-            }
+            },
+            deferred=True
         )
 
         return entry
@@ -128,7 +180,7 @@ class ChainOfCustodyService:
         from_user_id: str,
         to_user_id: str,
         reason: Optional[str] = None
-    ) -> ChainOfCustody:
+    ) -> Optional[dict]:
         """Log artifact transfer between users.
 
         Args:
@@ -138,19 +190,13 @@ class ChainOfCustodyService:
             reason: Reason for transfer
 
         Returns:
-            Created ChainOfCustody record
+            Queued chain_of_custody row, or None if AUDIT_TRAIL_LEVEL skips it
         """
-        entry = ChainOfCustody(
-            artifact_id=artifact.id,
-            action='transfer',
-            performed_by=from_user_id,
+        entry = _queue_custody_row(_custody_row(
+            artifact, 'transfer', from_user_id,
             recipient_id=to_user_id,
-            ip_address=request.remote_addr if request else None,
-            user_agent=request.headers.get('User-Agent', '')[:500] if request else None,
             purpose=reason,
-        )
-        db.session.add(entry)
-        db.session.commit()
+        ))
 
         log_security_event(
             action='artifact_transfer',
@@ -161,7 +207,8 @@ class ChainOfCustodyService:
                 'from_user': str(from_user_id),
                 'to_user': str(to_user_id),
                 'reason': reason
-            }
+            },
+            deferred=True
         )
 
         return entry
@@ -172,9 +219,12 @@ class ChainOfCustodyService:
         user_id: str,
         result: str,
         computed_hashes: dict
-    ) -> ChainOfCustody:
+    ) -> Optional[dict]:
         """Log artifact integrity verification.
 
+        The row is committed together with the artifact's new
+        verification status.
+
         Args:
             artifact: The verified artifact
             user_id: ID of the verifying user
@@ -182,14 +232,10 @@ class ChainOfCustodyService:
             computed_hashes: Dictionary of computed hashes
 
         Returns:
-            Created ChainOfCustody record
+            Queued chain_of_custody row, or None if AUDIT_TRAIL_LEVEL skips it
         """
-        entry = ChainOfCustody(
-            artifact_id=artifact.id,
-            action='verify',
-            performed_by=user_id,
-            ip_address=request.remote_addr if request else None,
-            user_agent=request.headers.get('User-Agent', '')[:500] if request else None,
+        entry = _queue_custody_row(_custody_row(
+            artifact, 'verify', user_id,
             verification_result=result,
             extra_data={
                 'computed_hashes': computed_hashes,
@@ -199,8 +245,7 @@ class ChainOfCustodyService:
                     'sha512': artifact.sha512
                 }
             }
-        )
-        db.session.add(entry)
+        ))
 
         # Update artifact verification status
         artifact.verification_status = 'verified' if result == 'match' else 'mismatch'
@@ -262,3 +307,37 @@ class ChainOfCustodyService:
         ).order_by(ChainOfCustody.created_at.desc()).all()
 
         return [entry.to_dict() for entry in entries]
+
+
+@event.listens_for(Artifact, 'after_insert')
+def _log_artifact_upload(mapper, connection, target):
+    """Record an artifact's upload custody row in the transaction that inserts it.
+
+    Every new artifact is logged without a separate call or commit; the
+    matching security event joins the request's audit buffer.
+    """
+    row = _custody_row(
+        target, 'upload', target.uploaded_by,
+        extra_data={
+            'original_filename': target.original_filename,
+            'file_size': target.file_size,
+            'source': target.source,
+            'hashes': {
+                'md5': target.md5,
+                'sha256': target.sha256,
+                'sha512': target.sha512
+            }
+        }
+    )
+    if _should_record(row):
+        connection.execute(insert(ChainOfCustody), [row])
+
+    if has_request_context():
+        log_security_event(
+            action='artifact_upload',
+            resource_type='artifact',
+            resource_id=target.id,
+            incident_id=target.incident_id,
+            details={'filename': target.original_filename},
+            deferred=True
+        )
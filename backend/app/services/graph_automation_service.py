@@ -3,6 +3,7 @@ import math
 from app import db
 from app.models import TimelineEvent, AttackGraphNode, AttackGraphEdge, CompromisedHost, CompromisedAccount
 from app.models.attack_graph import AttackGraphNode, AttackGraphEdge
+from app.models.base import uuid7
 from app.models.ioc import NetworkIndicator, HostBasedIndicator, MalwareTool
 
 
@@ -72,7 +73,6 @@ class GraphAutomationService:
             db.session.add(host_node)
             nodes_created.append(host_node)
             node_map[str(host.id)] = host_node
-            db.session.flush()
 
             # Step 2: Create sub-nodes
             sub_nodes, sub_edges = GraphAutomationService._create_sub_nodes(
@@ -202,6 +202,7 @@ class GraphAutomationService:
         x = 300 + (index % 4) * 600
         y = 400 + (index // 4) * 500
         return AttackGraphNode(
+            id=uuid7(),
             incident_id=incident.id,
             node_type=GraphAutomationService._infer_node_type(host),
             label=host.hostname,
@@ -228,6 +229,7 @@ class GraphAutomationService:
         for acc in host_accounts.get(str(host.id), []):
             label = f"{acc.domain}\\{acc.account_name}" if acc.domain else acc.account_name
             sub_elements.append(AttackGraphNode(
+                id=uuid7(),
                 incident_id=incident.id, node_type='user', label=label,
                 compromised_account_id=acc.id,
                 extra_data={
@@ -241,6 +243,7 @@ class GraphAutomationService:
         # Malware nodes
         for mal in host_malware.get(str(host.id), []):
             sub_elements.append(AttackGraphNode(
+                id=uuid7(),
                 incident_id=incident.id, node_type='malware', label=mal.file_name,
                 extra_data={
                     'malware_family': mal.malware_family, 'sha256': mal.sha256,
@@ -253,6 +256,7 @@ class GraphAutomationService:
         # Host indicator nodes
         for ind in host_indicators.get(str(host.id), []):
             sub_elements.append(AttackGraphNode(
+                id=uuid7(),
                 incident_id=incident.id, node_type='host_indicator',
                 label=f"{ind.artifact_type}: {ind.artifact_value[:60]}",
                 extra_data={
@@ -271,7 +275,6 @@ class GraphAutomationService:
             sub.position_y = host_y + 180 * math.sin(angle)
             db.session.add(sub)
             nodes.append(sub)
-            db.session.flush()
 
             edge = AttackGraphEdge(
                 incident_id=incident.id,
@@ -289,6 +292,7 @@ class GraphAutomationService:
         """Create network IOC nodes with deduplication — one node per unique IP, edges to all hosts."""
         all_iocs = NetworkIndicator.query.filter_by(incident_id=incident.id).all()
         ip_to_node = {}
+        linked = set()  # (host_node_id, ioc_node_id) pairs already joined by an edge
         nodes = []
         edges = []
         x, y = 100, 100
@@ -304,10 +308,8 @@ class GraphAutomationService:
             if ip_or_dns in ip_to_node:
                 existing_node = ip_to_node[ip_or_dns]
                 host_node = node_map[target_hid]
-                if not AttackGraphEdge.query.filter_by(
-                    source_node_id=host_node.id, target_node_id=existing_node.id,
-                    edge_type='associated_with'
-                ).first():
+                if (host_node.id, existing_node.id) not in linked:
+                    linked.add((host_node.id, existing_node.id))
                     edge = AttackGraphEdge(
                         incident_id=incident.id,
                         source_node_id=host_node.id, target_node_id=existing_node.id,
@@ -320,6 +322,7 @@ class GraphAutomationService:
                 continue
 
             ioc_node = AttackGraphNode(
+                id=uuid7(),
                 incident_id=incident.id, node_type='ip_address', label=ip_or_dns,
                 position_x=x, position_y=y,
                 extra_data={
@@ -332,7 +335,6 @@ class GraphAutomationService:
             )
             db.session.add(ioc_node)
             nodes.append(ioc_node)
-            db.session.flush()
             ip_to_node[ip_or_dns] = ioc_node
 
             x += 150
@@ -341,6 +343,7 @@ class GraphAutomationService:
                 y += 120
 
             host_node = node_map[target_hid]
+            linked.add((host_node.id, ioc_node.id))
             edge = AttackGraphEdge(
                 incident_id=incident.id,
                 source_node_id=host_node.id, target_node_id=ioc_node.id,
@@ -361,6 +364,7 @@ class GraphAutomationService:
             .order_by(TimelineEvent.timestamp.asc()).all()
 
         edges = []
+        linked = set()  # (source_node_id, target_node_id) pairs already created
         prev_host_id = None
         for event in events:
             cur_host_id = str(event.host_id)
@@ -368,10 +372,8 @@ class GraphAutomationService:
                 src = node_map.get(prev_host_id)
                 tgt = node_map.get(cur_host_id)
                 if src and tgt:
-                    if not AttackGraphEdge.query.filter_by(
-                        source_node_id=src.id, target_node_id=tgt.id,
-                        edge_type='lateral_movement'
-                    ).first():
+                    if (src.id, tgt.id) not in linked:
+                        linked.add((src.id, tgt.id))
                         edge = AttackGraphEdge(
                             incident_id=incident.id,
                             source_node_id=src.id, target_node_id=tgt.id,
@@ -396,7 +398,7 @@ class GraphAutomationService:
         ).first()
 
         if not node:
-            host = CompromisedHost.query.get(host_id)
+            host = CompromisedHost.get_by_id(host_id)
             if not host:
                 return None
 
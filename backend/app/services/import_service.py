@@ -5,7 +5,17 @@ from app import db
 from app.models import TimelineEvent, CompromisedHost, CompromisedAccount, NetworkIndicator, MalwareTool, HostBasedIndicator
 from app.services.encryption_service import encryption_service
 
+# Imports larger than this are streamed with COPY instead of multi-row INSERTs
+COPY_THRESHOLD = 10_000
+
 class ImportService:
+    @staticmethod
+    def _insert_rows(model, rows):
+        """Bulk-load rows, switching to COPY for very large imports."""
+        if len(rows) > COPY_THRESHOLD:
+            return model.bulk_copy(rows, commit=False)
+        return model.bulk_insert(rows, commit=False)
+
     @staticmethod
     def parse_excel(file):
         """Parse Excel file and return raw data structure."""
@@ -72,11 +82,12 @@ class ImportService:
                 results['host_iocs'] = ImportService._create_host_iocs(incident_id, data['host_iocs'], user_id)
                 
             db.session.commit()
-            return results
         except Exception as e:
             db.session.rollback()
             raise ValueError(f"Failed to import data: {str(e)}")
 
+        return results
+
     @staticmethod
     def process_excel_import(incident_id, file, user_id):
         """Process Excel file import for an incident."""
@@ -111,12 +122,13 @@ class ImportService:
                     results['host_iocs'] += ImportService._import_host_iocs(incident_id, df, user_id)
             
             db.session.commit()
-            return results
             
         except Exception as e:
             db.session.rollback()
             raise ValueError(f"Failed to process import: {str(e)}")
 
+        return results
+
     @staticmethod
     def _clean_df(df):
         """Clean dataframe columns and values."""
@@ -154,7 +166,7 @@ class ImportService:
     def _import_timeline(incident_id, df, user_id):
         """Import timeline events from a cleaned spreadsheet dataframe."""
         df = ImportService._clean_df(df)
-        count = 0
+        rows = []
         
         for _, row in df.iterrows():
             if not row.get('activity') and not row.get('description'):
@@ -166,21 +178,19 @@ class ImportService:
             if tactic or technique:
                 mitre_mappings = [{'tactic': tactic or '', 'technique': technique or '', 'name': ''}]
 
-            event = TimelineEvent(
-                incident_id=incident_id,
-                timestamp=ImportService._parse_date(row.get('timestamp') or row.get('date') or row.get('time')),
-                activity=row.get('activity') or row.get('description'),
-                hostname=row.get('host') or row.get('hostname') or row.get('system'),
-                source=row.get('source'),
-                mitre_mappings=mitre_mappings,
-                mitre_tactic=tactic,
-                mitre_technique=technique,
-                created_by=user_id
-            )
-            db.session.add(event)
-            count += 1
+            rows.append({
+                'incident_id': incident_id,
+                'timestamp': ImportService._parse_date(row.get('timestamp') or row.get('date') or row.get('time')),
+                'activity': row.get('activity') or row.get('description'),
+                'hostname': row.get('host') or row.get('hostname') or row.get('system'),
+                'source': row.get('source'),
+                'mitre_mappings': mitre_mappings,
+                'mitre_tactic': tactic,
+                'mitre_technique': technique,
+                'created_by': user_id
+            })
             
-        return count
+        return ImportService._insert_rows(TimelineEvent, rows)
 
     @staticmethod
     def _import_hosts(incident_id, df, user_id):
@@ -248,75 +258,70 @@ class ImportService:
     def _import_network_iocs(incident_id, df, user_id):
         """Import network IOCs from a cleaned spreadsheet dataframe."""
         df = ImportService._clean_df(df)
-        count = 0
+        rows = []
         
         for _, row in df.iterrows():
             value = row.get('value') or row.get('ip') or row.get('domain') or row.get('url') or row.get('dns_ip')
             if not value:
                 continue
                 
-            ioc = NetworkIndicator(
-                incident_id=incident_id,
-                dns_ip=value,
-                timestamp=ImportService._parse_date(row.get('timestamp') or row.get('date')),
-                protocol=row.get('protocol'),
-                port=int(row.get('port')) if row.get('port') else None,
-                direction=row.get('direction') or 'outbound',
-                description=row.get('description'),
-                is_malicious=True,
-                created_by=user_id
-            )
-            db.session.add(ioc)
-            count += 1
-        return count
+            rows.append({
+                'incident_id': incident_id,
+                'dns_ip': value,
+                'timestamp': ImportService._parse_date(row.get('timestamp') or row.get('date')),
+                'protocol': row.get('protocol'),
+                'port': int(row.get('port')) if row.get('port') else None,
+                'direction': row.get('direction') or 'outbound',
+                'description': row.get('description'),
+                'created_by': user_id
+            })
+        return ImportService._insert_rows(NetworkIndicator, rows)
         
     @staticmethod
     def _import_malware(incident_id, df, user_id):
         """Import malware and tools from a cleaned spreadsheet dataframe."""
         df = ImportService._clean_df(df)
-        count = 0
+        rows = []
         
         for _, row in df.iterrows():
             name = row.get('name') or row.get('file_name') or row.get('tool_name')
             if not name:
                 continue
-                
-            malware = MalwareTool(
-                incident_id=incident_id,
-                file_name=name,
-                type=row.get('type') or 'malware',
-                hash=row.get('hash') or row.get('sha256') or row.get('md5'),
-                path=row.get('path') or row.get('file_path'),
-                description=row.get('description'),
-                created_by=user_id
-            )
-            db.session.add(malware)
-            count += 1
-        return count
+
+            fields = ImportService._clean_malware_fields(row)
+            rows.append({
+                'incident_id': incident_id,
+                'file_name': name,
+                'md5': fields['md5'],
+                'sha256': fields['sha256'],
+                'sha512': fields['sha512'],
+                'file_path': row.get('path') or row.get('file_path'),
+                'is_tool': fields['is_tool'],
+                'description': row.get('description'),
+                'created_by': user_id
+            })
+        return ImportService._insert_rows(MalwareTool, rows)
         
     @staticmethod
     def _import_host_iocs(incident_id, df, user_id):
         """Import host-based IOCs from a cleaned spreadsheet dataframe."""
         df = ImportService._clean_df(df)
-        count = 0
+        rows = []
         
         for _, row in df.iterrows():
             artifact = row.get('artifact') or row.get('indicator') or row.get('value')
             if not artifact:
                 continue
                 
-            ioc = HostBasedIndicator(
-                incident_id=incident_id,
-                type=row.get('type') or 'other',
-                value=artifact,
-                hostname=row.get('hostname') or row.get('host'),
-                path=row.get('path'),
-                description=row.get('description'),
-                created_by=user_id
-            )
-            db.session.add(ioc)
-            count += 1
-        return count
+            rows.append({
+                'incident_id': incident_id,
+                'artifact_type': ImportService._normalize_artifact_type(row.get('type')),
+                'artifact_value': artifact,
+                'host': row.get('hostname') or row.get('host'),
+                'notes': row.get('description'),
+                'created_by': user_id
+            })
+        return ImportService._insert_rows(HostBasedIndicator, rows)
 
     @staticmethod
     def _clean_kwargs(model_class, **kwargs):
@@ -327,7 +332,7 @@ class ImportService:
     @staticmethod
     def _create_timeline_events(incident_id, items, user_id):
         """Create timeline event records from normalized JSON items."""
-        count = 0
+        rows = []
         for item in items:
             if not item.get('activity'):
                 continue
@@ -349,12 +354,9 @@ class ImportService:
                 'mitre_technique': technique,
                 'created_by': user_id
             }
-            # Clean and create
-            valid_kwargs = ImportService._clean_kwargs(TimelineEvent, **kwargs)
-            event = TimelineEvent(**valid_kwargs)
-            db.session.add(event)
-            count += 1
-        return count
+            # Clean and collect for a single batched insert
+            rows.append(ImportService._clean_kwargs(TimelineEvent, **kwargs))
+        return ImportService._insert_rows(TimelineEvent, rows)
 
     @staticmethod
     def _create_hosts(incident_id, items, user_id):
@@ -442,7 +444,7 @@ class ImportService:
     @staticmethod
     def _create_network_iocs(incident_id, items, user_id):
         """Create network indicator records from normalized JSON items."""
-        count = 0
+        rows = []
         for item in items:
             value = item.get('dns_ip')
             if not value:
@@ -457,14 +459,10 @@ class ImportService:
                 'direction': item.get('direction') or 'outbound',
                 'description': item.get('description'),
                 'source_host': item.get('source_host'),
-                'is_malicious': True,
                 'created_by': user_id
             }
-            valid_kwargs = ImportService._clean_kwargs(NetworkIndicator, **kwargs)
-            ioc = NetworkIndicator(**valid_kwargs)
-            db.session.add(ioc)
-            count += 1
-        return count
+            rows.append(ImportService._clean_kwargs(NetworkIndicator, **kwargs))
+        return ImportService._insert_rows(NetworkIndicator, rows)
 
     @staticmethod
     def _parse_size(size_val):
@@ -535,7 +533,7 @@ class ImportService:
     @staticmethod
     def _create_malware(incident_id, items, user_id):
         """Create malware/tool records from normalized JSON items with hash auto-detection."""
-        count = 0
+        rows = []
         for item in items:
             file_name = item.get('file_name')
             if not file_name:
@@ -560,51 +558,21 @@ class ImportService:
                 'created_by': user_id
             }
             
-            valid_kwargs = ImportService._clean_kwargs(MalwareTool, **kwargs)
-            malware = MalwareTool(**valid_kwargs)
-            db.session.add(malware)
-            count += 1
-        return count
+            rows.append(ImportService._clean_kwargs(MalwareTool, **kwargs))
+        return ImportService._insert_rows(MalwareTool, rows)
 
     @staticmethod
     def _create_host_iocs(incident_id, items, user_id):
         """Create host-based indicator records from normalized JSON items with artifact type normalization."""
-        count = 0
-        valid_types = HostBasedIndicator.ARTIFACT_TYPES
-        
+        rows = []
         for item in items:
             value = item.get('value') or item.get('artifact_value')
             if not value:
                 continue
             
-            # Normalize artifact type
-            raw_type = str(item.get('type') or item.get('artifact_type') or 'other').lower().strip()
-            artifact_type = 'other'
-            
-            if raw_type in valid_types:
-                artifact_type = raw_type
-            else:
-                # Fuzzy matching
-                if 'wmi' in raw_type:
-                    artifact_type = 'wmi_event'
-                elif 'asep' in raw_type or 'autorun' in raw_type:
-                    artifact_type = 'asep'
-                elif 'registry' in raw_type or 'key' in raw_type:
-                    artifact_type = 'registry'
-                elif 'task' in raw_type or 'scheduled' in raw_type:
-                    artifact_type = 'scheduled_task'
-                elif 'service' in raw_type:
-                    artifact_type = 'service'
-                elif 'file' in raw_type:
-                    artifact_type = 'file'
-                elif 'process' in raw_type:
-                    artifact_type = 'process'
-                elif 'archive' in raw_type:
-                    artifact_type = 'file'  # Map Archive -> file
-                
             kwargs = {
                 'incident_id': incident_id,
-                'artifact_type': artifact_type,
+                'artifact_type': ImportService._normalize_artifact_type(item.get('type') or item.get('artifact_type')),
                 'artifact_value': value,
                 'host': item.get('host') or item.get('hostname'),
                 'datetime': ImportService._parse_date(item.get('datetime')),
@@ -612,8 +580,31 @@ class ImportService:
                 'created_by': user_id
             }
             
-            valid_kwargs = ImportService._clean_kwargs(HostBasedIndicator, **kwargs)
-            ioc = HostBasedIndicator(**valid_kwargs)
-            db.session.add(ioc)
-            count += 1
-        return count
+            rows.append(ImportService._clean_kwargs(HostBasedIndicator, **kwargs))
+        return ImportService._insert_rows(HostBasedIndicator, rows)
+
+    @staticmethod
+    def _normalize_artifact_type(raw_type):
+        """Map a free-form artifact type onto HostBasedIndicator.ARTIFACT_TYPES."""
+        raw_type = str(raw_type or 'other').lower().strip()
+        if raw_type in HostBasedIndicator.ARTIFACT_TYPES:
+            return raw_type
+
+        # Fuzzy matching
+        if 'wmi' in raw_type:
+            return 'wmi_event'
+        if 'asep' in raw_type or 'autorun' in raw_type:
+            return 'asep'
+        if 'registry' in raw_type or 'key' in raw_type:
+            return 'registry'
+        if 'task' in raw_type or 'scheduled' in raw_type:
+            return 'scheduled_task'
+        if 'service' in raw_type:
+            return 'service'
+        if 'file' in raw_type:
+            return 'file'
+        if 'process' in raw_type:
+            return 'process'
+        if 'archive' in raw_type:
+            return 'file'  # Map Archive -> file
+        return 'other'
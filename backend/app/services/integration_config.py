@@ -61,10 +61,12 @@ class IntegrationConfigResolver:
     @staticmethod
     def _resolve_from_db(integration_type: str, org_id: str = None) -> Optional[Dict[str, Any]]:
         """Resolve credentials from database."""
+        from sqlalchemy.orm import undefer
         from app.models.integration import Integration
         from app.services.encryption_service import encryption_service
 
-        query = Integration.query.filter_by(type=integration_type, is_enabled=True)
+        query = Integration.query.options(undefer(Integration.credentials_encrypted)) \
+            .filter_by(type=integration_type, is_enabled=True)
         if org_id:
             query = query.filter_by(organization_id=org_id)
         integration = query.first()
@@ -0,0 +1,46 @@
+"""Add BRIN index on audit_logs.created_at
+
+Revision ID: add_audit_created_brin
+Revises: add_audit_graph_indexes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_audit_created_brin'
+down_revision = 'add_audit_graph_indexes'
+branch_labels = None
+depends_on = None
+
+
+def _index_exists(index_name):
+    """Check if an index already exists."""
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    """Create a BRIN index for time-range scans over the audit trail.
+
+    The btree idx_audit_created is kept: it still serves the
+    ORDER BY created_at DESC LIMIT pagination used by the audit views.
+    """
+    if not _index_exists('idx_audit_created_brin'):
+        op.create_index(
+            'idx_audit_created_brin',
+            'audit_logs',
+            ['created_at'],
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        )
+
+
+def downgrade():
+    """Drop the BRIN index."""
+    if _index_exists('idx_audit_created_brin'):
+        op.drop_index('idx_audit_created_brin', table_name='audit_logs')
@@ -0,0 +1,50 @@
+"""Add composite indexes for audit log and attack graph edge lookups
+
+Revision ID: add_audit_graph_indexes
+Revises: update_account_type_check
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_audit_graph_indexes'
+down_revision = 'update_account_type_check'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # Audit log: org activity feed filtered by event type, newest first
+    ('idx_audit_org_event_created', 'audit_logs', ['organization_id', 'event_type', 'created_at']),
+    # Audit log: per-incident and per-user history
+    ('idx_audit_incident_created', 'audit_logs', ['incident_id', 'created_at']),
+    ('idx_audit_user_created', 'audit_logs', ['user_id', 'created_at']),
+    # Attack graph edges: graph building looks edges up per incident and endpoint
+    ('idx_edge_incident_source', 'attack_graph_edges', ['incident_id', 'source_node_id']),
+    ('idx_edge_incident_target', 'attack_graph_edges', ['incident_id', 'target_node_id']),
+]
+
+
+def _index_exists(index_name):
+    """Check if an index already exists."""
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    """Create composite indexes."""
+    for name, table, columns in INDEXES:
+        if not _index_exists(name):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    """Drop composite indexes."""
+    for name, table, _ in reversed(INDEXES):
+        if _index_exists(name):
+            op.drop_index(name, table_name=table)
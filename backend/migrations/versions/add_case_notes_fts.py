@@ -0,0 +1,44 @@
+"""Add generated tsvector column and GIN index for case note search
+
+Revision ID: add_case_notes_fts
+Revises: jsonb_server_defaults
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_case_notes_fts'
+down_revision = 'jsonb_server_defaults'
+branch_labels = None
+depends_on = None
+
+
+def _index_exists(index_name):
+    """Check if an index already exists."""
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    """Add case_notes.search_vec and index it with GIN."""
+    op.execute(
+        "ALTER TABLE case_notes ADD COLUMN IF NOT EXISTS search_vec tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', "
+        "coalesce(title, '') || ' ' || coalesce(content, ''))) STORED"
+    )
+    if not _index_exists('idx_case_notes_fts'):
+        op.create_index(
+            'idx_case_notes_fts', 'case_notes', ['search_vec'],
+            postgresql_using='gin',
+        )
+
+
+def downgrade():
+    """Drop the search index and generated column."""
+    op.execute("DROP INDEX IF EXISTS idx_case_notes_fts")
+    op.execute("ALTER TABLE case_notes DROP COLUMN IF EXISTS search_vec")
@@ -0,0 +1,42 @@
+"""Add mv_incident_counts materialized view for incident list rollups
+
+Revision ID: add_incident_counts_view
+Revises: native_enum_types
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_incident_counts_view'
+down_revision = 'native_enum_types'
+branch_labels = None
+depends_on = None
+
+
+# (kind as reported by Incident.load_counts, child table)
+COUNTED_TABLES = [
+    ('timeline_events', 'timeline_events'),
+    ('compromised_hosts', 'compromised_hosts'),
+    ('compromised_accounts', 'compromised_accounts'),
+    ('network_indicators', 'network_indicators'),
+    ('host_indicators', 'host_based_indicators'),
+    ('malware_tools', 'malware_tools'),
+    ('artifacts', 'artifacts'),
+    ('tasks', 'tasks'),
+]
+
+
+def upgrade():
+    selects = '\nUNION ALL\n'.join(
+        f"SELECT incident_id, '{kind}'::text AS kind, count(*) AS total "
+        f"FROM {table} GROUP BY incident_id"
+        for kind, table in COUNTED_TABLES
+    )
+    op.execute(f"CREATE MATERIALIZED VIEW mv_incident_counts AS\n{selects}")
+    # Unique index required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("CREATE UNIQUE INDEX ix_mv_incident_counts_incident_kind ON mv_incident_counts (incident_id, kind)")
+
+
+def downgrade():
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_incident_counts")
@@ -0,0 +1,59 @@
+"""Add composite and partial indexes for IOC lookups
+
+Revision ID: add_ioc_lookup_indexes
+Revises: partition_audit_logs
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_ioc_lookup_indexes'
+down_revision = 'partition_audit_logs'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # Network IOC list: per incident, newest first; host filter
+    ('ix_network_indicators_incident_timestamp', 'network_indicators', ['incident_id', 'timestamp'], None),
+    ('ix_network_indicators_host', 'network_indicators', ['host_id'], None),
+    ('ix_network_indicators_malicious', 'network_indicators', ['incident_id'], 'is_malicious'),
+    # Host IOC list: per incident filtered by artifact type; host filter
+    ('ix_hbi_incident_artifact', 'host_based_indicators', ['incident_id', 'artifact_type'], None),
+    ('ix_hbi_host', 'host_based_indicators', ['host_id'], None),
+    ('ix_hbi_unremediated', 'host_based_indicators', ['incident_id'], 'NOT remediated'),
+    # Malware list: per incident, newest first; host filter (md5/sha256 are already indexed)
+    ('ix_malware_incident_created', 'malware_tools', ['incident_id', 'created_at'], None),
+    ('ix_malware_host', 'malware_tools', ['host_id'], None),
+]
+
+
+def _index_exists(index_name):
+    """Check if an index already exists."""
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    """Create IOC indexes without blocking writes."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            if not _index_exists(name):
+                op.create_index(
+                    name, table, columns,
+                    postgresql_where=sa.text(where) if where else None,
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade():
+    """Drop IOC indexes."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            if _index_exists(name):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
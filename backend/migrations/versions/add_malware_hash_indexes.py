@@ -0,0 +1,63 @@
+"""Use hash indexes for malware file hash lookups
+
+Revision ID: add_malware_hash_indexes
+Revises: add_incident_counts_view
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_malware_hash_indexes'
+down_revision = 'add_incident_counts_view'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_malware_md5_hash', 'md5'),
+    ('ix_malware_sha256_hash', 'sha256'),
+    ('ix_malware_sha512_hash', 'sha512'),
+]
+
+# B-tree indexes from the base schema that the hash indexes replace
+LEGACY_INDEXES = [
+    ('idx_malware_md5', 'md5'),
+    ('idx_malware_sha256', 'sha256'),
+]
+
+
+def _index_exists(index_name):
+    """Check if an index already exists."""
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    """Create hash indexes on md5/sha256/sha512 and drop the B-tree ones."""
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES:
+            if not _index_exists(name):
+                op.create_index(
+                    name, 'malware_tools', [column],
+                    postgresql_using='hash',
+                    postgresql_concurrently=True,
+                )
+        for name, _ in LEGACY_INDEXES:
+            if _index_exists(name):
+                op.drop_index(name, table_name='malware_tools', postgresql_concurrently=True)
+
+
+def downgrade():
+    """Restore the B-tree hash indexes and drop the hash ones."""
+    with op.get_context().autocommit_block():
+        for name, column in LEGACY_INDEXES:
+            if not _index_exists(name):
+                op.create_index(name, 'malware_tools', [column], postgresql_concurrently=True)
+        for name, _ in reversed(INDEXES):
+            if _index_exists(name):
+                op.drop_index(name, table_name='malware_tools', postgresql_concurrently=True)
@@ -0,0 +1,62 @@
+"""Add partial unread index and incident index on notifications
+
+Revision ID: add_notification_unread_index
+Revises: add_jsonb_gin_indexes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_notification_unread_index'
+down_revision = 'add_jsonb_gin_indexes'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # WHERE user_id = ? AND NOT is_read ORDER BY created_at DESC
+    ('ix_notifications_user_unread', ['user_id', 'created_at'], 'NOT is_read'),
+    # Full feed: WHERE user_id = ? ORDER BY created_at DESC
+    ('ix_notifications_user_created', ['user_id', 'created_at'], None),
+    # ON DELETE CASCADE from incidents
+    ('ix_notifications_incident', ['incident_id'], None),
+]
+
+
+def _index_exists(index_name):
+    """Check if an index already exists."""
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    """Create notification indexes; the new partial index supersedes idx_notifications_unread."""
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            if not _index_exists(name):
+                op.create_index(
+                    name, 'notifications', columns,
+                    postgresql_where=sa.text(where) if where else None,
+                    postgresql_concurrently=True,
+                )
+        if _index_exists('idx_notifications_unread'):
+            op.drop_index('idx_notifications_unread', table_name='notifications', postgresql_concurrently=True)
+
+
+def downgrade():
+    """Restore the original unread index and drop the new ones."""
+    with op.get_context().autocommit_block():
+        if not _index_exists('idx_notifications_unread'):
+            op.create_index(
+                'idx_notifications_unread', 'notifications', ['user_id', 'is_read'],
+                postgresql_where=sa.text('NOT is_read'),
+                postgresql_concurrently=True,
+            )
+        for name, _, _ in reversed(INDEXES):
+            if _index_exists(name):
+                op.drop_index(name, table_name='notifications', postgresql_concurrently=True)
@@ -0,0 +1,57 @@
+"""Partial indexes on sessions for non-revoked rows
+
+Revision ID: add_sessions_live_indexes
+Revises: roles_permissions_text_array
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_sessions_live_indexes'
+down_revision = 'roles_permissions_text_array'
+branch_labels = None
+depends_on = None
+
+
+def _index_exists(index_name):
+    """Check if an index already exists."""
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    """Index live sessions only; the token index replaces idx_sessions_token.
+
+    idx_sessions_user stays: ON DELETE CASCADE from users must find
+    revoked sessions too.
+    """
+    with op.get_context().autocommit_block():
+        if not _index_exists('ix_sessions_live'):
+            op.create_index(
+                'ix_sessions_live', 'sessions', ['user_id', 'expires_at'],
+                postgresql_where=sa.text('revoked_at IS NULL'),
+                postgresql_concurrently=True,
+            )
+        if not _index_exists('ix_sessions_token_live'):
+            op.create_index(
+                'ix_sessions_token_live', 'sessions', ['token_hash'],
+                postgresql_where=sa.text('revoked_at IS NULL'),
+                postgresql_concurrently=True,
+            )
+        if _index_exists('idx_sessions_token'):
+            op.drop_index('idx_sessions_token', table_name='sessions', postgresql_concurrently=True)
+
+
+def downgrade():
+    """Restore the full token index and drop the partial ones."""
+    with op.get_context().autocommit_block():
+        if not _index_exists('idx_sessions_token'):
+            op.create_index('idx_sessions_token', 'sessions', ['token_hash'], postgresql_concurrently=True)
+        for name in ('ix_sessions_token_live', 'ix_sessions_live'):
+            if _index_exists(name):
+                op.drop_index(name, table_name='sessions', postgresql_concurrently=True)
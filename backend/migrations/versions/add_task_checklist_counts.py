@@ -0,0 +1,68 @@
+"""Add generated checklist progress columns to tasks
+
+Revision ID: add_task_checklist_counts
+Revises: add_notification_unread_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_checklist_counts'
+down_revision = 'add_notification_unread_index'
+branch_labels = None
+depends_on = None
+
+
+# Generated columns cannot contain subqueries, so the counting lives in
+# IMMUTABLE SQL functions. Non-array checklists count as empty.
+FUNCTIONS = """
+CREATE OR REPLACE FUNCTION jsonb_checklist_total(checklist jsonb) RETURNS integer
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE WHEN jsonb_typeof(checklist) = 'array'
+                THEN jsonb_array_length(checklist) ELSE 0 END
+$$;
+
+CREATE OR REPLACE FUNCTION jsonb_checklist_completed(checklist jsonb) RETURNS integer
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE WHEN jsonb_typeof(checklist) = 'array'
+                THEN (SELECT count(*)::integer FROM jsonb_array_elements(checklist) AS item
+                      WHERE jsonb_typeof(item) = 'object' AND item->>'completed' = 'true')
+                ELSE 0 END
+$$;
+"""
+
+
+def _index_exists(index_name):
+    """Check if an index already exists."""
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    """Add checklist_total/checklist_completed generated from tasks.checklist."""
+    op.execute(FUNCTIONS)
+    op.execute(
+        "ALTER TABLE tasks "
+        "ADD COLUMN IF NOT EXISTS checklist_total integer "
+        "GENERATED ALWAYS AS (jsonb_checklist_total(checklist)) STORED, "
+        "ADD COLUMN IF NOT EXISTS checklist_completed integer "
+        "GENERATED ALWAYS AS (jsonb_checklist_completed(checklist)) STORED"
+    )
+    if not _index_exists('ix_tasks_incident_checklist_completed'):
+        op.create_index(
+            'ix_tasks_incident_checklist_completed', 'tasks',
+            ['incident_id', 'checklist_completed'],
+        )
+
+
+def downgrade():
+    """Drop the generated columns and their helper functions."""
+    op.execute("DROP INDEX IF EXISTS ix_tasks_incident_checklist_completed")
+    op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS checklist_completed, DROP COLUMN IF EXISTS checklist_total")
+    op.execute("DROP FUNCTION IF EXISTS jsonb_checklist_completed(jsonb)")
+    op.execute("DROP FUNCTION IF EXISTS jsonb_checklist_total(jsonb)")
@@ -0,0 +1,43 @@
+"""Add GIN (jsonb_path_ops) index on timeline_events.extra_data
+
+Revision ID: add_timeline_extra_data_gin
+Revises: add_malware_hash_indexes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_timeline_extra_data_gin'
+down_revision = 'add_malware_hash_indexes'
+branch_labels = None
+depends_on = None
+
+
+def _index_exists(index_name):
+    """Check if an index already exists."""
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    """Create the GIN index without blocking writes."""
+    with op.get_context().autocommit_block():
+        if not _index_exists('ix_timeline_events_extra_data_gin'):
+            op.create_index(
+                'ix_timeline_events_extra_data_gin', 'timeline_events', ['extra_data'],
+                postgresql_using='gin',
+                postgresql_ops={'extra_data': 'jsonb_path_ops'},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    """Drop the GIN index."""
+    with op.get_context().autocommit_block():
+        if _index_exists('ix_timeline_events_extra_data_gin'):
+            op.drop_index('ix_timeline_events_extra_data_gin', table_name='timeline_events', postgresql_concurrently=True)
@@ -0,0 +1,93 @@
+"""Move default-partition rows when creating audit_logs partitions
+
+Revision ID: audit_partition_default_rows
+Revises: add_sessions_live_indexes
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'audit_partition_default_rows'
+down_revision = 'add_sessions_live_indexes'
+branch_labels = None
+depends_on = None
+
+
+# Rows that reached audit_logs_default for a month make CREATE TABLE ...
+# PARTITION OF fail for that month. Each missing month is now built as a
+# plain table, the month's rows are moved out of the default partition into
+# it, and it is attached. Run by `flask create-audit-partitions`.
+CREATE_PARTITIONS_FN = """
+CREATE OR REPLACE FUNCTION create_audit_log_partitions(
+    months_ahead integer DEFAULT 3,
+    start_month date DEFAULT date_trunc('month', now())::date
+) RETURNS void AS $$
+DECLARE
+    month_start date := date_trunc('month', start_month)::date;
+    month_end date;
+    last_month date := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+    partition_name text;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        month_end := (month_start + interval '1 month')::date;
+        partition_name := 'audit_logs_' || to_char(month_start, 'YYYY_MM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                partition_name
+            );
+            IF to_regclass('audit_logs_default') IS NOT NULL THEN
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM audit_logs_default '
+                    'WHERE created_at >= %L AND created_at < %L RETURNING *) '
+                    'INSERT INTO %I SELECT * FROM moved',
+                    month_start, month_end, partition_name
+                );
+            END IF;
+            EXECUTE format(
+                'ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, month_end
+            );
+        END IF;
+        month_start := month_end;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Definition from partition_audit_logs
+PREVIOUS_PARTITIONS_FN = """
+CREATE OR REPLACE FUNCTION create_audit_log_partitions(
+    months_ahead integer DEFAULT 3,
+    start_month date DEFAULT date_trunc('month', now())::date
+) RETURNS void AS $$
+DECLARE
+    month_start date := date_trunc('month', start_month)::date;
+    last_month date := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+            'audit_logs_' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            (month_start + interval '1 month')::date
+        );
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade():
+    op.execute(CREATE_PARTITIONS_FN)
+    # Catch up on months that have passed since the partitioning migration
+    op.execute(
+        "SELECT create_audit_log_partitions(3, coalesce("
+        "(SELECT min(created_at) FROM audit_logs_default)::date, now()::date))"
+    )
+
+
+def downgrade():
+    op.execute(PREVIOUS_PARTITIONS_FN)
@@ -0,0 +1,32 @@
+"""Make attack graph edge -> node foreign keys deferrable
+
+Revision ID: defer_edge_node_fks
+Revises: add_case_notes_fts
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'defer_edge_node_fks'
+down_revision = 'add_case_notes_fts'
+branch_labels = None
+depends_on = None
+
+
+CONSTRAINTS = [
+    'attack_graph_edges_source_node_id_fkey',
+    'attack_graph_edges_target_node_id_fkey',
+]
+
+
+def upgrade():
+    """Check edge -> node references once at commit instead of per row."""
+    for name in CONSTRAINTS:
+        op.execute(f"ALTER TABLE attack_graph_edges ALTER CONSTRAINT {name} DEFERRABLE INITIALLY DEFERRED")
+
+
+def downgrade():
+    """Restore immediate foreign key checks."""
+    for name in CONSTRAINTS:
+        op.execute(f"ALTER TABLE attack_graph_edges ALTER CONSTRAINT {name} NOT DEFERRABLE")
@@ -0,0 +1,50 @@
+"""Use server-side '{}' defaults for JSONB object columns
+
+Revision ID: jsonb_server_defaults
+Revises: add_audit_created_brin
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'jsonb_server_defaults'
+down_revision = 'add_audit_created_brin'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ('artifacts', 'extra_data'),
+    ('chain_of_custody', 'extra_data'),
+    ('attack_graph_nodes', 'extra_data'),
+    ('attack_graph_edges', 'extra_data'),
+    ('audit_logs', 'request_query_params'),
+    ('audit_logs', 'request_body_summary'),
+    ('audit_logs', 'details'),
+    ('compromised_hosts', 'extra_data'),
+    ('compromised_accounts', 'extra_data'),
+    ('integrations', 'config'),
+    ('network_indicators', 'extra_data'),
+    ('host_based_indicators', 'extra_data'),
+    ('malware_tools', 'extra_data'),
+    ('notifications', 'extra_data'),
+    ('organizations', 'settings'),
+    ('tasks', 'extra_data'),
+    ('timeline_events', 'extra_data'),
+]
+
+
+def upgrade():
+    """Backfill NULLs, then default to '{}' server-side and forbid NULL."""
+    for table, column in COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = '{{}}'::jsonb WHERE {column} IS NULL")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{{}}'::jsonb")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+
+
+def downgrade():
+    """Restore nullable columns without a server default."""
+    for table, column in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP NOT NULL")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
@@ -0,0 +1,65 @@
+"""Use native PostgreSQL ENUM types for fixed-vocabulary columns
+
+Revision ID: native_enum_types
+Revises: varchar_to_text
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'native_enum_types'
+down_revision = 'varchar_to_text'
+branch_labels = None
+depends_on = None
+
+
+# (type name, labels, table, column, default, previous varchar length,
+#  CHECK constraint the enum replaces)
+ENUMS = [
+    ('task_status', ['pending', 'in_progress', 'completed', 'blocked', 'cancelled'],
+     'tasks', 'status', 'pending', 50, 'tasks_status_check'),
+    ('task_priority', ['low', 'medium', 'high', 'critical'],
+     'tasks', 'priority', 'medium', 20, 'tasks_priority_check'),
+    ('hbi_artifact_type', ['wmi_event', 'asep', 'registry', 'scheduled_task', 'service', 'file', 'process', 'other'],
+     'host_based_indicators', 'artifact_type', None, 50, 'host_based_indicators_artifact_type_check'),
+    ('notification_type', ['incident_assigned', 'incident_updated', 'task_assigned', 'task_due',
+                           'comment_added', 'artifact_uploaded', 'mention', 'system'],
+     'notifications', 'type', None, 50, None),
+]
+
+
+def upgrade():
+    for type_name, labels, table, column, default, _length, check in ENUMS:
+        values = ', '.join(f"'{label}'" for label in labels)
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({values})")
+        if check:
+            op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {check}")
+        if default:
+            op.execute(f"UPDATE {table} SET {column} = '{default}' WHERE {column} IS NULL")
+            # The varchar default cannot be cast automatically; drop and re-add it
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE {type_name} USING {column}::{type_name}"
+        )
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'")
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+
+
+def downgrade():
+    for type_name, labels, table, column, default, length, check in reversed(ENUMS):
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP NOT NULL")
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE VARCHAR({length}) USING {column}::text"
+        )
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'")
+        if check:
+            values = ', '.join(f"'{label}'" for label in labels)
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {check} CHECK ({column} IN ({values}))")
+        op.execute(f"DROP TYPE {type_name}")
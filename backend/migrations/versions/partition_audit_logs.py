@@ -0,0 +1,113 @@
+"""Partition audit_logs by month on created_at
+
+Revision ID: partition_audit_logs
+Revises: defer_edge_node_fks
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'partition_audit_logs'
+down_revision = 'defer_edge_node_fks'
+branch_labels = None
+depends_on = None
+
+
+# Recreated on the partitioned parent; PostgreSQL cascades them to every partition.
+INDEXES = [
+    "CREATE INDEX idx_audit_org ON audit_logs (organization_id)",
+    "CREATE INDEX idx_audit_user ON audit_logs (user_id)",
+    "CREATE INDEX idx_audit_event ON audit_logs (event_type)",
+    "CREATE INDEX idx_audit_resource ON audit_logs (resource_type, resource_id)",
+    "CREATE INDEX idx_audit_incident ON audit_logs (incident_id)",
+    "CREATE INDEX idx_audit_created ON audit_logs (created_at)",
+    "CREATE INDEX idx_audit_org_event_created ON audit_logs (organization_id, event_type, created_at)",
+    "CREATE INDEX idx_audit_incident_created ON audit_logs (incident_id, created_at)",
+    "CREATE INDEX idx_audit_user_created ON audit_logs (user_id, created_at)",
+    "CREATE INDEX idx_audit_created_brin ON audit_logs USING brin (created_at) WITH (pages_per_range = 32)",
+]
+
+# Creates audit_logs_YYYY_MM partitions from start_month up to months_ahead
+# months past the current one. Safe to re-run; schedule it (cron / pg_cron)
+# so upcoming months exist before rows arrive. Retention is
+# ALTER TABLE audit_logs DETACH PARTITION audit_logs_YYYY_MM + DROP TABLE.
+CREATE_PARTITIONS_FN = """
+CREATE OR REPLACE FUNCTION create_audit_log_partitions(
+    months_ahead integer DEFAULT 3,
+    start_month date DEFAULT date_trunc('month', now())::date
+) RETURNS void AS $$
+DECLARE
+    month_start date := date_trunc('month', start_month)::date;
+    last_month date := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+            'audit_logs_' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            (month_start + interval '1 month')::date
+        );
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade():
+    """Rebuild audit_logs as a RANGE(created_at) partitioned table."""
+    op.execute("UPDATE audit_logs SET created_at = now() WHERE created_at IS NULL")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey")
+
+    op.execute(
+        "CREATE TABLE audit_logs "
+        "(LIKE audit_logs_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN created_at SET NOT NULL")
+    op.execute("ALTER TABLE audit_logs ADD PRIMARY KEY (id, created_at)")
+    op.execute(
+        "ALTER TABLE audit_logs "
+        "ADD FOREIGN KEY (organization_id) REFERENCES organizations(id) ON DELETE SET NULL, "
+        "ADD FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL, "
+        "ADD FOREIGN KEY (incident_id) REFERENCES incidents(id) ON DELETE SET NULL"
+    )
+
+    op.execute(CREATE_PARTITIONS_FN)
+    op.execute(
+        "SELECT create_audit_log_partitions(3, coalesce("
+        "(SELECT min(created_at) FROM audit_logs_legacy)::date, now()::date))"
+    )
+    # Catch-all so inserts never fail if the partition job falls behind
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_legacy")
+    op.execute("DROP TABLE audit_logs_legacy")
+
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def downgrade():
+    """Fold the partitions back into a single unpartitioned table."""
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    op.execute(
+        "CREATE TABLE audit_logs "
+        "(LIKE audit_logs_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute("ALTER TABLE audit_logs ADD PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE audit_logs "
+        "ADD FOREIGN KEY (organization_id) REFERENCES organizations(id) ON DELETE SET NULL, "
+        "ADD FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL, "
+        "ADD FOREIGN KEY (incident_id) REFERENCES incidents(id) ON DELETE SET NULL"
+    )
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_partitioned")
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS create_audit_log_partitions(integer, date)")
+
+    for statement in INDEXES:
+        op.execute(statement)
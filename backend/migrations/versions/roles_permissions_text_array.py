@@ -0,0 +1,40 @@
+"""Store role permissions as text[] instead of a JSONB array
+
+Revision ID: roles_permissions_text_array
+Revises: add_timeline_extra_data_gin
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'roles_permissions_text_array'
+down_revision = 'add_timeline_extra_data_gin'
+branch_labels = None
+depends_on = None
+
+
+# ALTER COLUMN ... USING cannot contain a subquery, so the converted values
+# go through a new column that then replaces the old one.
+def upgrade():
+    """Convert roles.permissions to text[] and index it."""
+    op.execute("ALTER TABLE roles ADD COLUMN permissions_arr text[] NOT NULL DEFAULT '{}'")
+    op.execute(
+        "UPDATE roles SET permissions_arr = "
+        "ARRAY(SELECT jsonb_array_elements_text(COALESCE(permissions, '[]'::jsonb)))"
+    )
+    op.execute("ALTER TABLE roles DROP COLUMN permissions")
+    op.execute("ALTER TABLE roles RENAME COLUMN permissions_arr TO permissions")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_roles_permissions_gin ON roles USING gin (permissions)"
+    )
+
+
+def downgrade():
+    """Convert roles.permissions back to a JSONB array."""
+    op.execute("DROP INDEX IF EXISTS ix_roles_permissions_gin")
+    op.execute(
+        "ALTER TABLE roles ALTER COLUMN permissions DROP DEFAULT, "
+        "ALTER COLUMN permissions TYPE jsonb USING to_jsonb(permissions), "
+        "ALTER COLUMN permissions SET DEFAULT '[]'::jsonb"
+    )
@@ -0,0 +1,46 @@
+"""Use TEXT for free-form VARCHAR(255/500) columns
+
+Revision ID: varchar_to_text
+Revises: add_task_checklist_counts
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'varchar_to_text'
+down_revision = 'add_task_checklist_counts'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, previous varchar length). varchar -> text is binary
+# coercible, so PostgreSQL neither rewrites the table nor rebuilds indexes.
+COLUMNS = [
+    ('network_indicators', 'dns_ip', 255),
+    ('network_indicators', 'source_host', 255),
+    ('network_indicators', 'destination_host', 255),
+    ('network_indicators', 'threat_intel_source', 255),
+    ('host_based_indicators', 'host', 255),
+    ('malware_tools', 'file_name', 255),
+    ('malware_tools', 'host', 255),
+    ('malware_tools', 'malware_family', 255),
+    ('malware_tools', 'threat_actor', 255),
+    ('tasks', 'title', 500),
+    ('reports', 'title', 500),
+    ('notifications', 'title', 255),
+    ('organizations', 'name', 255),
+    ('teams', 'name', 255),
+]
+
+
+def upgrade():
+    """Drop the length limit on free-form text columns."""
+    for table, column, _ in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE text")
+
+
+def downgrade():
+    """Restore the VARCHAR limits (fails if longer values were stored)."""
+    for table, column, length in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE varchar({length})")
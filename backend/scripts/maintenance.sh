@@ -0,0 +1,10 @@
+#!/bin/sh
+# Periodic database maintenance, run by the `maintenance` compose service.
+# Each task is a Flask CLI command; a failed run is retried next interval.
+INTERVAL="${MAINTENANCE_INTERVAL:-300}"
+
+while true; do
+    flask refresh-incident-counts || echo "maintenance: refresh-incident-counts failed" >&2
+    flask create-audit-partitions || echo "maintenance: create-audit-partitions failed" >&2
+    sleep "$INTERVAL"
+done